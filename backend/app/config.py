@@ -0,0 +1,88 @@
+"""
+Runtime configuration, read once from environment variables.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Prediction response cache (PREDICTION_CACHE_SIZE=0 disables it)
+    prediction_cache_size: int = 1024
+    prediction_cache_ttl_seconds: float = 3600.0
+    # Disease model inference engine: "catboost" or "numpy"
+    model_engine: str = "catboost"
+    # Integrated Gradients interpolation steps per explanation
+    ig_steps: int = 30
+    # Explanation method: "ig" (Integrated Gradients) or "shap" (CatBoost TreeSHAP)
+    explainer: str = "ig"
+    # Memoized TreeSHAP vectors (EXPLAINER=shap only)
+    shap_cache_size: int = 4096
+    # Misspelled symptom synonyms: max edits per word (0 = exact matching only, max 2)
+    fuzzy_match_max_distance: int = 0
+    # SQLite database backing the /feedback endpoints
+    feedback_db_path: str = "feedback.db"
+    # DatasetLoader storage: "csv" files, or "sqlite" (empty path: data/datasets.db)
+    dataset_backend: str = "csv"
+    dataset_db_path: str = ""
+    # Inference executor: "thread" or "process" pool, 0 workers = one per CPU
+    inference_executor: str = "thread"
+    inference_workers: int = 0
+    # Calls allowed to wait for a worker before /predict answers 503
+    inference_queue_size: int = 64
+    inference_retry_after_seconds: int = 1
+    # CatBoost threads per predict call (-1: all cores)
+    catboost_thread_count: int = 1
+    # Poll the model artifact for changes every N seconds (0 disables the watcher)
+    model_watch_interval_seconds: float = 0.0
+    # Golden-set accuracy a reloaded model may lose against the serving one, and its floor
+    model_reload_tolerance: float = 0.05
+    model_reload_min_accuracy: float = 0.0
+    # /predict/stream: records scored per micro-batch, and the longest record accepted
+    stream_batch_size: int = 64
+    stream_max_record_bytes: int = 65536
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            prediction_cache_size=_env_int("PREDICTION_CACHE_SIZE", cls.prediction_cache_size),
+            prediction_cache_ttl_seconds=_env_float("PREDICTION_CACHE_TTL_SECONDS", cls.prediction_cache_ttl_seconds),
+            model_engine=os.environ.get("MODEL_ENGINE", cls.model_engine).strip().lower(),
+            ig_steps=_env_int("IG_STEPS", cls.ig_steps),
+            explainer=os.environ.get("EXPLAINER", cls.explainer).strip().lower(),
+            shap_cache_size=_env_int("SHAP_CACHE_SIZE", cls.shap_cache_size),
+            fuzzy_match_max_distance=_env_int("FUZZY_MATCH_MAX_DISTANCE", cls.fuzzy_match_max_distance),
+            feedback_db_path=os.environ.get("FEEDBACK_DB_PATH", cls.feedback_db_path),
+            dataset_backend=os.environ.get("DATASET_BACKEND", cls.dataset_backend).strip().lower(),
+            dataset_db_path=os.environ.get("DATASET_DB_PATH", cls.dataset_db_path),
+            inference_executor=os.environ.get("INFERENCE_EXECUTOR", cls.inference_executor).strip().lower(),
+            inference_workers=_env_int("INFERENCE_WORKERS", cls.inference_workers),
+            inference_queue_size=_env_int("INFERENCE_QUEUE_SIZE", cls.inference_queue_size),
+            inference_retry_after_seconds=_env_int(
+                "INFERENCE_RETRY_AFTER_SECONDS", cls.inference_retry_after_seconds
+            ),
+            catboost_thread_count=_env_int("CATBOOST_THREAD_COUNT", cls.catboost_thread_count),
+            model_watch_interval_seconds=_env_float(
+                "MODEL_WATCH_INTERVAL_SECONDS", cls.model_watch_interval_seconds
+            ),
+            model_reload_tolerance=_env_float("MODEL_RELOAD_TOLERANCE", cls.model_reload_tolerance),
+            model_reload_min_accuracy=_env_float("MODEL_RELOAD_MIN_ACCURACY", cls.model_reload_min_accuracy),
+            stream_batch_size=_env_int("STREAM_BATCH_SIZE", cls.stream_batch_size),
+            stream_max_record_bytes=_env_int("STREAM_MAX_RECORD_BYTES", cls.stream_max_record_bytes),
+        )
+
+
+settings = Settings.from_env()
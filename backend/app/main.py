@@ -1,14 +1,37 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException
+# First, so the startup timeline's origin precedes the heavy imports below.
+from .services.startup import STARTUP  # isort: skip
+
+import asyncio
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import ValidationError
 
-from .schemas import PredictRequest, PredictResponse, ExplainItem, DietPlan
+from .config import settings
+from .pipeline import PredictionPipeline
+from .schemas import (
+    BatchPredictItem,
+    BatchPredictRequest,
+    BatchPredictResponse,
+    PredictRequest,
+    PredictResponse,
+)
+from .services.cache import PredictionCache
 from .services.diet_engine import NutrientScoredLayer
-from .services.explainability import IntegratedGradientsExplainer
+from .services.explainability import build_explainer
+from .services.inference_executor import ExecutorSaturated, InferenceExecutor
+from .services.metrics import CONTENT_TYPE, REGISTRY
+from .services.model_reloader import ModelReloader
 from .services.model_service import DiseaseModelService
 from .services.nlp_service import BiomedicalNLPService
 from .services.risk_engine import RiskAwareLayer
+from .streaming import DuplexStreamingResponse, make_parser, score_stream, validation_reasons
+
+STARTUP.mark("imports")
 
 app = FastAPI(title="Symptom Checker API", version="1.0.0")
 
@@ -20,19 +43,90 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-nlp_service = BiomedicalNLPService()
-model_service = DiseaseModelService()
-explainer = IntegratedGradientsExplainer()
+nlp_service = BiomedicalNLPService(fuzzy_max_distance=settings.fuzzy_match_max_distance)
+# The artifact is loaded once, by the startup hook (or the first request
+# in a process-pool worker, where startup hooks do not run).
+model_service = DiseaseModelService(
+    engine=settings.model_engine, thread_count=settings.catboost_thread_count, autoload=False
+)
+explainer = build_explainer(
+    settings.explainer, model_service, ig_steps=settings.ig_steps, shap_cache_size=settings.shap_cache_size
+)
 risk_layer = RiskAwareLayer()
 diet_layer = NutrientScoredLayer()
+prediction_cache = PredictionCache(settings.prediction_cache_size, settings.prediction_cache_ttl_seconds)
+pipeline = PredictionPipeline(nlp_service, model_service, explainer, risk_layer, diet_layer, prediction_cache)
+reloader = ModelReloader(
+    nlp_service,
+    model_service,
+    tolerance=settings.model_reload_tolerance,
+    min_accuracy=settings.model_reload_min_accuracy,
+)
+
+
+def _start_model_watcher() -> None:
+    # Also the process-pool initializer: each worker holds its own model,
+    # so each watches the artifact itself.
+    reloader.start_watching(settings.model_watch_interval_seconds)
+
+
+inference = InferenceExecutor(
+    settings.inference_executor,
+    settings.inference_workers,
+    settings.inference_queue_size,
+    settings.inference_retry_after_seconds,
+    initializer=_start_model_watcher if settings.inference_executor == "process" else None,
+)
+STARTUP.mark("services")
+
+
+# Module-level so a process pool can pickle them; in a worker process they
+# resolve to that process's own pipeline.
+def _predict_in_worker(payload: PredictRequest) -> PredictResponse:
+    return pipeline.predict(payload)
+
+
+def _predict_batch_in_worker(
+    payloads: List[PredictRequest],
+) -> List[Tuple[Optional[PredictResponse], Optional[str]]]:
+    return pipeline.predict_batch(payloads)
+
+
+async def _run_inference(fn: Callable[..., Any], *args: Any) -> Any:
+    try:
+        return await inference.run(fn, *args)
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+async def _score_streamed_batch(
+    payloads: List[PredictRequest],
+) -> List[Tuple[Optional[PredictResponse], Optional[str]]]:
+    # The response has already started, so wait for a free worker instead of answering 503.
+    while True:
+        try:
+            return await inference.run(_predict_batch_in_worker, payloads)
+        except ExecutorSaturated as e:
+            await asyncio.sleep(e.retry_after)
 
 
 @app.on_event("startup")
 def bootstrap_model() -> None:
     try:
-        model_service._load_if_exists()
+        with STARTUP.phase("model_load"):
+            model_service.ensure_loaded()
+        # The first call into a freshly loaded model is the slowest; pay it here.
+        with STARTUP.phase("warmup"):
+            model_service.predict_proba(np.zeros((1, model_service.layout.n_features), dtype=np.float32))
     except Exception as e:
         print(f"⚠️ Startup model load failed, continuing with fallback mode: {e}")
+    _start_model_watcher()
+
+
+@app.on_event("shutdown")
+def stop_inference() -> None:
+    reloader.stop_watching()
+    inference.shutdown()
 
 
 @app.get("/health")
@@ -40,24 +134,102 @@ def health() -> dict:
     return {"status": "ok"}
 
 
+@app.get("/debug/startup")
+def startup_timeline() -> dict:
+    snapshot = model_service.snapshot if model_service.loaded else None
+    return {
+        **STARTUP.report(),
+        "model": {"kind": snapshot.kind, "version": snapshot.version} if snapshot else None,
+    }
+
+
+@app.get("/cache/stats")
+def cache_stats() -> dict:
+    stats = {**prediction_cache.stats(), "fingerprint": pipeline.fingerprint()}
+    explainer_cache = getattr(explainer, "cache", None)
+    if explainer_cache is not None:
+        stats["explainer_cache"] = explainer_cache.stats()
+    return stats
+
+
+@app.get("/inference/stats")
+def inference_stats() -> dict:
+    return inference.stats()
+
+
+@app.post("/admin/reload-model")
+async def reload_model(force: bool = False) -> dict:
+    """Load, validate and swap in the model artifact on disk; in-flight requests finish on the old model."""
+    report = await asyncio.to_thread(reloader.reload, force)
+    if settings.inference_executor == "process":
+        # Pool workers hold their own models; this call only reloaded the
+        # API process, and each worker picks the artifact up from its watcher.
+        report["workers"] = (
+            "reload via their own watchers"
+            if settings.model_watch_interval_seconds > 0
+            else "not reloaded: set MODEL_WATCH_INTERVAL_SECONDS"
+        )
+    if report["status"] == "failed":
+        raise HTTPException(status_code=500, detail=report)
+    if report["status"] == "rejected":
+        raise HTTPException(status_code=422, detail=report)
+    return report
+
+
+@app.get("/admin/model")
+def model_status() -> dict:
+    return reloader.stats()
+
+
+@app.get("/metrics")
+def metrics() -> Response:
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.post("/predict", response_model=PredictResponse)
-def predict(payload: PredictRequest) -> PredictResponse:
+async def predict(payload: PredictRequest) -> PredictResponse:
     if not payload.text.strip():
         raise HTTPException(status_code=400, detail="Input text is required")
 
-    features, detected = nlp_service.build_feature_vector(payload.text, payload.symptom_intensity)
-    disease, confidence, top_k = model_service.predict(features, detected)
-    explanations = explainer.explain(features, detected)
-    risk_data = risk_layer.score(disease, confidence, payload.symptom_intensity, detected)
-    diet = diet_layer.recommend(disease, str(risk_data["risk_level"]))
-
-    return PredictResponse(
-        predicted_disease=disease,
-        confidence=round(confidence, 4),
-        top_k=top_k,
-        risk_level=str(risk_data["risk_level"]),
-        risk_score=float(risk_data["risk_score"]),
-        explainability=[ExplainItem(**item) for item in explanations],
-        detected_symptoms=detected,
-        diet=DietPlan(**diet),
-    )
+    response = await _run_inference(_predict_in_worker, payload)
+    STARTUP.event("first_predict")
+    return response
+
+
+@app.post("/predict/batch", response_model=BatchPredictResponse)
+async def predict_batch(payload: BatchPredictRequest) -> BatchPredictResponse:
+    results: List[BatchPredictItem] = []
+    valid: List[PredictRequest] = []
+    positions: List[int] = []
+
+    for idx, raw in enumerate(payload.items):
+        try:
+            valid.append(PredictRequest.model_validate(raw))
+            positions.append(idx)
+        except ValidationError as e:
+            results.append(BatchPredictItem(index=idx, error=f"Invalid item: {validation_reasons(e)}"))
+
+    outcomes = await _run_inference(_predict_batch_in_worker, valid) if valid else []
+    for idx, (response, error) in zip(positions, outcomes):
+        results.append(BatchPredictItem(index=idx, result=response, error=error))
+
+    results.sort(key=lambda item: item.index)
+    failed = sum(1 for item in results if item.error is not None)
+    return BatchPredictResponse(results=results, succeeded=len(results) - failed, failed=failed)
+
+
+@app.post("/predict/stream")
+async def predict_stream(request: Request) -> Response:
+    """
+    Score a JSON Lines or CSV upload as it arrives, streaming NDJSON results.
+
+    Results come back per micro-batch, one ``BatchPredictItem`` line per
+    record, followed by a ``{"summary": ...}`` line.
+    """
+    parser = make_parser(request.headers.get("content-type", ""), settings.stream_max_record_bytes)
+    if parser is None:
+        raise HTTPException(
+            status_code=415, detail="Send application/x-ndjson (JSON Lines) or text/csv with a 'text' column"
+        )
+    results = score_stream(request.stream(), parser, _score_streamed_batch, max(1, settings.stream_batch_size))
+    return DuplexStreamingResponse(results, media_type="application/x-ndjson")
@@ -0,0 +1,221 @@
+"""
+Prediction pipeline shared by the single, batch and streaming endpoints.
+"""
+
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .schemas import DietPlan, ExplainItem, PredictRequest, PredictResponse
+from .services.cache import PredictionCache
+from .services.diet_engine import NutrientScoredLayer
+from .services.explainability import IntegratedGradientsExplainer, TreeShapExplainer
+from .services.metrics import PREDICT_SECONDS, STAGE_SECONDS
+from .services.model_service import DiseaseModelService
+from .services.nlp_service import BiomedicalNLPService
+from .services.risk_engine import RiskAwareLayer
+from .services.symptom_catalog import CATALOG_VERSION
+
+STAGES = ("features", "model", "explain", "risk", "diet")
+
+
+class PredictionPipeline:
+    """NLP -> model -> explainer -> risk -> diet, for one request or many."""
+
+    def __init__(
+        self,
+        nlp_service: BiomedicalNLPService,
+        model_service: DiseaseModelService,
+        explainer: Union[IntegratedGradientsExplainer, TreeShapExplainer],
+        risk_layer: RiskAwareLayer,
+        diet_layer: NutrientScoredLayer,
+        cache: Optional[PredictionCache] = None,
+    ) -> None:
+        self.nlp_service = nlp_service
+        self.model_service = model_service
+        self.explainer = explainer
+        self.risk_layer = risk_layer
+        self.diet_layer = diet_layer
+        self.cache = cache if cache is not None else PredictionCache(max_size=0)
+        # Histogram children resolved once so each observation is a bisect
+        self._total_timer = {e: PREDICT_SECONDS.labels(e) for e in ("predict", "batch")}
+        self._stage_timers = {e: {s: STAGE_SECONDS.labels(e, s) for s in STAGES} for e in ("predict", "batch")}
+
+    def fingerprint(self) -> str:
+        """Identifies the model and catalog that produced a cached response."""
+        return f"{self.model_service.version}|catalog-{CATALOG_VERSION}"
+
+    def _cache_key(self, payload: PredictRequest, fingerprint: str) -> Tuple:
+        return PredictionCache.make_key(
+            self.nlp_service.normalize_text(payload.text),
+            payload.symptom_intensity,
+            payload.language,
+            fingerprint,
+            payload.top_k,
+        )
+
+    def predict(self, payload: PredictRequest) -> PredictResponse:
+        start = perf_counter()
+        with self.model_service.pinned():
+            response = self._predict_cached(payload)
+        self._total_timer["predict"].observe(perf_counter() - start)
+        return response
+
+    def _predict_cached(self, payload: PredictRequest) -> PredictResponse:
+        if not self.cache.enabled:
+            return self._predict_uncached(payload)
+
+        fingerprint = self.fingerprint()
+        self.cache.bind(fingerprint)
+        key = self._cache_key(payload, fingerprint)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self._predict_uncached(payload)
+        self.cache.put(key, response)
+        return response
+
+    def _predict_uncached(self, payload: PredictRequest) -> PredictResponse:
+        timers = self._stage_timers["predict"]
+        t0 = perf_counter()
+        features, detected = self.nlp_service.build_feature_vector(
+            payload.text, payload.symptom_intensity, self.model_service.snapshot.layout
+        )
+        t1 = perf_counter()
+        timers["features"].observe(t1 - t0)
+        disease, confidence, top_k = self.model_service.predict(features, detected, payload.top_k)
+        t2 = perf_counter()
+        timers["model"].observe(t2 - t1)
+        explanations = self.explainer.explain(features, detected)
+        t3 = perf_counter()
+        timers["explain"].observe(t3 - t2)
+        risk_data = self.risk_layer.score(disease, confidence, payload.symptom_intensity, detected)
+        t4 = perf_counter()
+        timers["risk"].observe(t4 - t3)
+        diet = self.diet_layer.recommend(disease, str(risk_data["risk_level"]))
+        timers["diet"].observe(perf_counter() - t4)
+
+        return PredictResponse(
+            predicted_disease=disease,
+            confidence=round(confidence, 4),
+            top_k=top_k,
+            risk_level=str(risk_data["risk_level"]),
+            risk_score=float(risk_data["risk_score"]),
+            explainability=[ExplainItem(**item) for item in explanations],
+            detected_symptoms=detected,
+            diet=DietPlan(**diet),
+        )
+
+    def predict_batch(
+        self, payloads: List[PredictRequest]
+    ) -> List[Tuple[Optional[PredictResponse], Optional[str]]]:
+        """
+        Score many requests with one model call.
+
+        Returns one ``(response, error)`` pair per payload, in input order.
+        A row that fails feature extraction or explanation only marks that
+        row as failed; the rest of the batch is still scored.
+        """
+        start = perf_counter()
+        with self.model_service.pinned():
+            outcomes = self._predict_batch(payloads)
+        self._total_timer["batch"].observe(perf_counter() - start)
+        return outcomes
+
+    def _predict_batch(
+        self, payloads: List[PredictRequest]
+    ) -> List[Tuple[Optional[PredictResponse], Optional[str]]]:
+        timers = self._stage_timers["batch"]
+        t0 = perf_counter()
+        outcomes: List[Tuple[Optional[PredictResponse], Optional[str]]] = [(None, None)] * len(payloads)
+        keys: Dict[int, Tuple] = {}
+        if self.cache.enabled:
+            fingerprint = self.fingerprint()
+            self.cache.bind(fingerprint)
+
+        # Rows are written in place, in the pinned model's column order.
+        layout = self.model_service.snapshot.layout
+        matrix = np.zeros((len(payloads), layout.n_features), dtype=np.float32)
+        rows: List[int] = []
+        detected_batch: List[List[str]] = []
+        for idx, payload in enumerate(payloads):
+            if not payload.text.strip():
+                outcomes[idx] = (None, "Input text is required")
+                continue
+            if self.cache.enabled:
+                keys[idx] = self._cache_key(payload, fingerprint)
+                cached = self.cache.get(keys[idx])
+                if cached is not None:
+                    outcomes[idx] = (cached, None)
+                    continue
+            row = matrix[len(rows)]
+            try:
+                detected = self.nlp_service.encode_into(row, payload.text, payload.symptom_intensity, layout)
+            except Exception as e:
+                row[:] = 0.0
+                outcomes[idx] = (None, f"Feature extraction failed: {e}")
+                continue
+            rows.append(idx)
+            detected_batch.append(detected)
+
+        if not rows:
+            return outcomes
+
+        matrix = matrix[: len(rows)]
+        t1 = perf_counter()
+        timers["features"].observe(t1 - t0)
+        predictions = self.model_service.predict_batch(
+            matrix, detected_batch, [payloads[idx].top_k for idx in rows]
+        )
+        t2 = perf_counter()
+        timers["model"].observe(t2 - t1)
+
+        diseases = [disease for disease, _, _ in predictions]
+        confidences = [confidence for _, confidence, _ in predictions]
+        intensities = [payloads[idx].symptom_intensity for idx in rows]
+        risks = self.risk_layer.score_batch(diseases, confidences, intensities, detected_batch)
+        t3 = perf_counter()
+        timers["risk"].observe(t3 - t2)
+        diets = self.diet_layer.recommend_batch(diseases, [str(r["risk_level"]) for r in risks])
+        t4 = perf_counter()
+        timers["diet"].observe(t4 - t3)
+
+        try:
+            batch_explanations: Optional[List[List[Dict[str, float]]]] = self.explainer.explain_batch(
+                matrix, detected_batch
+            )
+        except Exception:
+            # Retry row by row below so a single bad row only fails itself.
+            batch_explanations = None
+        timers["explain"].observe(perf_counter() - t4)
+
+        for pos, idx in enumerate(rows):
+            disease, confidence, top_k = predictions[pos]
+            detected = detected_batch[pos]
+            try:
+                if batch_explanations is not None:
+                    explanations = batch_explanations[pos]
+                else:
+                    explanations = self.explainer.explain(matrix[pos : pos + 1], detected)
+                response = PredictResponse(
+                    predicted_disease=disease,
+                    confidence=round(confidence, 4),
+                    top_k=top_k,
+                    risk_level=str(risks[pos]["risk_level"]),
+                    risk_score=float(risks[pos]["risk_score"]),
+                    explainability=[ExplainItem(**item) for item in explanations],
+                    detected_symptoms=detected,
+                    diet=DietPlan(**diets[pos]),
+                )
+            except Exception as e:
+                outcomes[idx] = (None, f"Prediction failed: {e}")
+                continue
+            outcomes[idx] = (response, None)
+            if idx in keys:
+                self.cache.put(keys[idx], response)
+
+        return outcomes
@@ -1,12 +1,15 @@
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
+MAX_TOP_K = 50
+
 
 class PredictRequest(BaseModel):
     user_id: Optional[str] = None
     language: str = Field(default="en", description="ISO-like code: en, hi, te")
     text: str = Field(..., min_length=2)
     symptom_intensity: Dict[str, float] = Field(default_factory=dict)
+    top_k: int = Field(default=3, ge=1, le=MAX_TOP_K, description="Number of ranked diseases to return")
 
 
 class ExplainItem(BaseModel):
@@ -29,3 +32,27 @@ class PredictResponse(BaseModel):
     explainability: List[ExplainItem]
     detected_symptoms: List[str]
     diet: DietPlan
+
+
+MAX_BATCH_SIZE = 1000
+
+
+class BatchPredictRequest(BaseModel):
+    items: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description="Each item follows the PredictRequest schema and is validated individually",
+    )
+
+
+class BatchPredictItem(BaseModel):
+    index: int
+    result: Optional[PredictResponse] = None
+    error: Optional[str] = None
+
+
+class BatchPredictResponse(BaseModel):
+    results: List[BatchPredictItem]
+    succeeded: int
+    failed: int
@@ -0,0 +1,115 @@
+"""
+Bounded in-process LRU cache with optional TTL and hit/miss/eviction counters.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .ranking import DEFAULT_TOP_K
+
+
+class LRUCache:
+    """Thread-safe LRU cache. ``max_size <= 0`` disables caching entirely."""
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self.ttl_seconds is not None and self._clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class PredictionCache(LRUCache):
+    """
+    LRU cache of ``PredictResponse`` objects.
+
+    Keys embed the model/catalog fingerprint, and the whole cache is dropped
+    the first time a new fingerprint is seen, so a model reload can never
+    serve responses computed by the previous model.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None) -> None:
+        super().__init__(max_size, ttl_seconds)
+        self._fingerprint: Optional[str] = None
+
+    def bind(self, fingerprint: str) -> None:
+        if fingerprint != self._fingerprint:
+            if self._fingerprint is not None:
+                self.clear()
+            self._fingerprint = fingerprint
+
+    @staticmethod
+    def make_key(
+        normalized_text: str, intensity: Dict[str, float], language: str, fingerprint: str, top_k: int = DEFAULT_TOP_K
+    ) -> Tuple[Hashable, ...]:
+        return (normalized_text, tuple(sorted(intensity.items())), language, fingerprint, top_k)
@@ -0,0 +1,94 @@
+"""
+Everyday words that the symptom matchers never respell.
+
+Plain English (and the function words of romanized Hindi, Telugu and
+Spanish) sits one fold or one edit away from a symptom surprisingly often:
+"fewer" folds to "fever", "selling" is one edit from "swelling". Words in
+``COMMON_WORDS`` are left as typed by the romanization fold and are never
+looked up in the typo index, so only genuine misspellings are corrected.
+
+No entry is a synonym or a word of one, so exact matches are unaffected.
+"""
+
+from __future__ import annotations
+
+_ENGLISH = """
+a about above across act actually add after afternoon again against age ago
+all allow almost alone along already also although always am among amount an
+angry animal another answer any anyone anything anyway appear apple are area
+arm around arrive art as ask at attack aunt away baby back bad bag ball bank
+base basket be bear beat beautiful because become bed been beer before began
+begin behind being believe bell below beside best better between big bike bill
+bird birthday bit black blank blow blue board boat book boot born both bottle
+bottom bought box boy bread break breakfast bring brother brought brown build
+building burn bus business busy but buy by cake call came camp can car card
+care carry case cat catch caught cause cell center chair chance change charge
+cheap check cheese chicken child children choose church city class clean clear
+climb clock close clothes cloud coat coffee coin collect college color come
+common company complete computer condition contain continue control cook cool
+copy corner correct cost could count country course cousin cover cow cross
+crowd cry cup cut dance dark daughter day dead deal dear decide deep degree
+desk did die different difficult dinner direct do doctor does dog dollar done
+door double down draw dream dress drink drive drop during each ear early earth
+easy eat edge egg eight either else end enjoy enough enter even evening event
+ever every everyone everything exact example except expect experience explain
+eye face fact fall family famous far farm fast father favorite feel feet fell
+felt few fewer field fight figure fill final finally find fine finger finish
+fire first fish five flat floor flower fly follow food foot for force forest
+forget form forward found four free fresh friend from front fruit full fun
+funny game garden gas gate gave get girl give glad glass go goes going gold
+gone good got govern grand grass gray great green grew ground group grow guess
+had hair half hall hand happen happy hard has hat have he hear heard heart
+heavy held hello help her here herself hill him himself his history hit hold
+hole holiday home hope horse hospital hot hotel hour house how however huge
+hundred hungry hurry husband ice idea if important in inch include inside
+instead interest into iron is island it its itself job join journey juice jump
+just keep kept key kid kill kind king kitchen knew know lady lake land
+language large last late later laugh law lay lead learn least leave led left
+leg less let letter level lie life lift light like line list listen little
+live long look lost lot love low lunch machine made main make man many map
+mark market matter may maybe me meal mean measure meat medicine meet meeting
+men met middle might mile milk million mind minute miss moment money month
+moon more morning most mother mountain mouth move movie much music must my
+myself name near need neighbor never new news next nice night nine noise none
+noon nor north not note nothing notice now number nurse off office oil old on
+once one only open or order other our out outside over own page paint paper
+parent park part party pass past pay pen people perhaps person phone pick
+picture piece place plan plant play please plenty pocket point police poor
+possible post pour power prepare present pretty price print prize probably
+problem produce promise pull push put question quick quiet quite race radio
+rain raise ran rather reach read ready real really reason receive record red
+remember repeat reply rest result return rich ride right ring rise river road
+rock roll room round rule run rush safe said sail sale salt same sat save saw
+say school science sea season seat second see seem seen sell selling send
+sense sent serve set seven several shall shape share she shell ship shirt shoe
+shop short should shout show shower side sign silver simple since sing sister
+sit six size skill sleeping slow small smelling smile snow so soft soil sold
+some someone something sometimes son song soon sorry sound south space speak
+special speed spell spelling spend spent spring square stand star start
+station stay step still stone stood stop store story straight strange street
+strong student study such sudden suit summer sun supper suppose sure surprise
+sweet swim table take talk tall tea teach teacher team tell ten test than
+thank that the their them then there these they thing think third this those
+though thought thousand three through throw tie till time tiny to today
+together told tomorrow tonight too took top total touch toward town toy track
+trade train travel tree trip trouble true try turn twelve twenty twice two
+under understand until upon us use usual valley very village visit voice wait
+walk wall want war warm was wash watch water way we wear weather week weekend
+weight welcome well went were west what wheel when where whether which while
+white who whole whose why wide wife will win wind window winter wish with
+without woman women wonder wood word work world worry would write wrong yard
+year yellow yes yesterday yet you young your yourself
+"""
+
+# Function words of the romanized languages in multilingual_symptoms.json
+_ROMANIZED = """
+aaj abhi apna apne bahut bhi bohot chahiye din ek gayi ghar hai hain
+ham hoon hota hoti hum hun jab jo kab kal kaun kuch kya lekin mera mere meri
+mujhe mujhko nahi nahin par phir raat raha rahi rahe sab sath se subah tab
+tha thi thoda tum unka wala wali yeh woh
+chala chaala konchem ledu naaku naku nenu roju undi unnadi unnayi
+ayer con desde hoy mucho muy poco tengo tiene
+"""
+
+COMMON_WORDS = frozenset(_ENGLISH.split()) | frozenset(_ROMANIZED.split())
@@ -1,21 +1,123 @@
 """
 Dataset loader for disease-symptom mappings, training data, and multilingual synonyms.
+
+Datasets live in CSV/JSON files under ``data_dir`` by default. With
+``backend="sqlite"`` they are kept in a SQLite database instead (see
+``dataset_store``), seeded from those files once; the files are then only
+written by ``export_to_format``.
 """
 
 import csv
 import json
+import numpy as np
 import pandas as pd
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Any, Union
+
+from .dataset_store import DiseaseSymptomRecord, SQLiteDatasetStore, mapping_row
+
+DATASET_BACKENDS = ("csv", "sqlite")
+
+
+@dataclass(frozen=True)
+class DiseaseSymptomMatrix:
+    """
+    Dense disease x symptom weights (float32), 0 where a pair is not mapped.
+
+    Rows follow ``diseases`` and columns ``symptoms`` (both sorted), so a
+    symptom vector scores every disease with one matrix product. Unpacks
+    as the ``(diseases, symptoms, {(disease, symptom): weight})`` tuple
+    ``get_disease_symptom_matrix`` used to return.
+    """
+
+    diseases: List[str]
+    symptoms: List[str]
+    weights: np.ndarray
+    disease_index: Dict[str, int]
+    symptom_index: Dict[str, int]
+    # Mapped pairs as (disease row, symptom column, weight as read)
+    _pairs: Tuple[np.ndarray, np.ndarray, np.ndarray] = field(repr=False)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DiseaseSymptomMatrix":
+        """Pivot a disease/symptom/weight frame; a repeated pair keeps its last weight."""
+        if df.empty:
+            empty = np.empty(0, dtype=np.int64)
+            return cls([], [], np.zeros((0, 0), dtype=np.float32), {}, {}, (empty, empty, np.empty(0)))
+        # In order of first appearance, as the dict was filled row by row
+        pairs = df.groupby(['disease', 'symptom'], sort=False)['weight'].last()
+        disease_codes, diseases = pd.factorize(pairs.index.get_level_values(0), sort=True)
+        symptom_codes, symptoms = pd.factorize(pairs.index.get_level_values(1), sort=True)
+        values = pairs.to_numpy(dtype=np.float64)
+        weights = np.zeros((len(diseases), len(symptoms)), dtype=np.float32)
+        weights[disease_codes, symptom_codes] = values
+        diseases, symptoms = diseases.tolist(), symptoms.tolist()
+        return cls(
+            diseases,
+            symptoms,
+            weights,
+            {d: i for i, d in enumerate(diseases)},
+            {s: i for i, s in enumerate(symptoms)},
+            (disease_codes, symptom_codes, values),
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter((self.diseases, self.symptoms, self.as_dict()))
+
+    def as_dict(self) -> Dict[Tuple[str, str], float]:
+        """The mapped pairs as ``{(disease, symptom): weight}``."""
+        rows, cols, values = self._pairs
+        return {
+            (self.diseases[r], self.symptoms[c]): v for r, c, v in zip(rows.tolist(), cols.tolist(), values.tolist())
+        }
+
+    def weight(self, disease: str, symptom: str) -> float:
+        """Weight of one pair, 0.0 if either is unknown or they are not mapped."""
+        row, col = self.disease_index.get(disease), self.symptom_index.get(symptom)
+        return 0.0 if row is None or col is None else float(self.weights[row, col])
+
+    def symptom_vector(self, symptoms: Union[Iterable[str], Dict[str, float]]) -> np.ndarray:
+        """Column-aligned vector of intensities (a dict) or presence (1.0); unknown symptoms are ignored."""
+        vector = np.zeros(len(self.symptoms), dtype=np.float32)
+        items = symptoms.items() if isinstance(symptoms, dict) else ((s, 1.0) for s in symptoms)
+        for symptom, value in items:
+            col = self.symptom_index.get(symptom)
+            if col is not None:
+                vector[col] = value
+        return vector
+
+    def score(self, vectors: np.ndarray) -> np.ndarray:
+        """Disease scores for one symptom vector (S) or a matrix of them (N x S)."""
+        return np.asarray(vectors, dtype=np.float32) @ self.weights.T
 
 
 class DatasetLoader:
     """Load and manage datasets for the symptom checker system."""
 
-    def __init__(self, data_dir: str = "data"):
-        """Initialize dataset loader."""
+    def __init__(self, data_dir: str = "data", backend: str = "csv", db_path: Optional[str] = None):
+        """
+        Initialize dataset loader.
+
+        Args:
+            data_dir: Directory with the CSV/JSON dataset files
+            backend: 'csv' reads and rewrites those files; 'sqlite' uses a database
+            db_path: SQLite file for the 'sqlite' backend (default: data_dir/datasets.db)
+        """
+        if backend not in DATASET_BACKENDS:
+            raise ValueError(f"Unknown dataset backend {backend!r}; expected one of {DATASET_BACKENDS}")
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
+        self.backend = backend
+        self.store: Optional[SQLiteDatasetStore] = None
+        self._matrix: Optional[Tuple[Any, DiseaseSymptomMatrix]] = None
+        if backend == "sqlite":
+            self.store = SQLiteDatasetStore(db_path or self.data_dir / "datasets.db", seed_dir=self.data_dir)
+
+    def close(self) -> None:
+        """Close the SQLite database, if any."""
+        if self.store is not None:
+            self.store.close()
 
     def load_disease_symptoms_csv(self) -> pd.DataFrame:
         """
@@ -24,6 +126,8 @@ class DatasetLoader:
         Returns:
             DataFrame with columns: disease, symptom, weight, description
         """
+        if self.store is not None:
+            return self.store.disease_symptoms()
         csv_path = self.data_dir / "diseases_symptoms.csv"
         if csv_path.exists():
             return pd.read_csv(csv_path)
@@ -36,6 +140,8 @@ class DatasetLoader:
         Returns:
             DataFrame with patient records and symptom presence/severity
         """
+        if self.store is not None:
+            return self.store.training_records()
         csv_path = self.data_dir / "training_data.csv"
         if csv_path.exists():
             return pd.read_csv(csv_path)
@@ -48,31 +154,57 @@ class DatasetLoader:
         Returns:
             Dict with symptom names and their translations/synonyms
         """
+        if self.store is not None:
+            return self.store.multilingual_symptoms()
         json_path = self.data_dir / "multilingual_symptoms.json"
         if json_path.exists():
             with open(json_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
         return {}
 
-    def get_disease_symptom_matrix(self) -> Tuple[List[str], List[str], Dict[Tuple[str, str], float]]:
+    def get_disease_symptom_matrix(self) -> DiseaseSymptomMatrix:
         """
         Get disease-symptom matrix with weights.
         
+        Rebuilt only when the mappings change (the CSV's mtime and size, or
+        new rows in the database).
+        
         Returns:
-            Tuple of (diseases, symptoms, weight_dict)
+            DiseaseSymptomMatrix; unpacks as (diseases, symptoms, weight_dict)
         """
+        if self.store is not None:
+            version: Any = self.store.disease_symptoms_version()
+        else:
+            csv_path = self.data_dir / "diseases_symptoms.csv"
+            stat = csv_path.stat() if csv_path.exists() else None
+            version = (stat.st_mtime_ns, stat.st_size) if stat else None
+        if self._matrix is None or self._matrix[0] != version:
+            self._matrix = (version, DiseaseSymptomMatrix.from_frame(self.load_disease_symptoms_csv()))
+        return self._matrix[1]
+
+    def get_disease_symptom_weights(self) -> Dict[Tuple[str, str], float]:
+        """``{(disease, symptom): weight}`` for the mapped pairs (the previous dict form)."""
+        return self.get_disease_symptom_matrix().as_dict()
+
+    def get_symptoms_for_disease(self, disease: str) -> List[Tuple[str, float]]:
+        """(symptom, weight) pairs mapped to ``disease``, in insertion order."""
+        if self.store is not None:
+            return self.store.symptoms_for_disease(disease)
         df = self.load_disease_symptoms_csv()
         if df.empty:
-            return [], [], {}
+            return []
+        rows = df[df['disease'] == disease]
+        return list(zip(rows['symptom'].tolist(), rows['weight'].astype(float).tolist()))
 
-        diseases = sorted(df['disease'].unique().tolist())
-        symptoms = sorted(df['symptom'].unique().tolist())
-        
-        weights = {}
-        for _, row in df.iterrows():
-            weights[(row['disease'], row['symptom'])] = row['weight']
-        
-        return diseases, symptoms, weights
+    def get_diseases_for_symptom(self, symptom: str) -> List[Tuple[str, float]]:
+        """(disease, weight) pairs that list ``symptom``, in insertion order."""
+        if self.store is not None:
+            return self.store.diseases_for_symptom(symptom)
+        df = self.load_disease_symptoms_csv()
+        if df.empty:
+            return []
+        rows = df[df['symptom'] == symptom]
+        return list(zip(rows['disease'].tolist(), rows['weight'].astype(float).tolist()))
 
     def get_symptom_synonyms(self) -> Dict[str, List[str]]:
         """
@@ -104,6 +236,9 @@ class DatasetLoader:
             weight: Weight/importance (0-1)
             description: Optional description
         """
+        if self.store is not None:
+            self.store.add_disease_symptoms([(disease, symptom, weight, description)])
+            return
         csv_path = self.data_dir / "diseases_symptoms.csv"
         
         # Read existing data
@@ -129,6 +264,9 @@ class DatasetLoader:
         Args:
             record: Dict with patient data including symptoms and disease label
         """
+        if self.store is not None:
+            self.store.add_training_records([record])
+            return
         csv_path = self.data_dir / "training_data.csv"
         
         # Read existing data
@@ -142,6 +280,51 @@ class DatasetLoader:
         df = pd.concat([df, new_record], ignore_index=True)
         df.to_csv(csv_path, index=False)
 
+    def add_disease_symptom_records(self, records: Iterable[DiseaseSymptomRecord]) -> int:
+        """
+        Add many disease-symptom mappings at once.
+        
+        Args:
+            records: Dicts with disease, symptom, weight[, description], or
+                (disease, symptom, weight[, description]) tuples
+        
+        Returns:
+            Number of records added
+        """
+        if self.store is not None:
+            return self.store.add_disease_symptoms(records)
+        rows = [mapping_row(record) for record in records]
+        if not rows:
+            return 0
+        csv_path = self.data_dir / "diseases_symptoms.csv"
+        new_records = pd.DataFrame(rows, columns=['disease', 'symptom', 'weight', 'description'])
+        if csv_path.exists():
+            new_records = pd.concat([pd.read_csv(csv_path), new_records], ignore_index=True)
+        new_records.to_csv(csv_path, index=False)
+        return len(rows)
+
+    def add_training_records(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add many patient training records at once.
+        
+        Args:
+            records: Dicts with patient data including symptoms and disease label
+        
+        Returns:
+            Number of records added
+        """
+        if self.store is not None:
+            return self.store.add_training_records(records)
+        new_records = pd.DataFrame(list(records))
+        if new_records.empty:
+            return 0
+        csv_path = self.data_dir / "training_data.csv"
+        df = new_records
+        if csv_path.exists():
+            df = pd.concat([pd.read_csv(csv_path), new_records], ignore_index=True)
+        df.to_csv(csv_path, index=False)
+        return len(new_records)
+
     def add_multilingual_variant(self, symptom_id: str, language: str, variants: List[str]) -> None:
         """
         Add multilingual variants for a symptom.
@@ -151,6 +334,9 @@ class DatasetLoader:
             language: Language code (e.g., 'hindi', 'telugu')
             variants: List of symptom terms in that language
         """
+        if self.store is not None:
+            self.store.set_variants(symptom_id, language, variants)
+            return
         json_path = self.data_dir / "multilingual_symptoms.json"
         
         # Load existing data
@@ -174,6 +360,9 @@ class DatasetLoader:
         """
         Export datasets to different formats.
         
+        With the SQLite backend this is how the CSV/JSON files are produced;
+        ``output_dir=data_dir`` refreshes the files in the data directory.
+        
         Args:
             format_type: 'csv', 'json', 'xlsx'
             output_dir: Directory to export to
@@ -0,0 +1,202 @@
+"""
+SQLite storage for DatasetLoader: disease-symptom mappings, training
+records and multilingual variants in one WAL-mode database.
+
+Appends are single INSERTs (bulk ones a single transaction) instead of
+rewriting a CSV per record, and writers in other threads or processes
+wait on the database lock instead of interleaving whole-file rewrites.
+Mappings are indexed by disease and by symptom. Training records keep
+their free-form columns as a JSON payload next to an indexed ``disease``.
+
+A new database is seeded once from the CSV/JSON files in the data
+directory; those files remain the export format (``DatasetLoader.
+export_to_format``) and are not written by this backend.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+DISEASE_SYMPTOM_COLUMNS = ["disease", "symptom", "weight", "description"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS disease_symptoms (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    disease TEXT NOT NULL,
+    symptom TEXT NOT NULL,
+    weight REAL NOT NULL,
+    description TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS disease_symptoms_disease ON disease_symptoms (disease);
+CREATE INDEX IF NOT EXISTS disease_symptoms_symptom ON disease_symptoms (symptom);
+CREATE TABLE IF NOT EXISTS training_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    disease TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS training_records_disease ON training_records (disease);
+CREATE TABLE IF NOT EXISTS multilingual_variants (
+    symptom_id TEXT NOT NULL,
+    language TEXT NOT NULL,
+    variants TEXT NOT NULL,
+    PRIMARY KEY (symptom_id, language)
+);
+"""
+
+# PRAGMA user_version once the database has been seeded from the files
+_SEEDED = 1
+
+DiseaseSymptomRecord = Union[Dict[str, Any], Sequence[Any]]
+
+
+def _json_default(value: Any) -> Any:
+    # numpy scalars from DataFrame rows
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def mapping_row(record: DiseaseSymptomRecord) -> Tuple[str, str, float, str]:
+    """``(disease, symptom, weight, description)`` from a dict or a 3-4 item sequence."""
+    if isinstance(record, dict):
+        disease, symptom, weight = record["disease"], record["symptom"], record["weight"]
+        description = record.get("description", "")
+    else:
+        disease, symptom, weight, *rest = record
+        description = rest[0] if rest else ""
+    if description is None or (isinstance(description, float) and description != description):
+        description = ""
+    return str(disease), str(symptom), float(weight), str(description)
+
+
+class SQLiteDatasetStore:
+    """The three datasets in one SQLite file; safe to share across threads."""
+
+    def __init__(self, path: Union[str, Path], seed_dir: Optional[Union[str, Path]] = None) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        if seed_dir is not None:
+            self._seed(Path(seed_dir))
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _seed(self, data_dir: Path) -> None:
+        with self._lock, self._conn:
+            # BEGIN IMMEDIATE: two processes opening a new database seed it once
+            self._conn.execute("BEGIN IMMEDIATE")
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] >= _SEEDED:
+                return
+            mappings = data_dir / "diseases_symptoms.csv"
+            if mappings.exists():
+                self._insert_mappings(pd.read_csv(mappings).to_dict("records"))
+            training = data_dir / "training_data.csv"
+            if training.exists():
+                self._insert_training(pd.read_csv(training).to_dict("records"))
+            synonyms = data_dir / "multilingual_symptoms.json"
+            if synonyms.exists():
+                with open(synonyms, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for symptom_id, variants in data.get("multilingual_symptoms", {}).items():
+                    for language, terms in variants.items():
+                        self._upsert_variant(symptom_id, language, terms)
+            self._conn.execute(f"PRAGMA user_version = {_SEEDED}")
+
+    # Writes
+
+    def add_disease_symptoms(self, records: Iterable[DiseaseSymptomRecord]) -> int:
+        """Insert mappings (dicts, or ``(disease, symptom, weight[, description])``) in one transaction."""
+        with self._lock, self._conn:
+            return self._insert_mappings(records)
+
+    def add_training_records(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert training records in one transaction."""
+        with self._lock, self._conn:
+            return self._insert_training(records)
+
+    def set_variants(self, symptom_id: str, language: str, variants: List[str]) -> None:
+        """Add or replace one symptom's terms for one language, atomically."""
+        with self._lock, self._conn:
+            self._upsert_variant(symptom_id, language, variants)
+
+    def _insert_mappings(self, records: Iterable[DiseaseSymptomRecord]) -> int:
+        cursor = self._conn.executemany(
+            "INSERT INTO disease_symptoms (disease, symptom, weight, description) VALUES (?, ?, ?, ?)",
+            (mapping_row(record) for record in records),
+        )
+        return cursor.rowcount
+
+    def _insert_training(self, records: Iterable[Dict[str, Any]]) -> int:
+        cursor = self._conn.executemany(
+            "INSERT INTO training_records (disease, payload) VALUES (?, ?)",
+            (
+                (None if record.get("disease") is None else str(record["disease"]),
+                 json.dumps(record, ensure_ascii=False, default=_json_default))
+                for record in records
+            ),
+        )
+        return cursor.rowcount
+
+    def _upsert_variant(self, symptom_id: str, language: str, variants: List[str]) -> None:
+        # The upsert keeps the row's position, as assigning the key in the JSON file did
+        self._conn.execute(
+            "INSERT INTO multilingual_variants (symptom_id, language, variants) VALUES (?, ?, ?) "
+            "ON CONFLICT (symptom_id, language) DO UPDATE SET variants = excluded.variants",
+            (symptom_id, language, json.dumps(list(variants), ensure_ascii=False)),
+        )
+
+    # Reads
+
+    def disease_symptoms(self) -> pd.DataFrame:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT disease, symptom, weight, description FROM disease_symptoms ORDER BY id"
+            ).fetchall()
+        return pd.DataFrame(rows, columns=DISEASE_SYMPTOM_COLUMNS) if rows else pd.DataFrame()
+
+    def disease_symptoms_version(self) -> Tuple[int, int]:
+        """Changes whenever a mapping is added (mappings are never updated in place)."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0), COUNT(*) FROM disease_symptoms").fetchone()
+
+    def symptoms_for_disease(self, disease: str) -> List[Tuple[str, float]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT symptom, weight FROM disease_symptoms WHERE disease = ? ORDER BY id", (disease,)
+            ).fetchall()
+
+    def diseases_for_symptom(self, symptom: str) -> List[Tuple[str, float]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT disease, weight FROM disease_symptoms WHERE symptom = ? ORDER BY id", (symptom,)
+            ).fetchall()
+
+    def training_records(self, disease: Optional[str] = None) -> pd.DataFrame:
+        query, params = "SELECT payload FROM training_records ORDER BY id", ()
+        if disease is not None:
+            query, params = "SELECT payload FROM training_records WHERE disease = ? ORDER BY id", (disease,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return pd.DataFrame([json.loads(payload) for (payload,) in rows])
+
+    def multilingual_symptoms(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT symptom_id, language, variants FROM multilingual_variants ORDER BY rowid"
+            ).fetchall()
+        if not rows:
+            return {}
+        symptoms: Dict[str, Dict[str, List[str]]] = {}
+        for symptom_id, language, variants in rows:
+            symptoms.setdefault(symptom_id, {})[language] = json.loads(variants)
+        return {"multilingual_symptoms": symptoms}
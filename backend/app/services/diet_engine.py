@@ -1,48 +1,52 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, List, Tuple
+
+
+DIET_PLANS: Dict[str, Dict[str, List[str]]] = {
+    "Common Cold": {
+        "recommended": ["Warm soups", "Citrus fruits", "Ginger tea", "Protein-rich dal"],
+        "avoid": ["Deep-fried foods", "Sugary drinks"],
+        "notes": ["Prioritize hydration", "Increase vitamin C intake"],
+    },
+    "Influenza": {
+        "recommended": ["Electrolyte fluids", "Oats", "Boiled vegetables", "Yogurt"],
+        "avoid": ["Processed meat", "Cold sugary beverages"],
+        "notes": ["Soft food for sore throat", "Adequate rest + fluids"],
+    },
+    "COVID-19": {
+        "recommended": ["High-protein meals", "Vitamin D sources", "Zinc-rich nuts", "Anti-inflammatory foods"],
+        "avoid": ["Highly processed foods", "Excess sugar"],
+        "notes": ["Monitor hydration", "Small frequent meals if fatigued"],
+    },
+    "Gastroenteritis": {
+        "recommended": ["ORS", "Banana", "Rice", "Steamed apple"],
+        "avoid": ["Spicy foods", "Milk (acute phase)", "High-fat meals"],
+        "notes": ["Low-fiber bland diet initially", "Rehydrate aggressively"],
+    },
+    "Migraine": {
+        "recommended": ["Magnesium-rich seeds", "Whole grains", "Leafy greens"],
+        "avoid": ["Aged cheese", "Excess caffeine", "Alcohol"],
+        "notes": ["Keep regular meal timings", "Track trigger foods"],
+    },
+    "Type 2 Diabetes Alert": {
+        "recommended": ["Low-GI grains", "Lean proteins", "Legumes", "Non-starchy vegetables"],
+        "avoid": ["Refined sugar", "Sweetened beverages", "Trans fats"],
+        "notes": ["Balanced carbohydrate distribution", "Portion control"],
+    },
+}
+
+DEFAULT_PLAN: Dict[str, List[str]] = {
+    "recommended": ["Balanced plate", "Seasonal fruits", "Adequate protein"],
+    "avoid": ["Ultra-processed foods"],
+    "notes": ["Consult a registered dietitian for personalization"],
+}
 
 
 class NutrientScoredLayer:
     def recommend(self, disease: str, risk_level: str) -> Dict[str, list[str]]:
-        plans = {
-            "Common Cold": {
-                "recommended": ["Warm soups", "Citrus fruits", "Ginger tea", "Protein-rich dal"],
-                "avoid": ["Deep-fried foods", "Sugary drinks"],
-                "notes": ["Prioritize hydration", "Increase vitamin C intake"],
-            },
-            "Influenza": {
-                "recommended": ["Electrolyte fluids", "Oats", "Boiled vegetables", "Yogurt"],
-                "avoid": ["Processed meat", "Cold sugary beverages"],
-                "notes": ["Soft food for sore throat", "Adequate rest + fluids"],
-            },
-            "COVID-19": {
-                "recommended": ["High-protein meals", "Vitamin D sources", "Zinc-rich nuts", "Anti-inflammatory foods"],
-                "avoid": ["Highly processed foods", "Excess sugar"],
-                "notes": ["Monitor hydration", "Small frequent meals if fatigued"],
-            },
-            "Gastroenteritis": {
-                "recommended": ["ORS", "Banana", "Rice", "Steamed apple"],
-                "avoid": ["Spicy foods", "Milk (acute phase)", "High-fat meals"],
-                "notes": ["Low-fiber bland diet initially", "Rehydrate aggressively"],
-            },
-            "Migraine": {
-                "recommended": ["Magnesium-rich seeds", "Whole grains", "Leafy greens"],
-                "avoid": ["Aged cheese", "Excess caffeine", "Alcohol"],
-                "notes": ["Keep regular meal timings", "Track trigger foods"],
-            },
-            "Type 2 Diabetes Alert": {
-                "recommended": ["Low-GI grains", "Lean proteins", "Legumes", "Non-starchy vegetables"],
-                "avoid": ["Refined sugar", "Sweetened beverages", "Trans fats"],
-                "notes": ["Balanced carbohydrate distribution", "Portion control"],
-            },
-        }
-
-        selected = plans.get(disease, {
-            "recommended": ["Balanced plate", "Seasonal fruits", "Adequate protein"],
-            "avoid": ["Ultra-processed foods"],
-            "notes": ["Consult a registered dietitian for personalization"],
-        })
+        base = DIET_PLANS.get(disease, DEFAULT_PLAN)
+        selected = {key: list(values) for key, values in base.items()}
 
         if risk_level in {"High", "Critical"}:
             selected = {
@@ -52,3 +56,16 @@ class NutrientScoredLayer:
             }
 
         return selected
+
+    def recommend_batch(self, diseases: List[str], risk_levels: List[str]) -> List[Dict[str, list[str]]]:
+        """
+        ``recommend`` for each (disease, risk_level) pair.
+
+        Each distinct pair is resolved once; rows sharing a pair share the
+        same plan dict, so callers must copy before mutating.
+        """
+        plans: Dict[Tuple[str, str], Dict[str, list[str]]] = {}
+        for key in zip(diseases, risk_levels):
+            if key not in plans:
+                plans[key] = self.recommend(*key)
+        return [plans[key] for key in zip(diseases, risk_levels)]
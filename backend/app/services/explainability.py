@@ -1,35 +1,269 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
+from .cache import LRUCache
 from .symptom_catalog import SYMPTOMS
 
+EXPLAINERS = ("ig", "shap")
+
+
+def _to_items(
+    feature_names: Sequence[str], attributions: np.ndarray, detected_symptoms: List[str]
+) -> List[Dict[str, float]]:
+    """Detected or clearly positive contributions, largest first, as ``ExplainItem`` dicts."""
+    items: List[Dict[str, float]] = []
+    for idx, symptom in enumerate(feature_names[: len(attributions)]):
+        val = float(attributions[idx])
+        if symptom in detected_symptoms or val > 0.01:
+            items.append({"symptom": symptom, "contribution": round(val, 4)})
+
+    items.sort(key=lambda it: it["contribution"], reverse=True)
+    return items[:8]
+
+
+def _feature_names(explicit: Optional[List[str]], model_service: Any) -> List[str]:
+    """Explicit names, else the serving model's feature layout, else the catalog."""
+    if explicit is not None:
+        return explicit
+    names = getattr(model_service, "feature_names", None)
+    return names if names is not None else SYMPTOMS
+
 
 class IntegratedGradientsExplainer:
-    def _catboost_like_score(self, x: np.ndarray) -> float:
-        return float(np.clip(x.mean() + 0.35 * x.max(), 0.0, 1.0))
+    """
+    Integrated Gradients against the loaded disease model.
+
+    Tree ensembles are piecewise constant, so the path gradient is taken as
+    a forward difference: at each of ``steps`` points on the straight line
+    from the all-zero baseline to ``x``, every active feature is advanced by
+    one step on its own. Summed over the path these differences give the
+    attribution of each feature to the target class probability. All path
+    points and perturbations for all rows are scored in a single batched
+    ``predict_proba`` call.
+
+    When several features cross a split border on the same step, the joint
+    change of the score differs from the sum of the single-feature changes.
+    That interaction residual is shared among the active features in
+    proportion to ``|x - baseline|``, so the attributions always add up to
+    ``f(x) - f(baseline)``; ``raw_completeness_gap`` reports how large the
+    residual was before sharing.
+
+    Without a model service the explainer falls back to a smooth surrogate
+    score so it can still be used standalone.
+    """
+
+    def __init__(
+        self,
+        model_service: Optional[Any] = None,
+        steps: int = 30,
+        feature_names: Optional[Sequence[str]] = None,
+    ) -> None:
+        if steps < 1:
+            raise ValueError("steps must be >= 1")
+        self.model_service = model_service
+        self.steps = steps
+        self._feature_names = list(feature_names) if feature_names is not None else None
+
+    @property
+    def feature_names(self) -> List[str]:
+        return _feature_names(self._feature_names, self.model_service)
+
+    def _catboost_like_score(self, x: np.ndarray) -> np.ndarray:
+        return np.clip(x.mean(axis=1) + 0.35 * x.max(axis=1), 0.0, 1.0)[:, None]
+
+    def _score(self, matrix: np.ndarray) -> np.ndarray:
+        if self.model_service is None:
+            return self._catboost_like_score(matrix)
+        probs, _ = self.model_service.predict_proba(matrix)
+        return np.asarray(probs, dtype=np.float64)
+
+    def _interpolation_rows(self, x: np.ndarray, baseline: np.ndarray) -> tuple:
+        """Path points (steps + 1 rows) followed by one perturbation per (step, active feature)."""
+        steps = self.steps
+        active = np.flatnonzero(x != baseline)
+        alphas = np.arange(steps + 1, dtype=np.float32) / steps
+        path = baseline + alphas[:, None] * (x - baseline)
+
+        delta = (x - baseline)[active] / steps
+        perturbed = np.repeat(path[:-1], len(active), axis=0)
+        perturbed[np.arange(len(perturbed)), np.tile(active, steps)] += np.tile(delta, steps)
+        return np.vstack([path, perturbed]), active
+
+    def attribute_batch(
+        self, features: np.ndarray, targets: Optional[Sequence[Optional[int]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Attributions for every row of ``features`` toward ``targets`` (class
+        indices; ``None`` means the class the model predicts for that row).
+
+        Each result carries a completeness check: ``sum(attributions)``
+        should equal ``prediction - baseline_prediction``, and
+        ``completeness_gap`` is the absolute difference after the
+        interaction residual has been shared out.
+        """
+        features = np.asarray(features, dtype=np.float32)
+        baseline = np.zeros(features.shape[1], dtype=np.float32)
+
+        blocks, actives, offsets = [], [], [0]
+        for x in features:
+            rows, active = self._interpolation_rows(x, baseline)
+            blocks.append(rows)
+            actives.append(active)
+            offsets.append(offsets[-1] + len(rows))
+
+        scores = self._score(np.vstack(blocks))
+
+        results: List[Dict[str, Any]] = []
+        steps = self.steps
+        for i, active in enumerate(actives):
+            block = scores[offsets[i] : offsets[i + 1]]
+            target = targets[i] if targets is not None and targets[i] is not None else int(np.argmax(block[steps]))
+            f_path = block[: steps + 1, target]
+            f_perturbed = block[steps + 1 :, target].reshape(steps, len(active))
+
+            attributions = np.zeros(features.shape[1], dtype=np.float64)
+            expected_total = float(f_path[-1] - f_path[0])
+            if len(active):
+                single = (f_perturbed - f_path[:-1, None]).sum(axis=0)
+                residual = expected_total - float(single.sum())
+                magnitude = np.abs(features[i, active].astype(np.float64) - baseline[active])
+                attributions[active] = single + residual * magnitude / magnitude.sum()
+            else:
+                residual = expected_total
+
+            results.append({
+                "attributions": attributions,
+                "target": target,
+                "prediction": float(f_path[-1]),
+                "baseline_prediction": float(f_path[0]),
+                "completeness_gap": abs(float(attributions.sum()) - expected_total),
+                "raw_completeness_gap": abs(residual),
+            })
+        return results
+
+    def attribute(self, features: np.ndarray, target: Optional[int] = None) -> Dict[str, Any]:
+        return self.attribute_batch(features[:1], [target])[0]
 
     def explain(self, features: np.ndarray, detected_symptoms: List[str]) -> List[Dict[str, float]]:
-        x = features[0]
-        baseline = np.zeros_like(x)
-        steps = 30
-
-        attributions = np.zeros_like(x)
-        for i in range(1, steps + 1):
-            alpha = i / steps
-            x_alpha = baseline + alpha * (x - baseline)
-            grad_approx = np.where(x_alpha > 0, 1.0 / (len(x_alpha) + 1e-6), 0.0)
-            attributions += grad_approx
-
-        attributions = (x - baseline) * attributions / steps
-
-        items: List[Dict[str, float]] = []
-        for idx, symptom in enumerate(SYMPTOMS):
-            val = float(attributions[idx])
-            if symptom in detected_symptoms or val > 0.01:
-                items.append({"symptom": symptom, "contribution": round(val, 4)})
-
-        items.sort(key=lambda it: it["contribution"], reverse=True)
-        return items[:8]
+        return _to_items(self.feature_names, self.attribute(features)["attributions"], detected_symptoms)
+
+    def explain_batch(
+        self, features: np.ndarray, detected_batch: List[List[str]]
+    ) -> List[List[Dict[str, float]]]:
+        results = self.attribute_batch(features)
+        return [
+            _to_items(self.feature_names, r["attributions"], detected) for r, detected in zip(results, detected_batch)
+        ]
+
+
+class TreeShapExplainer:
+    """
+    Exact TreeSHAP contributions from CatBoost's ``ShapValues``.
+
+    Contributions are for the predicted class, in the model's raw
+    (log-odds) units, and together with the expected value add up to the
+    raw score of that class. SHAP is computed on the feature vector rounded
+    to ``decimals`` and memoized per model version, since only a handful of
+    symptoms are ever active at once. When no CatBoost model is loaded, or
+    SHAP fails, ``fallback`` (usually Integrated Gradients) is used instead.
+    """
+
+    def __init__(
+        self,
+        model_service: Any,
+        fallback: Optional[Any] = None,
+        cache_size: int = 4096,
+        decimals: int = 2,
+        feature_names: Optional[Sequence[str]] = None,
+    ) -> None:
+        self.model_service = model_service
+        self.fallback = fallback if fallback is not None else IntegratedGradientsExplainer(model_service)
+        self.cache = LRUCache(cache_size)
+        self.decimals = decimals
+        self._feature_names = list(feature_names) if feature_names is not None else None
+
+    @property
+    def feature_names(self) -> List[str]:
+        return _feature_names(self._feature_names, self.model_service)
+
+    def _quantize(self, features: np.ndarray) -> np.ndarray:
+        # +0.0 folds -0.0 into 0.0 so both produce the same cache key
+        return np.round(np.asarray(features, dtype=np.float32), self.decimals) + np.float32(0.0)
+
+    def _shap_values(self, model: Any, rows: np.ndarray) -> np.ndarray:
+        """Predicted-class SHAP row (features + expected value) for each row."""
+        from catboost import Pool
+
+        thread_count = getattr(self.model_service, "thread_count", -1)
+        shap = np.asarray(model.get_feature_importance(Pool(rows), type="ShapValues", thread_count=thread_count))
+        if shap.ndim == 2:
+            # Binary models return one log-odds vector for the positive class;
+            # the negative class is its mirror image.
+            raw = shap.sum(axis=1, keepdims=True)
+            return np.where(raw >= 0.0, shap, -shap)
+        # Multiclass: (rows x classes x features + 1); each class's row sums
+        # to its raw score, so the argmax of the sums is the predicted class.
+        predicted = shap.sum(axis=2).argmax(axis=1)
+        return shap[np.arange(len(rows)), predicted]
+
+    def shap_batch(self, features: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Predicted-class contributions (N x features), or ``None`` when no
+        CatBoost model is loaded. Distinct uncached rows are scored in one
+        ``ShapValues`` call.
+        """
+        model = self.model_service.active_model()
+        if model is None:
+            return None
+
+        quantized = self._quantize(features)
+        version = self.model_service.version
+        keys: List[Tuple[str, bytes]] = [(version, row.tobytes()) for row in quantized]
+
+        values: Dict[Tuple[str, bytes], np.ndarray] = {}
+        missing: Dict[Tuple[str, bytes], int] = {}
+        for i, key in enumerate(keys):
+            if key in values or key in missing:
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                values[key] = cached
+            else:
+                missing[key] = i
+
+        if missing:
+            rows = quantized[list(missing.values())]
+            for key, shap_row in zip(missing, self._shap_values(model, rows)):
+                contributions = shap_row[:-1].copy()
+                self.cache.put(key, contributions)
+                values[key] = contributions
+
+        return np.vstack([values[key] for key in keys])
+
+    def explain(self, features: np.ndarray, detected_symptoms: List[str]) -> List[Dict[str, float]]:
+        return self.explain_batch(features[:1], [detected_symptoms])[0]
+
+    def explain_batch(
+        self, features: np.ndarray, detected_batch: List[List[str]]
+    ) -> List[List[Dict[str, float]]]:
+        try:
+            contributions = self.shap_batch(features)
+        except Exception as e:
+            print(f"⚠️  TreeSHAP failed, falling back: {e}")
+            contributions = None
+        if contributions is None:
+            return self.fallback.explain_batch(features, detected_batch)
+        return [_to_items(self.feature_names, row, detected) for row, detected in zip(contributions, detected_batch)]
+
+
+def build_explainer(kind: str, model_service: Any, ig_steps: int = 30, shap_cache_size: int = 4096) -> Any:
+    """Explainer selected by the ``EXPLAINER`` setting."""
+    if kind not in EXPLAINERS:
+        raise ValueError(f"Unknown explainer {kind!r}; expected one of {EXPLAINERS}")
+    integrated = IntegratedGradientsExplainer(model_service, steps=ig_steps)
+    if kind == "ig":
+        return integrated
+    return TreeShapExplainer(model_service, fallback=integrated, cache_size=shap_cache_size)
@@ -0,0 +1,122 @@
+"""
+Columnar cache of the training feature matrix, written next to the CSV.
+
+``integrate_dataset.py`` writes ``training_data_15k.csv`` for people and
+tools, and alongside it ``<stem>.features.npy`` (float32 rows x features),
+``<stem>.labels.npy`` (int32 index into the label list) and a
+``<stem>.schema.json`` naming the columns and labels and recording the
+CSV's SHA-256. The retrainer memory-maps the arrays instead of parsing the
+CSV as long as that hash still matches, so a hand-edited CSV is never
+shadowed by a stale cache. The schema is written last: a reader that
+finds a schema finds the arrays it describes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .model_artifact import file_sha256
+
+FORMAT_VERSION = 1
+
+
+class FeatureCacheError(Exception):
+    """There is no usable cache for the CSV: missing, stale or inconsistent."""
+
+
+def cache_paths(csv_path: Path) -> Tuple[Path, Path, Path]:
+    """``(schema, features, labels)`` paths for ``csv_path``."""
+    csv_path = Path(csv_path)
+    stem = csv_path.with_suffix("")
+    return (
+        stem.with_name(f"{stem.name}.schema.json"),
+        stem.with_name(f"{stem.name}.features.npy"),
+        stem.with_name(f"{stem.name}.labels.npy"),
+    )
+
+
+def _save_npy(path: Path, array: np.ndarray) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, array, allow_pickle=False)
+    os.replace(tmp, path)
+
+
+def write_feature_cache(
+    csv_path: Path, features: np.ndarray, labels: Sequence[str], feature_columns: Sequence[str]
+) -> Dict[str, Any]:
+    """
+    Cache ``features`` (one row per CSV row) and per-row ``labels`` for
+    ``csv_path``, which must already hold the same data; returns the schema.
+    """
+    csv_path = Path(csv_path)
+    features = np.ascontiguousarray(features, dtype=np.float32)
+    if features.ndim != 2 or features.shape != (len(labels), len(feature_columns)):
+        raise ValueError(
+            f"features are {features.shape}, expected ({len(labels)}, {len(feature_columns)})"
+        )
+    classes, label_index = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+
+    schema_path, features_path, labels_path = cache_paths(csv_path)
+    _save_npy(features_path, features)
+    _save_npy(labels_path, label_index.astype(np.int32))
+    schema = {
+        "format_version": FORMAT_VERSION,
+        "source": csv_path.name,
+        "source_sha256": file_sha256(csv_path),
+        "rows": int(features.shape[0]),
+        "feature_columns": [str(column) for column in feature_columns],
+        "labels": classes.tolist(),
+        "features_file": features_path.name,
+        "labels_file": labels_path.name,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    tmp = schema_path.with_name(f".{schema_path.name}.tmp")
+    tmp.write_text(json.dumps(schema, indent=2), encoding="utf-8")
+    os.replace(tmp, schema_path)
+    return schema
+
+
+def load_feature_cache(
+    csv_path: Path, source_sha256: str = ""
+) -> Tuple[np.ndarray, np.ndarray, List[str], Dict[str, Any]]:
+    """
+    ``(X, y, feature_columns, schema)`` from the cache of ``csv_path``.
+
+    ``X`` is a read-only memory map of the float32 matrix and ``y`` the
+    per-row label strings. Raises ``FeatureCacheError`` unless the cache
+    exists, was built from a CSV with the current content hash (pass
+    ``source_sha256`` if it is already known) and has the recorded shapes.
+    """
+    csv_path = Path(csv_path)
+    schema_path, _, _ = cache_paths(csv_path)
+    if not schema_path.exists():
+        raise FeatureCacheError(f"no feature cache for {csv_path.name}")
+    try:
+        schema = json.loads(schema_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise FeatureCacheError(f"unreadable {schema_path.name}: {e}") from e
+    version = schema.get("format_version")
+    if not isinstance(version, int) or version > FORMAT_VERSION:
+        raise FeatureCacheError(f"unsupported feature cache format {version!r}")
+    if schema.get("source_sha256") != (source_sha256 or file_sha256(csv_path)):
+        raise FeatureCacheError(f"feature cache is stale: {csv_path.name} has changed")
+
+    try:
+        X = np.load(schema_path.parent / schema["features_file"], mmap_mode="r", allow_pickle=False)
+        label_index = np.load(schema_path.parent / schema["labels_file"], mmap_mode="r", allow_pickle=False)
+    except (OSError, ValueError, KeyError) as e:
+        raise FeatureCacheError(f"unreadable feature cache: {e}") from e
+    rows, columns, labels = schema["rows"], schema["feature_columns"], schema["labels"]
+    if X.dtype != np.float32 or X.shape != (rows, len(columns)) or label_index.shape != (rows,):
+        raise FeatureCacheError(f"feature cache arrays do not match {schema_path.name}")
+    if rows and int(label_index.max()) >= len(labels):
+        raise FeatureCacheError(f"label index out of range in {schema['labels_file']}")
+    y = np.asarray(labels, dtype=object)[label_index]
+    return X, y, list(columns), schema
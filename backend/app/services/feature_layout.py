@@ -0,0 +1,144 @@
+"""
+Feature layout: where each piece of NLP output goes in a model's input row.
+
+The bundled models take one column per catalog symptom, in ``SYMPTOMS``
+order. The retrained model takes the ``feature_columns`` that
+integrate_dataset.py found in the training text: keywords like
+``"high fever"``, ``"runny nose"`` or ``"joint"``, set to 1.0 when the
+keyword occurs in the text. A ``FeatureLayout`` is compiled once per loaded
+model and writes a request's detected symptoms, keywords and intensities
+straight into a float32 row in that model's column order.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .symptom_catalog import SYMPTOMS
+
+# Value of a symptom detected in the text (intensities may raise it)
+DETECTED_VALUE = 0.6
+# Value of a keyword column whose keyword occurs in the text, as in training
+KEYWORD_VALUE = 1.0
+
+
+class FeatureLayoutError(ValueError):
+    """A model's feature columns cannot be fed from the symptom catalog."""
+
+
+def _words(name: str) -> str:
+    return name.replace("_", " ").lower()
+
+
+class FeatureLayout:
+    """
+    Compiled mapping from NLP output to a model's feature columns.
+
+    With ``text_keywords`` every column is a training keyword: it is set when
+    the keyword occurs in the normalized text, and also fed by every catalog
+    symptom whose name contains it (``"ache"`` by headache and bodyache), the
+    same substring rule integrate_dataset.py applied to the training text.
+    Otherwise columns are catalog symptom names fed by that symptom only.
+    """
+
+    def __init__(self, columns: Sequence[str], text_keywords: bool = False) -> None:
+        self.columns: Tuple[str, ...] = tuple(str(column) for column in columns)
+        self.text_keywords = text_keywords
+        self.n_features = len(self.columns)
+
+        by_symptom: Dict[str, List[int]] = {}
+        for symptom in SYMPTOMS:
+            words = _words(symptom)
+            for idx, column in enumerate(self.columns):
+                if column == symptom or (text_keywords and _words(column) in words):
+                    by_symptom.setdefault(symptom, []).append(idx)
+        self._by_symptom: Dict[str, Tuple[int, ...]] = {s: tuple(idx) for s, idx in by_symptom.items()}
+        # Reverse map, catalog order: symptoms feeding each column
+        feeds: List[List[str]] = [[] for _ in self.columns]
+        for symptom, indices in self._by_symptom.items():
+            for idx in indices:
+                feeds[idx].append(symptom)
+        self._feeds: Tuple[Tuple[str, ...], ...] = tuple(tuple(f) for f in feeds)
+        self._keywords: Tuple[Tuple[int, str], ...] = (
+            tuple((idx, _words(column)) for idx, column in enumerate(self.columns)) if text_keywords else ()
+        )
+
+    @classmethod
+    def for_model(cls, feature_columns: Optional[Sequence[str]], n_features: int) -> "FeatureLayout":
+        """
+        Layout for a model with ``n_features`` inputs named ``feature_columns``.
+
+        An empty ``feature_columns`` means the catalog order. Raises
+        ``FeatureLayoutError`` when the layouts cannot be reconciled.
+        """
+        columns = [str(column) for column in feature_columns or []]
+        if not columns:
+            if n_features != len(SYMPTOMS):
+                raise FeatureLayoutError(
+                    f"model takes {n_features} features but names none, and the catalog has {len(SYMPTOMS)}"
+                )
+            return CATALOG_LAYOUT
+        if len(columns) != n_features:
+            raise FeatureLayoutError(f"model takes {n_features} features but the manifest names {len(columns)}")
+        duplicates = sorted({column for column in columns if columns.count(column) > 1})
+        if duplicates:
+            raise FeatureLayoutError(f"duplicate feature columns: {', '.join(duplicates)}")
+        if columns == list(SYMPTOMS):
+            return CATALOG_LAYOUT
+
+        layout = cls(columns, text_keywords=not set(columns) <= set(SYMPTOMS))
+        fed = {idx for indices in layout._by_symptom.values() for idx in indices}
+        if not fed:
+            raise FeatureLayoutError(
+                f"none of the feature columns ({', '.join(columns[:5])}, ...) match a catalog symptom"
+            )
+        return layout
+
+    @property
+    def names(self) -> List[str]:
+        """Column names, for explanations."""
+        return list(self.columns)
+
+    def symptom_columns(self, symptom: str) -> Tuple[int, ...]:
+        """Column indices fed by catalog ``symptom``."""
+        return self._by_symptom.get(symptom, ())
+
+    def encode_into(
+        self, row: np.ndarray, normalized_text: str, detected: Iterable[str], intensity: Mapping[str, float]
+    ) -> None:
+        """Write one request into ``row`` (length ``n_features``, all zeros)."""
+        for idx, keyword in self._keywords:
+            if keyword in normalized_text:
+                row[idx] = KEYWORD_VALUE
+
+        by_symptom = self._by_symptom
+        for symptom in detected:
+            for idx in by_symptom.get(symptom, ()):
+                if row[idx] < DETECTED_VALUE:
+                    row[idx] = DETECTED_VALUE
+
+        for symptom, score in intensity.items():
+            indices = by_symptom.get(symptom)
+            if indices:
+                clipped = min(max(float(score), 0.0), 1.0)
+                for idx in indices:
+                    if row[idx] < clipped:
+                        row[idx] = clipped
+
+    def encode(
+        self, normalized_text: str, detected: Iterable[str], intensity: Mapping[str, float]
+    ) -> np.ndarray:
+        """A new ``(1, n_features)`` float32 row."""
+        vector = np.zeros((1, self.n_features), dtype=np.float32)
+        self.encode_into(vector[0], normalized_text, detected, intensity)
+        return vector
+
+    def active_symptoms(self, row: np.ndarray) -> List[str]:
+        """Catalog symptoms that feed a non-zero column of ``row``."""
+        active = {symptom for idx in np.flatnonzero(row > 0) for symptom in self._feeds[idx]}
+        return [symptom for symptom in self._by_symptom if symptom in active]
+
+
+CATALOG_LAYOUT = FeatureLayout(SYMPTOMS)
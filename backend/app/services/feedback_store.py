@@ -0,0 +1,240 @@
+"""
+Append-only feedback store: SQLite in WAL mode fed by a background writer.
+
+POST handlers only enqueue; a single writer thread drains the queue and
+commits entries in batches, so request latency no longer depends on how
+much feedback has been collected. Only per-kind counters are kept in
+memory; they count committed entries only and are rebuilt from the
+database on startup.
+
+Sequence numbers are allocated by the writer inside its ``BEGIN
+IMMEDIATE`` transaction, after the last one committed for the kind, so
+several processes (uvicorn workers) can share one database without ever
+handing out the same number twice.
+
+A batch that fails to commit (e.g. ``SQLITE_BUSY`` while another process
+holds the write lock) is retried with exponential backoff rather than
+dropped; meanwhile new entries wait in the queue, and ``append`` raises
+``FeedbackQueueFull`` once it is full. Only on ``close`` does the writer
+give up, after ``CLOSE_ATTEMPTS`` more tries, log what was lost, and fail
+the entries' futures with ``FeedbackNotSaved``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+FEEDBACK_KINDS = ("predictions", "features", "bugs")
+
+# Backoff between attempts to commit a failed batch, and attempts left once closing
+RETRY_INITIAL_DELAY = 0.05
+RETRY_MAX_DELAY = 2.0
+CLOSE_ATTEMPTS = 3
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    correct INTEGER,
+    payload TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS feedback_kind_seq ON feedback (kind, seq);
+"""
+
+_STOP = object()
+
+
+class FeedbackQueueFull(Exception):
+    """Raised when the writer has fallen ``max_pending`` entries behind."""
+
+
+class FeedbackNotSaved(Exception):
+    """Set on an entry's future when the writer gave up on it at close."""
+
+
+class FeedbackStore:
+    """
+    Durable feedback log.
+
+    ``append`` queues an entry and returns a future for its per-kind
+    sequence number (1-based), set once the entry is committed. Entries are
+    committed by the writer thread every ``batch_size`` entries or
+    ``flush_interval`` seconds, whichever comes first; ``flush`` waits until
+    everything queued so far is on disk.
+    ``stats`` counts committed entries; queued ones are ``pending``.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = 256,
+        flush_interval: float = 0.05,
+        max_pending: int = 10_000,
+    ) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        # Committed entries per kind
+        self._counts: Dict[str, int] = {kind: 0 for kind in FEEDBACK_KINDS}
+        self._correct = 0
+        # Failed commit attempts, and entries given up on at close
+        self.write_errors = 0
+        self.dropped = 0
+        self._closing = threading.Event()
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._recover()
+
+        self._writer = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+        self._writer.start()
+
+    def _recover(self) -> None:
+        rows = self._conn.execute(
+            "SELECT kind, COUNT(*), COALESCE(SUM(correct), 0) FROM feedback GROUP BY kind"
+        ).fetchall()
+        for kind, count, correct in rows:
+            self._counts[kind] = count
+            if kind == "predictions":
+                self._correct = correct
+
+    def append(self, kind: str, entry: Dict[str, Any]) -> "Future[int]":
+        if kind not in self._counts:
+            raise ValueError(f"Unknown feedback kind {kind!r}; expected one of {FEEDBACK_KINDS}")
+        correct = None
+        if kind == "predictions":
+            correct = int(str(entry["actual_disease"]).lower() == str(entry["predicted_disease"]).lower())
+
+        seq: "Future[int]" = Future()
+        try:
+            self._queue.put_nowait((kind, entry.get("timestamp", ""), correct, json.dumps(entry), seq))
+        except queue.Full:
+            raise FeedbackQueueFull("Feedback writer is behind; try again shortly") from None
+        return seq
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counts": dict(self._counts),
+                "correct_predictions": self._correct,
+                "pending": self._queue.qsize(),
+                "write_errors": self.write_errors,
+                "dropped": self.dropped,
+            }
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._closing.set()
+            self._queue.put(_STOP)
+            self._writer.join()
+        self._conn.close()
+
+    def import_json(self, path: Union[str, Path]) -> int:
+        """One-off import of a legacy ``feedback_data.json`` snapshot."""
+        with open(path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+        imported = 0
+        for kind in FEEDBACK_KINDS:
+            for entry in legacy.get(kind, []):
+                try:
+                    self.append(kind, entry)
+                except FeedbackQueueFull:
+                    self.flush()
+                    self.append(kind, entry)
+                imported += 1
+        self.flush()
+        return imported
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: List[Tuple] = []
+            stop = item is _STOP
+            if not stop:
+                batch.append(item)
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + int(stop)):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[Tuple]) -> None:
+        delay = RETRY_INITIAL_DELAY
+        closing_attempts = 0
+        while True:
+            try:
+                seqs = self._insert(batch)
+                break
+            except sqlite3.Error as e:
+                with self._lock:
+                    self.write_errors += 1
+                if self._closing.is_set():
+                    closing_attempts += 1
+                    if closing_attempts >= CLOSE_ATTEMPTS:
+                        self._give_up(batch, e)
+                        return
+                logger.warning("Failed to write %d feedback entries (%s); retrying in %.2fs", len(batch), e, delay)
+                # close() cuts the wait short
+                self._closing.wait(delay)
+                delay = min(delay * 2, RETRY_MAX_DELAY)
+
+        with self._lock:
+            for kind, _, correct, _, _ in batch:
+                self._counts[kind] += 1
+                if correct:
+                    self._correct += 1
+        for (_, _, _, _, future), seq in zip(batch, seqs):
+            future.set_result(seq)
+
+    def _insert(self, batch: List[Tuple]) -> List[int]:
+        """Commit ``batch`` in one write transaction; returns the sequence numbers given."""
+        with self._conn:
+            # Take the write lock before reading the last numbers, so no
+            # other process can commit the same ones in between
+            self._conn.execute("BEGIN IMMEDIATE")
+            last = dict(self._conn.execute("SELECT kind, MAX(seq) FROM feedback GROUP BY kind").fetchall())
+            rows = []
+            for kind, timestamp, correct, payload, _ in batch:
+                last[kind] = last.get(kind, 0) + 1
+                rows.append((kind, last[kind], timestamp, correct, payload))
+            self._conn.executemany(
+                "INSERT INTO feedback (kind, seq, timestamp, correct, payload) VALUES (?, ?, ?, ?, ?)", rows
+            )
+        return [row[1] for row in rows]
+
+    def _give_up(self, batch: List[Tuple], error: sqlite3.Error) -> None:
+        with self._lock:
+            self.write_errors += 1
+            self.dropped += len(batch)
+        logger.error("Dropped %d feedback entries that could not be written: %s", len(batch), error)
+        for *_, future in batch:
+            future.set_exception(FeedbackNotSaved(f"Feedback could not be written: {error}"))
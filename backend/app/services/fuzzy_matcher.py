@@ -0,0 +1,216 @@
+"""
+Typo-tolerant symptom lookup over a precomputed deletion index (SymSpell).
+
+Every synonym is indexed once under each string obtained by deleting up to
+``max_distance`` characters from its first ``PREFIX_LENGTH`` characters. A
+lookup generates the same deletions of the query and only verifies the
+terms found under them, so its cost depends on the prefix length, not on
+the number of synonyms. Candidates are confirmed with the optimal string
+alignment distance (edits plus adjacent transpositions: "couhg" is one
+edit from "cough").
+
+The index only looks at the words the exact matcher left over: runs of
+tokens outside every exact match, tried as phrases of up to as many words
+as the longest synonym, longest first. Short words and everyday words
+(``COMMON_WORDS``) are never corrected: "rush" is a word, not a typo for
+"rash".
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .common_words import COMMON_WORDS
+from .symptom_catalog import SYMPTOMS
+
+MULTILINGUAL_SYMPTOMS_PATH = Path(__file__).resolve().parents[2] / "data" / "multilingual_symptoms.json"
+
+# Only the first PREFIX_LENGTH characters are expanded into deletions
+PREFIX_LENGTH = 7
+MAX_EDIT_DISTANCE = 2
+# Memoized phrase lookups per index; user text repeats the same words a lot
+LOOKUP_CACHE_SIZE = 8192
+
+# Words in the normalized text; punctuation separates them like whitespace
+_TOKEN = re.compile(r"[^\s,.;:!?()\[\]{}\"'/\\|-]+")
+
+
+def load_multilingual_synonyms(path: Path = MULTILINGUAL_SYMPTOMS_PATH) -> Dict[str, List[str]]:
+    """All languages' terms per symptom from ``multilingual_symptoms.json``; ``{}`` if absent."""
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        symptom: [term for terms in variants.values() for term in terms]
+        for symptom, variants in data.get("multilingual_symptoms", {}).items()
+    }
+
+
+def allowed_distance(length: int, max_distance: int = MAX_EDIT_DISTANCE) -> int:
+    """
+    Edits tolerated in a word or phrase of ``length`` characters: none below
+    6 (too many short words are one edit from a short synonym: "child" and
+    "chils", "paint" and "pain"), one below 9.
+    """
+    if length < 6:
+        return 0
+    return min(max_distance, 1 if length < 9 else 2)
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or ``limit + 1`` once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    # The first character is kept: typos there are rare, and keeping it
+    # stops "told" or "rain" from being read as "cold" or "pain".
+    prefix = word[:PREFIX_LENGTH]
+    found = {prefix}
+    frontier = {prefix}
+    for _ in range(max_distance):
+        frontier = {
+            candidate[:pos] + candidate[pos + 1:]
+            for candidate in frontier
+            for pos in range(1, len(candidate))
+        }
+        found |= frontier
+    return found
+
+
+class FuzzySymptomIndex:
+    """Deletion index mapping misspelled words and phrases to catalog symptoms."""
+
+    def __init__(
+        self,
+        synonyms: Mapping[str, Iterable[str]],
+        order: Sequence[str] = SYMPTOMS,
+        max_distance: int = MAX_EDIT_DISTANCE,
+    ) -> None:
+        if not 0 <= max_distance <= MAX_EDIT_DISTANCE:
+            raise ValueError(f"max_distance must be between 0 and {MAX_EDIT_DISTANCE}, got {max_distance}")
+        self.max_distance = max_distance
+        self._order = list(order)
+        rank = {symptom: idx for idx, symptom in enumerate(order)}
+
+        # Term table: (term, symptom rank); the index holds positions in it
+        self._terms: List[Tuple[str, int]] = []
+        self._index: Dict[str, List[int]] = {}
+        seen: Set[Tuple[str, int]] = set()
+        for symptom, terms in synonyms.items():
+            if symptom not in rank:
+                continue
+            for term in terms:
+                term = " ".join(term.lower().split())
+                entry = (term, rank[symptom])
+                if not term or entry in seen:
+                    continue
+                seen.add(entry)
+                for key in _deletes(term, max_distance):
+                    self._index.setdefault(key, []).append(len(self._terms))
+                self._terms.append(entry)
+        self.max_words = max((term.count(" ") + 1 for term, _ in self._terms), default=0)
+        # Term lengths by word count, to skip phrases no term is close to
+        self._lengths: Dict[int, Set[int]] = {}
+        for term, _ in self._terms:
+            self._lengths.setdefault(term.count(" ") + 1, set()).add(len(term))
+        self._cached_lookup = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._lookup)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def lookup(self, phrase: str) -> Optional[Tuple[Tuple[int, ...], int]]:
+        """
+        ``(symptom ranks, distance)`` of the closest synonym to ``phrase``
+        (one term can name several symptoms, as "tired" does), or None if
+        there is none within the allowed distance, equally close terms name
+        different symptoms, or every word of ``phrase`` is a common word.
+        """
+        return self._cached_lookup(phrase)
+
+    def _lookup(self, phrase: str) -> Optional[Tuple[Tuple[int, ...], int]]:
+        if all(word in COMMON_WORDS for word in phrase.split(" ")):
+            return None
+        limit = allowed_distance(len(phrase), self.max_distance)
+        lengths = self._lengths.get(phrase.count(" ") + 1, set())
+        if not any(length in lengths for length in range(len(phrase) - limit, len(phrase) + limit + 1)):
+            return None
+        best = limit + 1
+        closest: Dict[str, Set[int]] = {}
+        checked: Set[int] = set()
+        for key in _deletes(phrase, limit):
+            for term_id in self._index.get(key, ()):
+                if term_id in checked:
+                    continue
+                checked.add(term_id)
+                term, rank = self._terms[term_id]
+                if term[0] != phrase[0]:
+                    continue
+                distance = edit_distance(phrase, term, min(best, limit))
+                if distance < best:
+                    best, closest = distance, {}
+                if distance == best <= limit:
+                    closest.setdefault(term, set()).add(rank)
+        if best > limit:
+            return None
+        ranks = {frozenset(term_ranks) for term_ranks in closest.values()}
+        if len(ranks) != 1:
+            return None
+        return tuple(sorted(ranks.pop())), best
+
+    def find_ranks(self, text: str, consumed: Iterable[Tuple[int, int, int]] = ()) -> Set[int]:
+        """
+        Catalog positions of the symptoms misspelled in ``text`` (normalized).
+
+        ``consumed`` holds the exact matches as ``(rank, start, end)``; words
+        overlapping one of them are not looked up.
+        """
+        spans = [(start, end) for _, start, end in consumed]
+        runs: List[List[Tuple[int, int]]] = [[]]
+        for match in _TOKEN.finditer(text):
+            start, end = match.span()
+            if any(start < span_end and span_start < end for span_start, span_end in spans):
+                runs.append([])
+                continue
+            run = runs[-1]
+            # Phrases only span words separated by a single space
+            if run and text[run[-1][1]:start] != " ":
+                runs.append([])
+                run = runs[-1]
+            run.append((start, end))
+
+        found: Set[int] = set()
+        for run in runs:
+            i = 0
+            while i < len(run):
+                for words in range(min(self.max_words, len(run) - i), 0, -1):
+                    hit = self.lookup(text[run[i][0]:run[i + words - 1][1]])
+                    if hit is not None:
+                        found.update(hit[0])
+                        i += words
+                        break
+                else:
+                    i += 1
+        return found
@@ -0,0 +1,167 @@
+"""
+Bounded executor for CPU-bound inference with admission control.
+
+Async handlers hand their work to a fixed pool sized to the machine,
+instead of Starlette's unbounded-by-CPU threadpool. At most
+``workers + max_queue`` calls are admitted at once; anything beyond that
+is rejected immediately so clients can back off, rather than queueing
+until every request in the burst misses its deadline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .metrics import REGISTRY, MetricsDelta
+
+EXECUTOR_KINDS = ("thread", "process")
+
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "symptom_checker_inference_queue_wait_seconds",
+    "Time admitted inference calls waited for a free worker.",
+).labels()
+REJECTED = REGISTRY.counter(
+    "symptom_checker_inference_rejected_total",
+    "Inference calls rejected because the queue was full.",
+).labels()
+
+
+class ExecutorSaturated(Exception):
+    """Raised when ``workers + max_queue`` calls are already admitted."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Inference queue is full; retry shortly")
+        self.retry_after = retry_after
+
+
+def _timed_call(
+    fn: Callable[..., Any], args: Tuple[Any, ...], ship_metrics: bool = False
+) -> Tuple[Any, float, Optional[MetricsDelta]]:
+    # time.monotonic is system-wide on Linux, so the start time is
+    # comparable with the submit time even from a worker process.
+    started = time.monotonic()
+    result = fn(*args)
+    # A worker process records into its own registry; send what this call
+    # (and its model watcher) recorded back to the parent's /metrics.
+    return result, started, REGISTRY.delta() if ship_metrics else None
+
+
+class InferenceExecutor:
+    """
+    Thread or process pool with a bounded queue.
+
+    ``kind="process"`` uses spawned workers: each imports the app and loads
+    its own model, so ``fn`` and its arguments must be picklable and the
+    parent's caches are not shared. Histograms and counters a worker
+    records come back with each result and are merged into ``REGISTRY``.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        workers: int = 0,
+        max_queue: int = 64,
+        retry_after: int = 1,
+        initializer: Optional[Callable[[], None]] = None,
+    ) -> None:
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind {kind!r}; expected one of {EXECUTOR_KINDS}")
+        self.kind = kind
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self._initializer = initializer
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+        self.completed = 0
+
+        REGISTRY.gauge(
+            "symptom_checker_inference_queue_depth",
+            "Admitted inference calls waiting for a worker.",
+            lambda: self.queue_depth,
+            replace=True,
+        )
+        REGISTRY.gauge(
+            "symptom_checker_inference_in_flight",
+            "Admitted inference calls, running or queued.",
+            lambda: self.in_flight,
+            replace=True,
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self._initializer,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        return self._executor
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                REJECTED.inc()
+                raise ExecutorSaturated(self.retry_after)
+            self.in_flight += 1
+
+    def _release(self, future: Any = None) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` on the pool, or raise ``ExecutorSaturated`` at once."""
+        self._admit()
+        submitted = time.monotonic()
+        try:
+            future = self._pool().submit(_timed_call, fn, args, self.kind == "process")
+        except BaseException:
+            self._release()
+            raise
+        # The slot is freed when the pool is done with the call, not when the
+        # caller stops waiting: a cancelled await (client disconnect) cannot
+        # stop a call that is already running, and it still holds a worker.
+        # Added before wrap_future's callback, so it runs before the await returns.
+        future.add_done_callback(self._release)
+        result, started, metrics = await asyncio.wrap_future(future)
+        QUEUE_WAIT_SECONDS.observe(max(0.0, started - submitted))
+        if metrics:
+            REGISTRY.merge(metrics)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queue_depth,
+                "rejected": self.rejected,
+                "completed": self.completed,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
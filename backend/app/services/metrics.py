@@ -0,0 +1,287 @@
+"""
+Minimal in-process metrics: fixed-bucket histograms and counters rendered
+in the Prometheus text exposition format.
+
+Label children are resolved once and cached by callers, and each thread
+records into its own shard, so an observation is a ``bisect`` plus two
+additions with no lock taken.
+
+A process-pool worker records into its own copy of the registry; it sends
+``REGISTRY.delta()`` back with each result and the parent ``merge``s it,
+so ``/metrics`` also covers work done in the workers.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# What histograms and counters recorded, by metric name and label values
+MetricsDelta = Dict[str, Dict[Tuple[str, ...], List[float]]]
+
+# Upper bounds in seconds: 50us .. 10s, roughly x2.5 per bucket.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Sharded:
+    """
+    Per-thread accumulators: each thread only ever writes its own list, so
+    recording needs no lock; readers sum the shards of every thread.
+    """
+
+    __slots__ = ("_local", "_shards", "_lock", "_width")
+
+    def __init__(self, width: int) -> None:
+        self._local = threading.local()
+        self._shards: List[List[float]] = []
+        self._lock = threading.Lock()
+        self._width = width
+
+    def _shard(self) -> List[float]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = [0] * self._width
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            shards = list(self._shards)
+        return [sum(column) for column in zip(*shards)] if shards else [0] * self._width
+
+    def add(self, totals: Sequence[float]) -> None:
+        """Add ``totals`` (as returned by another process's ``totals``) to this thread's shard."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        for slot, value in enumerate(totals):
+            shard[slot] += value
+
+
+class _HistogramChild(_Sharded):
+    __slots__ = ("_bounds",)
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        # One slot per bucket, one for +Inf, and the running sum last.
+        super().__init__(len(bounds) + 2)
+        self._bounds = bounds
+
+    def observe(self, value: float) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[bisect_left(self._bounds, value)] += 1
+        shard[-1] += value
+
+    @property
+    def counts(self) -> List[int]:
+        return self.totals()[:-1]
+
+    @property
+    def sum(self) -> float:
+        return self.totals()[-1]
+
+
+class _CounterChild(_Sharded):
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self.totals()[0]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self) -> object:
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+    def _render_child(self, key: Tuple[str, ...], child) -> List[str]:
+        raise NotImplementedError
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def _render_child(self, key: Tuple[str, ...], child: _HistogramChild) -> List[str]:
+        totals = child.totals()
+        counts, total = totals[:-1], totals[-1]
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            bucket_labels = _format_labels(self.labelnames, key, f'le="{le}"')
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def _render_child(self, key: Tuple[str, ...], child: _CounterChild) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"]
+
+
+class Gauge(_Metric):
+    """Point-in-time value read from ``function`` at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, function: Callable[[], float]) -> None:
+        super().__init__(name, documentation)
+        self.function = function
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            f"{self.name} {_format_value(self.function())}",
+        ]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        # Totals already reported by delta(), per (metric name, label values)
+        self._reported: Dict[Tuple[str, Tuple[str, ...]], List[float]] = {}
+
+    def _register(self, metric: _Metric, replace: bool = False) -> _Metric:
+        if metric.name in self._metrics and not replace:
+            raise ValueError(f"Metric {metric.name!r} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), **kwargs) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, **kwargs))
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, function: Callable[[], float], replace: bool = False
+    ) -> Gauge:
+        """``replace=True`` lets a re-created owner take over its gauge."""
+        return self._register(Gauge(name, documentation, function), replace=replace)
+
+    def delta(self) -> MetricsDelta:
+        """What histograms and counters recorded since the previous call."""
+        changes: MetricsDelta = {}
+        for name, metric in list(self._metrics.items()):
+            # Gauges have no children; they are read where they live
+            for key, child in list(metric._children.items()):
+                totals = child.totals()
+                reported = self._reported.get((name, key))
+                change = totals if reported is None else [now - then for now, then in zip(totals, reported)]
+                if any(change):
+                    changes.setdefault(name, {})[key] = change
+                    self._reported[(name, key)] = totals
+        return changes
+
+    def merge(self, changes: MetricsDelta) -> None:
+        """Add another registry's ``delta`` to the metrics of the same name here."""
+        for name, children in changes.items():
+            metric = self._metrics.get(name)
+            if metric is None:
+                continue
+            for key, change in children.items():
+                metric.labels(*key).add(change)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+PREDICT_SECONDS = REGISTRY.histogram(
+    "symptom_checker_predict_seconds",
+    "End-to-end prediction pipeline latency, including cache hits.",
+    ("endpoint",),
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "symptom_checker_stage_seconds",
+    "Latency of each prediction pipeline stage (one observation per request or batch).",
+    ("endpoint", "stage"),
+)
+PREDICTIONS_BY_PATH = REGISTRY.counter(
+    "symptom_checker_model_predictions_total",
+    "Predictions served, by the model path that produced the probabilities.",
+    ("path",),
+)
@@ -0,0 +1,199 @@
+"""
+Versioned model artifact: the native CatBoost ``.cbm`` file plus a small
+JSON manifest.
+
+The manifest carries what the service needs besides the trees (class
+labels in model output order, feature columns) together with the model
+file's size and SHA-256 and the hash of the training data, so loading
+needs neither pickle nor scikit-learn.
+
+Model files are named after their content (``<stem>-<sha256[:12]>.cbm``),
+so saving a new model never touches the file the current manifest points
+to. The manifest is written last and atomically: a reader sees either the
+old manifest and model or the new pair, never the new model under the old
+manifest. The previous model file is kept until the next save, so a
+reader that read the old manifest just before the swap can still open
+it; older generations are deleted then.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from catboost import CatBoostClassifier
+
+FORMAT_VERSION = 1
+_CHUNK_SIZE = 1 << 20
+
+
+class ArtifactError(Exception):
+    """The manifest is unreadable, from a newer format, or does not match the model file."""
+
+
+def file_sha256(path: Path, chunk_size: int = _CHUNK_SIZE) -> str:
+    """SHA-256 of ``path`` read in fixed-size chunks into one reused buffer."""
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def save_artifact(
+    model: CatBoostClassifier,
+    labels: Sequence[str],
+    feature_columns: Sequence[str],
+    manifest_path: Path,
+    training_data_sha256: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Write ``<stem>-<sha256[:12]>.cbm`` and its manifest ``manifest_path``;
+    returns the manifest. Once the new manifest is in place, model files
+    of this stem other than the new one and the one the previous manifest
+    named are removed.
+
+    ``labels`` must be in the order of the model's probability columns.
+    """
+    manifest_path = Path(manifest_path)
+    try:
+        previous: Optional[str] = read_manifest(manifest_path)["model_file"]
+    except ArtifactError:
+        previous = None
+    stem = manifest_path.with_suffix("").name
+    tmp_model = manifest_path.with_name(f".{stem}.cbm.tmp")
+    model.save_model(str(tmp_model), format="cbm")
+    model_sha256 = file_sha256(tmp_model)
+    model_path = manifest_path.with_name(f"{stem}-{model_sha256[:12]}.cbm")
+    os.replace(tmp_model, model_path)
+
+    import catboost
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "model_file": model_path.name,
+        "model_size": model_path.stat().st_size,
+        "model_sha256": model_sha256,
+        "labels": [str(label) for label in labels],
+        "feature_columns": [str(column) for column in feature_columns],
+        "training_data_sha256": training_data_sha256,
+        "catboost_version": catboost.__version__,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    _write_atomic(manifest_path, json.dumps(manifest, indent=2).encode("utf-8"))
+    _remove_stale_models(manifest_path.parent, stem, keep={model_path.name, previous})
+    return manifest
+
+
+def _remove_stale_models(directory: Path, stem: str, keep: Set[Optional[str]]) -> None:
+    pattern = re.compile(rf"{re.escape(stem)}-[0-9a-f]{{12}}\.cbm")
+    for path in directory.iterdir():
+        if pattern.fullmatch(path.name) and path.name not in keep:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def read_manifest(manifest_path: Path) -> Dict[str, Any]:
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ArtifactError(f"Unreadable manifest {manifest_path}: {e}") from e
+    version = manifest.get("format_version")
+    if not isinstance(version, int) or version > FORMAT_VERSION:
+        raise ArtifactError(f"Unsupported artifact format {version!r} in {manifest_path}")
+    missing = {"model_file", "model_sha256", "labels", "feature_columns"} - manifest.keys()
+    if missing:
+        raise ArtifactError(f"Manifest {manifest_path} is missing {sorted(missing)}")
+    return manifest
+
+
+def load_artifact(manifest_path: Path, verify: bool = True) -> Tuple[CatBoostClassifier, Dict[str, Any]]:
+    """
+    Load the model a manifest describes.
+
+    With ``verify`` the model file's size and SHA-256 are checked against
+    the manifest before CatBoost parses it.
+    """
+    manifest_path = Path(manifest_path)
+    manifest = read_manifest(manifest_path)
+    model_path = manifest_path.parent / manifest["model_file"]
+    if verify:
+        try:
+            size = model_path.stat().st_size
+        except OSError as e:
+            raise ArtifactError(f"Model file {model_path} is missing: {e}") from e
+        if "model_size" in manifest and size != manifest["model_size"]:
+            raise ArtifactError(f"{model_path.name} is {size} bytes, manifest says {manifest['model_size']}")
+        if file_sha256(model_path) != manifest["model_sha256"]:
+            raise ArtifactError(f"{model_path.name} does not match the manifest checksum")
+
+    from catboost import CatBoostClassifier
+
+    model = CatBoostClassifier()
+    model.load_model(str(model_path), format="cbm")
+    classes = getattr(model, "classes_", None)
+    if classes is not None and len(classes) != len(manifest["labels"]):
+        raise ArtifactError(f"Manifest lists {len(manifest['labels'])} labels, model has {len(classes)} classes")
+    return model, manifest
+
+
+def migrate_pickle(
+    pickle_path: Path, manifest_path: Optional[Path] = None, training_data_sha256: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Convert a legacy ``{'model', 'label_encoder', 'feature_columns'}`` pickle.
+
+    Unpickling needs scikit-learn for the ``LabelEncoder``; the artifact it
+    produces does not. Only run this on pickles you produced yourself.
+    """
+    import pickle
+
+    pickle_path = Path(pickle_path)
+    with open(pickle_path, "rb") as f:
+        model_data = pickle.load(f)
+    labels: List[str] = [str(label) for label in model_data["label_encoder"].classes_]
+    return save_artifact(
+        model_data["model"],
+        labels,
+        model_data.get("feature_columns") or [],
+        manifest_path or pickle_path.with_suffix(".json"),
+        training_data_sha256,
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a legacy model pickle to a .cbm + manifest artifact")
+    parser.add_argument("pickle_path", type=Path)
+    parser.add_argument("--manifest", type=Path, help="defaults to the pickle path with a .json suffix")
+    parser.add_argument("--training-data", type=Path, help="CSV the model was trained on, to record its hash")
+    args = parser.parse_args()
+
+    data_hash = file_sha256(args.training_data) if args.training_data else None
+    result = migrate_pickle(args.pickle_path, args.manifest, data_hash)
+    print(f"✓ Wrote {result['model_file']} ({result['model_size'] / 1024 / 1024:.2f} MB) "
+          f"and manifest for {len(result['labels'])} classes")
@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 import numpy as np
 
+from . import ranking
+
 
 class ModelLoader:
     """Load and manage disease prediction models"""
@@ -53,10 +55,10 @@ class ModelLoader:
         return []
     
     @staticmethod
-    def predict_with_model(model_data: Dict[str, Any], features: np.ndarray) -> tuple:
+    def predict_with_model(model_data: Dict[str, Any], features: np.ndarray, top_k: int = ranking.DEFAULT_TOP_K) -> tuple:
         """
         Make predictions with the loaded model
-        Returns: (predicted_disease, confidence, disease_probabilities)
+        Returns: (predicted_disease, confidence, probabilities of the top_k diseases)
         """
         try:
             model = model_data['model']
@@ -64,16 +66,13 @@ class ModelLoader:
             
             # Get predictions
             probs = model.predict_proba(features)[0]
-            predicted_idx = np.argmax(probs)
-            predicted_disease = label_encoder.classes_[predicted_idx]
-            confidence = float(probs[predicted_idx])
             
             # Create top-k results
-            top_indices = np.argsort(-probs)[:3]
-            top_diseases = {
-                label_encoder.classes_[idx]: float(probs[idx]) 
-                for idx in top_indices
-            }
+            indices, scores = ranking.top_k(probs, top_k)
+            classes = label_encoder.classes_
+            predicted_disease = classes[indices[0, 0]]
+            confidence = float(scores[0, 0])
+            top_diseases = {classes[idx]: score for idx, score in zip(indices[0], scores[0].tolist())}
             
             return predicted_disease, confidence, top_diseases
         
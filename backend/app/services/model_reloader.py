@@ -0,0 +1,243 @@
+"""
+Zero-downtime reload of the disease model artifact.
+
+A candidate is loaded next to the serving model, warmed and checked
+against a small golden set, and only then swapped in with a single
+reference assignment. Requests already running keep the snapshot they
+pinned; a candidate that fails to load or validate is discarded and the
+serving model is left untouched.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .metrics import REGISTRY
+from .feature_layout import FeatureLayout
+from .model_service import DiseaseModelService, ModelSnapshot
+from .nlp_service import BiomedicalNLPService
+
+GOLDEN_SET_PATH = Path(__file__).resolve().parents[2] / "data" / "golden_set.json"
+
+RELOAD_SECONDS = REGISTRY.histogram(
+    "symptom_checker_model_reload_seconds",
+    "Time to load, warm and validate a candidate model artifact.",
+).labels()
+RELOADS = REGISTRY.counter(
+    "symptom_checker_model_reloads_total",
+    "Model reload attempts, by outcome.",
+    ("outcome",),
+)
+
+
+def load_golden_set(path: Path = GOLDEN_SET_PATH) -> List[Dict[str, str]]:
+    """``[{"text": ..., "disease": ...}]`` rows; empty if the file is missing."""
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [row for row in json.load(f) if row.get("text") and row.get("disease")]
+
+
+class ModelReloader:
+    """
+    Loads, validates and swaps in new model artifacts for ``model_service``.
+
+    A candidate is accepted when its probabilities are well formed and its
+    golden-set accuracy is at least ``min_accuracy`` and no more than
+    ``tolerance`` below the serving model's. Validation is relative because
+    the golden set is small; it catches broken or mislabeled artifacts, not
+    small quality regressions.
+    """
+
+    def __init__(
+        self,
+        nlp_service: BiomedicalNLPService,
+        model_service: DiseaseModelService,
+        golden_path: Path = GOLDEN_SET_PATH,
+        tolerance: float = 0.05,
+        min_accuracy: float = 0.0,
+    ) -> None:
+        self.nlp_service = nlp_service
+        self.model_service = model_service
+        self.tolerance = tolerance
+        self.min_accuracy = min_accuracy
+        self._golden = load_golden_set(Path(golden_path))
+        # Golden-set feature matrices by layout columns
+        self._golden_features: Dict[Tuple[str, ...], np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._failed_version: Optional[str] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._outcomes = {o: RELOADS.labels(o) for o in ("swapped", "rejected", "failed", "unchanged")}
+
+    def _features(self, layout: FeatureLayout) -> np.ndarray:
+        features = self._golden_features.get(layout.columns)
+        if features is None:
+            # Without a golden set a single empty-text row still serves as warm-up.
+            texts = [row["text"] for row in self._golden] or [""]
+            features = np.zeros((len(texts), layout.n_features), dtype=np.float32)
+            for row, text in zip(features, texts):
+                self.nlp_service.encode_into(row, text, {}, layout)
+            self._golden_features[layout.columns] = features
+        return features
+
+    def _score(self, snapshot: ModelSnapshot) -> Tuple[np.ndarray, float]:
+        """Golden-set probabilities and top-1 accuracy for ``snapshot``."""
+        features = self._features(snapshot.layout)
+        probs = np.asarray(self.model_service.model_proba(snapshot, features), dtype=np.float64)
+        if probs.shape != (len(self._golden), len(snapshot.labels)):
+            raise ValueError(f"probability shape {probs.shape} does not match {len(snapshot.labels)} labels")
+        predicted = [snapshot.labels[i] for i in probs.argmax(axis=1)]
+        correct = sum(p == row["disease"] for p, row in zip(predicted, self._golden))
+        return probs, correct / len(self._golden)
+
+    def validate(self, candidate: ModelSnapshot, current: ModelSnapshot) -> Dict[str, Any]:
+        """Sanity and accuracy checks; ``errors`` is empty when the candidate may serve."""
+        if not self._golden:
+            return {"rows": 0, "errors": []}
+        errors: List[str] = []
+        probs, accuracy = self._score(candidate)
+        if not np.isfinite(probs).all():
+            errors.append("non-finite probabilities")
+        elif not np.allclose(probs.sum(axis=1), 1.0, atol=1e-4):
+            errors.append("probabilities do not sum to 1")
+
+        baseline: Optional[float] = None
+        if current.model is not None:
+            try:
+                _, baseline = self._score(current)
+            except Exception as e:
+                print(f"⚠️  Could not score serving model on the golden set: {e}")
+        if baseline is not None and accuracy < baseline - self.tolerance:
+            errors.append(f"golden accuracy {accuracy:.3f} below serving model's {baseline:.3f}")
+        if accuracy < self.min_accuracy:
+            errors.append(f"golden accuracy {accuracy:.3f} below floor {self.min_accuracy:.3f}")
+        return {
+            "rows": len(self._golden),
+            "accuracy": round(accuracy, 4),
+            "baseline_accuracy": None if baseline is None else round(baseline, 4),
+            "errors": errors,
+        }
+
+    def reload(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Load the artifact on disk and swap it in if it validates.
+
+        Without ``force`` an artifact whose version is already serving is
+        left alone. Concurrent calls are serialized.
+        """
+        with self._lock:
+            started = time.perf_counter()
+            current = self.model_service.snapshot
+            report: Dict[str, Any] = {"version_before": current.version, "version_after": current.version}
+            disk_version = self.model_service.artifact_version()
+            if not force and disk_version == current.version:
+                report["status"] = "unchanged"
+                return self._finish(report, started, record=False)
+
+            try:
+                # Only the file that changed; falling back to an older model
+                # file would hide a corrupt artifact behind a "swap".
+                candidate = self.model_service.load_artifact_snapshot()
+            except Exception as e:
+                self._failed_version = disk_version
+                report["status"] = "failed"
+                report["error"] = f"{type(e).__name__}: {e}"
+                return self._finish(report, started)
+            loaded = time.perf_counter()
+            report["load_ms"] = round((loaded - started) * 1000, 2)
+            report["candidate_version"] = candidate.version
+
+            try:
+                # One warm-up call pays any lazy initialization before the
+                # candidate takes traffic; validation then reuses it.
+                self.model_service.model_proba(candidate, self._features(candidate.layout)[:1])
+                warmed = time.perf_counter()
+                report["warmup_ms"] = round((warmed - loaded) * 1000, 2)
+                validation = self.validate(candidate, current)
+                report["validate_ms"] = round((time.perf_counter() - warmed) * 1000, 2)
+            except Exception as e:
+                self._failed_version = candidate.version
+                report["status"] = "failed"
+                report["error"] = f"{type(e).__name__}: {e}"
+                return self._finish(report, started)
+
+            report["validation"] = validation
+            if validation["errors"]:
+                self._failed_version = candidate.version
+                report["status"] = "rejected"
+                return self._finish(report, started)
+
+            self.model_service.swap(candidate)
+            self._failed_version = None
+            report["status"] = "swapped"
+            report["version_after"] = candidate.version
+            return self._finish(report, started)
+
+    def _finish(self, report: Dict[str, Any], started: float, record: bool = True) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - started
+        report["duration_ms"] = round(elapsed * 1000, 2)
+        self._outcomes[report["status"]].inc()
+        if record:
+            RELOAD_SECONDS.observe(elapsed)
+            self.last_report = report
+            if report["status"] == "swapped":
+                print(f"✓ Reloaded model {report['version_after']} in {report['duration_ms']:.0f}ms")
+            else:
+                print(f"⚠️  Model reload {report['status']}, keeping {report['version_before']}: "
+                      f"{report.get('error') or report['validation']['errors']}")
+        return report
+
+    def poll(self, last_seen: Optional[str]) -> Optional[str]:
+        """
+        One watcher tick: reload when the artifact version is new and has
+        not changed since the previous tick, so a file still being copied
+        is not picked up. Returns the version seen, for the next tick.
+        """
+        version = self.model_service.artifact_version()
+        if (
+            version is not None
+            and version == last_seen
+            and version != self.model_service.snapshot.version
+            and version != self._failed_version
+        ):
+            self.reload()
+        return version
+
+    def start_watching(self, interval: float) -> None:
+        if self._watcher is not None or interval <= 0:
+            return
+        self._stop.clear()
+
+        def watch() -> None:
+            last_seen = self.model_service.artifact_version()
+            while not self._stop.wait(interval):
+                try:
+                    last_seen = self.poll(last_seen)
+                except Exception as e:
+                    print(f"⚠️  Model watcher error: {e}")
+
+        self._watcher = threading.Thread(target=watch, name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "serving_version": self.model_service.snapshot.version,
+            "serving_kind": self.model_service.snapshot.kind,
+            "watching": self._watcher is not None,
+            "golden_rows": len(self._golden),
+            "last_reload": self.last_report,
+        }
@@ -1,123 +1,357 @@
 from __future__ import annotations
 
-import pickle
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple, Optional, Any, Sequence, Union
 
 import numpy as np
-from catboost import CatBoostClassifier
 
+from .metrics import PREDICTIONS_BY_PATH
+from .feature_layout import CATALOG_LAYOUT, FeatureLayout
+from .model_artifact import load_artifact
+from .ranking import DEFAULT_TOP_K, Ranked, rank
 from .symptom_catalog import DISEASES, SYMPTOMS
+from .tree_evaluator import ObliviousTreeEvaluator
+
+if TYPE_CHECKING:
+    # catboost pulls in pandas and IPython (~0.7s); it is imported when a model is loaded
+    from catboost import CatBoostClassifier
+
+MODEL_ENGINES = ("catboost", "numpy")
+
+_RETRAINED_PATH = PREDICTIONS_BY_PATH.labels("retrained")
+_ORIGINAL_PATH = PREDICTIONS_BY_PATH.labels("original")
+_RULE_BASED_PATH = PREDICTIONS_BY_PATH.labels("rule_based")
+
+
+@dataclass(frozen=True)
+class ModelSnapshot:
+    """
+    A loaded model and everything derived from it, swapped in as one unit.
+
+    Calls read ``DiseaseModelService.snapshot`` once and use it to the end,
+    so swapping in a reloaded model never changes a call already running.
+    """
+
+    kind: str  # "retrained", "original" or "rule_based"
+    model: Optional[CatBoostClassifier]
+    labels: List[str]
+    version: str
+    evaluator: Optional[ObliviousTreeEvaluator] = None
+    # Artifact metadata: labels, feature_columns, checksums (see model_artifact)
+    manifest: Optional[Dict[str, Any]] = None
+    # Where NLP output goes in this model's input row
+    layout: FeatureLayout = CATALOG_LAYOUT
+
+
+RULE_BASED_SNAPSHOT = ModelSnapshot("rule_based", None, list(DISEASES), "rule-based")
 
 
 class DiseaseModelService:
-    def __init__(self) -> None:
+    def __init__(self, engine: str = "catboost", thread_count: int = -1, autoload: bool = True) -> None:
+        if engine not in MODEL_ENGINES:
+            raise ValueError(f"Unknown model engine {engine!r}; expected one of {MODEL_ENGINES}")
+        self.engine = engine
+        # Threads CatBoost may use per call (-1: all cores)
+        self.thread_count = thread_count
         self.model_path = Path(__file__).resolve().parents[2] / "models" / "catboost_disease.cbm"
+        # Manifest of the .cbm artifact; the pickle is the legacy format (needs scikit-learn)
+        self.artifact_path = Path(__file__).resolve().parents[2] / "disease_model_15k.json"
         self.retrained_model_path = Path(__file__).resolve().parents[2] / "disease_model_15k.pkl"
-        self.model = CatBoostClassifier()
-        self._is_fitted = False
-        self._retrained_model: Optional[Dict[str, Any]] = None
-        self._load_if_exists()
+        self._snapshot: Optional[ModelSnapshot] = None
+        self._pins = threading.local()
+        self._load_lock = threading.Lock()
+        # With autoload=False the artifact is loaded by ensure_loaded(), at
+        # startup or else on the first prediction.
+        if autoload:
+            self.ensure_loaded()
 
-    def _load_if_exists(self) -> None:
-        """Try to load retrained model first, then fall back to original model"""
-        # Try to load retrained pickle model (15 diseases, 97% accuracy)
-        if self.retrained_model_path.exists():
-            try:
-                with open(self.retrained_model_path, 'rb') as f:
-                    self._retrained_model = pickle.load(f)
-                self._is_fitted = True
-                print(f"✓ Loaded retrained model: {self.retrained_model_path.name}")
-                return
-            except Exception as e:
-                print(f"⚠️  Error loading retrained model: {e}")
-        
-        # Fall back to original CatBoost model
-        if self.model_path.exists():
+    def ensure_loaded(self) -> ModelSnapshot:
+        """Load the model artifact if that has not happened yet; never loads twice."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._load_lock:
+                if self._snapshot is None:
+                    self._snapshot = self.load_snapshot() or RULE_BASED_SNAPSHOT
+                snapshot = self._snapshot
+        return snapshot
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def snapshot(self) -> ModelSnapshot:
+        """The snapshot this thread has pinned, else the one currently serving."""
+        pinned = getattr(self._pins, "snapshot", None)
+        return pinned if pinned is not None else self.ensure_loaded()
+
+    @contextmanager
+    def pinned(self) -> Iterator[ModelSnapshot]:
+        """
+        Answer every call made on this thread from one snapshot until exit.
+
+        A request pins once, so its prediction, explanation and cache key
+        all come from the same model even if a reload swaps in another.
+        """
+        outer = getattr(self._pins, "snapshot", None)
+        snapshot = outer if outer is not None else self.ensure_loaded()
+        self._pins.snapshot = snapshot
+        try:
+            yield snapshot
+        finally:
+            self._pins.snapshot = outer
+
+    @property
+    def version(self) -> str:
+        return self.snapshot.version
+
+    @version.setter
+    def version(self, value: str) -> None:
+        self._snapshot = replace(self.ensure_loaded(), version=value)
+
+    @staticmethod
+    def _artifact_version(path: Path) -> str:
+        stat = path.stat()
+        return f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _sources(self) -> Tuple[Tuple[Path, str, Any], ...]:
+        """Model files in order of preference, with a description and loader for each."""
+        return (
+            # Retrained model as .cbm + manifest (15 diseases, 97% accuracy)
+            (self.artifact_path, "retrained model artifact", self._load_manifest_artifact),
+            # Legacy retrained pickle; migrate with `python -m app.services.model_artifact`
+            (self.retrained_model_path, "retrained model", self._load_pickle),
+            (self.model_path, "original model", self._load_original),
+        )
+
+    def artifact_version(self) -> Optional[str]:
+        """Version of the artifact ``load_snapshot`` would pick, or ``None`` if there is none."""
+        for path, _, _ in self._sources():
             try:
-                self.model.load_model(str(self.model_path))
-                self._is_fitted = True
-                print(f"✓ Loaded original model: {self.model_path.name}")
-            except Exception as e:
-                print(f"⚠️  Error loading original model: {e}")
+                return self._artifact_version(path)
+            except OSError:
+                continue
+        return None
+
+    def load_snapshot(self) -> Optional[ModelSnapshot]:
+        """Try to load retrained model first, then fall back to original model"""
+        for path, description, load in self._sources():
+            if path.exists():
+                try:
+                    return load(path)
+                except Exception as e:
+                    print(f"⚠️  Error loading {description}: {e}")
+        return None
+
+    def load_artifact_snapshot(self) -> ModelSnapshot:
+        """
+        Load the file ``artifact_version`` reports and nothing else.
+
+        Unlike ``load_snapshot`` there is no fallback: a reload of a corrupt
+        artifact must fail, not quietly serve an older model file. Raises
+        if the file is missing or does not load.
+        """
+        for path, _, load in self._sources():
+            if path.exists():
+                return load(path)
+        raise FileNotFoundError(f"No model artifact at {self.artifact_path}")
 
-    def predict(self, features: np.ndarray, detected_symptoms: List[str]) -> Tuple[str, float, List[Dict[str, float]]]:
-        if self._retrained_model:
+    def _load_manifest_artifact(self, path: Path) -> ModelSnapshot:
+        version = self._artifact_version(path)
+        model, manifest = load_artifact(path)
+        layout = self._build_layout(model, manifest)
+        print(f"✓ Loaded retrained model: {manifest['model_file']}")
+        return ModelSnapshot(
+            "retrained", model, manifest["labels"], version, self._build_evaluator(model), manifest, layout
+        )
+
+    def _load_pickle(self, path: Path) -> ModelSnapshot:
+        version = self._artifact_version(path)
+        import pickle
+
+        with open(path, 'rb') as f:
+            artifact = pickle.load(f)
+        model = artifact['model']
+        labels = [str(label) for label in artifact['label_encoder'].classes_]
+        manifest = {"labels": labels, "feature_columns": list(artifact.get('feature_columns') or [])}
+        layout = self._build_layout(model, manifest)
+        print(f"✓ Loaded retrained model: {path.name}")
+        return ModelSnapshot("retrained", model, labels, version, self._build_evaluator(model), manifest, layout)
+
+    def _load_original(self, path: Path) -> ModelSnapshot:
+        from catboost import CatBoostClassifier
+
+        version = self._artifact_version(path)
+        model = CatBoostClassifier()
+        model.load_model(str(path))
+        labels = [str(label) for label in model.classes_]
+        layout = self._build_layout(model, None)
+        print(f"✓ Loaded original model: {path.name}")
+        return ModelSnapshot("original", model, labels, version, self._build_evaluator(model), layout=layout)
+
+    def swap(self, snapshot: ModelSnapshot) -> Optional[ModelSnapshot]:
+        """Serve ``snapshot`` from now on; returns the one it replaced."""
+        with self._load_lock:
+            previous, self._snapshot = self._snapshot, snapshot
+        return previous
+
+    def _load_if_exists(self) -> None:
+        snapshot = self.load_snapshot()
+        if snapshot is not None:
+            self.swap(snapshot)
+
+    def _build_evaluator(self, model: CatBoostClassifier) -> Optional[ObliviousTreeEvaluator]:
+        """Export the loaded trees for the NumPy engine; keep CatBoost if that fails."""
+        if self.engine != "numpy":
+            return None
+        try:
+            return ObliviousTreeEvaluator.from_catboost(model)
+        except Exception as e:
+            print(f"⚠️  NumPy evaluator unavailable, using CatBoost inference: {e}")
+            return None
+
+    @staticmethod
+    def _build_layout(model: CatBoostClassifier, manifest: Optional[Dict[str, Any]]) -> FeatureLayout:
+        """Compile the feature layout; raises ``FeatureLayoutError`` so the model is not served."""
+        names = [str(name) for name in model.feature_names_]
+        if manifest:
+            columns = manifest.get("feature_columns")
+        else:
+            # A bare .cbm only names its columns if it was trained with names
+            columns = None if names == [str(i) for i in range(len(names))] else names
+        return FeatureLayout.for_model(columns, len(names))
+
+    @property
+    def layout(self) -> FeatureLayout:
+        """Feature layout of the snapshot this thread uses."""
+        return self.snapshot.layout
+
+    @property
+    def feature_names(self) -> List[str]:
+        return self.snapshot.layout.names
+
+    def active_model(self) -> Optional[CatBoostClassifier]:
+        """The CatBoost model used for predictions, or ``None`` in rule-based mode."""
+        return self.snapshot.model
+
+    def model_proba(self, snapshot: ModelSnapshot, features: np.ndarray) -> np.ndarray:
+        """Raw probabilities from ``snapshot``'s model, without the rule-based fallback."""
+        if snapshot.evaluator is not None:
+            return snapshot.evaluator.predict_proba(features)
+        return snapshot.model.predict_proba(features, thread_count=self.thread_count)
+
+    def predict(self, features: np.ndarray, detected_symptoms: List[str], top_k: int = DEFAULT_TOP_K) -> Ranked:
+        snapshot = self.snapshot
+        if snapshot.kind == "retrained":
             # Use retrained model (15 diseases, 97% accuracy)
-            return self._predict_with_retrained(features, detected_symptoms)
-        elif self._is_fitted:
+            return self._predict_with_retrained(snapshot, features, detected_symptoms, top_k)
+        elif snapshot.kind == "original":
             # Use original model
-            probs = self.model.predict_proba(features)[0]
-            labels = list(self.model.classes_)
+            probs = self.model_proba(snapshot, features)[0]
+            labels = snapshot.labels
+            _ORIGINAL_PATH.inc()
         else:
             # Use rule-based fallback
             probs, labels = self._rule_based_probabilities(features, detected_symptoms)
+            _RULE_BASED_PATH.inc()
 
-        pairs = sorted(
-            [{"disease": label, "score": float(prob)} for label, prob in zip(labels, probs)],
-            key=lambda x: x["score"],
-            reverse=True,
-        )
+        return rank(probs, labels, top_k)[0]
+
+    def predict_proba(
+        self, features: np.ndarray, detected_batch: Optional[List[List[str]]] = None
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Class probabilities for every row of ``features`` (N x C) in one model call.
+
+        ``detected_batch`` is only consulted by the rule-based fallback; when it
+        is omitted the active symptoms are read back from the feature matrix.
+        """
+        probs, labels, _ = self._predict_proba(features, detected_batch)
+        return probs, labels
+
+    def _predict_proba(
+        self, features: np.ndarray, detected_batch: Optional[List[List[str]]] = None
+    ) -> Tuple[np.ndarray, List[str], Any]:
+        """``predict_proba`` plus the path counter of the model that answered."""
+        snapshot = self.snapshot
+        if detected_batch is None:
+            detected_batch = [snapshot.layout.active_symptoms(row) for row in features]
 
-        best = pairs[0]
-        top_k = [{p["disease"]: round(p["score"], 4)} for p in pairs[:3]]
-        return str(best["disease"]), float(best["score"]), top_k
+        if snapshot.kind == "retrained":
+            try:
+                probs = self.model_proba(snapshot, features)
+                return np.asarray(probs), snapshot.labels, _RETRAINED_PATH
+            except Exception as e:
+                print(f"Error in retrained model prediction: {e}")
+        elif snapshot.kind == "original":
+            probs = self.model_proba(snapshot, features)
+            return np.asarray(probs), snapshot.labels, _ORIGINAL_PATH
+
+        rows = [self._rule_based_probabilities(row[None, :], detected)[0] for row, detected in zip(features, detected_batch)]
+        return np.vstack(rows), list(DISEASES), _RULE_BASED_PATH
+
+    def predict_batch(
+        self,
+        features: np.ndarray,
+        detected_batch: List[List[str]],
+        top_k: Union[int, Sequence[int]] = DEFAULT_TOP_K,
+    ) -> List[Ranked]:
+        """
+        Vectorized counterpart of ``predict`` for an N-row feature matrix.
 
-    def _predict_with_retrained(self, features: np.ndarray, detected_symptoms: List[str]) -> Tuple[str, float, List[Dict[str, float]]]:
+        ``top_k`` is one value for every row or one per row.
+        """
+        probs, labels, path = self._predict_proba(features, detected_batch)
+        path.inc(len(probs))
+        return rank(probs, labels, top_k)
+
+    def _predict_with_retrained(
+        self, snapshot: ModelSnapshot, features: np.ndarray, detected_symptoms: List[str], top_k: int
+    ) -> Ranked:
         """Make predictions using the retrained model"""
         try:
-            model = self._retrained_model['model']
-            label_encoder = self._retrained_model['label_encoder']
-            
             # Get predictions
-            probs = model.predict_proba(features)[0]
-            labels = label_encoder.classes_
-            
-            pairs = sorted(
-                [{"disease": str(label), "score": float(prob)} for label, prob in zip(labels, probs)],
-                key=lambda x: x["score"],
-                reverse=True,
-            )
-            
-            best = pairs[0]
-            top_k = [{p["disease"]: round(p["score"], 4)} for p in pairs[:3]]
-            return str(best["disease"]), float(best["score"]), top_k
+            probs = self.model_proba(snapshot, features)[0]
+            _RETRAINED_PATH.inc()
+            return rank(probs, snapshot.labels, top_k)[0]
         
         except Exception as e:
             print(f"Error in retrained model prediction: {e}")
             # Fall back to rule-based
             probs, labels = self._rule_based_probabilities(features, detected_symptoms)
-            pairs = sorted(
-                [{"disease": label, "score": float(prob)} for label, prob in zip(labels, probs)],
-                key=lambda x: x["score"],
-                reverse=True,
-            )
-            best = pairs[0]
-            top_k = [{p["disease"]: round(p["score"], 4)} for p in pairs[:3]]
-            return str(best["disease"]), float(best["score"]), top_k
+            _RULE_BASED_PATH.inc()
+            return rank(probs, labels, top_k)[0]
 
     def _rule_based_probabilities(self, features: np.ndarray, detected_symptoms: List[str]) -> Tuple[np.ndarray, List[str]]:
         score_map = {d: 0.05 for d in DISEASES}
         has = set(detected_symptoms)
 
+        def bump(disease: str, amount: float) -> None:
+            # Rules may name diseases that have since left the catalog.
+            if disease in score_map:
+                score_map[disease] += amount
+
         if {"cough", "fever", "sore_throat"}.intersection(has):
-            score_map["Influenza"] += 0.25
-            score_map["Common Cold"] += 0.2
+            bump("Influenza", 0.25)
+            bump("Common Cold", 0.2)
 
         if {"cough", "fever", "loss_of_taste_smell", "shortness_of_breath"}.intersection(has):
-            score_map["COVID-19"] += 0.35
+            bump("COVID-19", 0.35)
 
         if {"vomiting", "diarrhea", "abdominal_pain", "nausea"}.intersection(has):
-            score_map["Gastroenteritis"] += 0.45
+            bump("Gastroenteritis", 0.45)
 
         if {"headache", "nausea", "blurred_vision"}.intersection(has):
-            score_map["Migraine"] += 0.3
+            bump("Migraine", 0.3)
 
         if {"high_blood_sugar", "frequent_urination", "blurred_vision", "fatigue"}.intersection(has):
-            score_map["Type 2 Diabetes Alert"] += 0.4
+            bump("Type 2 Diabetes Alert", 0.4)
 
         if len(has) == 0:
-            score_map["Common Cold"] += 0.2
+            bump("Common Cold", 0.2)
 
         raw = np.array([score_map[d] for d in DISEASES], dtype=np.float32)
         probs = raw / raw.sum()
@@ -154,6 +388,8 @@ def build_training_dataframe() -> Tuple[np.ndarray, np.ndarray]:
 
 def train_and_save_model(output_path: Path) -> None:
     X, y = build_training_dataframe()
+    from catboost import CatBoostClassifier
+
     model = CatBoostClassifier(
         iterations=180,
         depth=6,
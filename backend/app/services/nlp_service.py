@@ -1,52 +1,58 @@
 from __future__ import annotations
 
-import re
 from typing import Dict, List, Tuple
 
 import numpy as np
 
+from .feature_layout import CATALOG_LAYOUT, FeatureLayout
+from .fuzzy_matcher import FuzzySymptomIndex, load_multilingual_synonyms
 from .symptom_catalog import SYMPTOM_SYNONYMS, SYMPTOMS
+from .symptom_matcher import SymptomMatcher
+from .text_normalizer import fold_romanization, normalize_synonyms, normalize_text
 
 
 class BiomedicalNLPService:
-    def __init__(self) -> None:
-        self._compiled = {
-            symptom: [self._compile_term(term) for term in synonyms]
-            for symptom, synonyms in SYMPTOM_SYNONYMS.items()
-        }
-
-    def _compile_term(self, term: str) -> re.Pattern[str]:
-        lowered = term.lower()
-        escaped = re.escape(lowered)
-        is_ascii = all(ord(char) < 128 for char in lowered)
-        if is_ascii:
-            return re.compile(rf"\b{escaped}\b")
-        return re.compile(escaped)
+    def __init__(self, fuzzy_max_distance: int = 0) -> None:
+        """
+        ``fuzzy_max_distance`` > 0 also matches misspelled synonyms (up to 2
+        edits) among the words no synonym matched exactly.
+        """
+        self._compiled = SymptomMatcher(normalize_synonyms(SYMPTOM_SYNONYMS))
+        self._fuzzy = None
+        if fuzzy_max_distance > 0:
+            synonyms = {symptom: list(terms) for symptom, terms in SYMPTOM_SYNONYMS.items()}
+            for symptom, terms in load_multilingual_synonyms().items():
+                synonyms.setdefault(symptom, []).extend(terms)
+            self._fuzzy = FuzzySymptomIndex(normalize_synonyms(synonyms), max_distance=fuzzy_max_distance)
 
     def normalize_text(self, text: str) -> str:
-        return re.sub(r"\s+", " ", text.lower().strip())
+        return normalize_text(text)
 
     def extract_symptoms(self, text: str) -> List[str]:
-        cleaned = self.normalize_text(text)
-        hits: List[str] = []
-        for symptom in SYMPTOMS:
-            for pattern in self._compiled.get(symptom, []):
-                if pattern.search(cleaned):
-                    hits.append(symptom)
-                    break
-        return hits
-
-    def build_feature_vector(self, text: str, intensity: Dict[str, float]) -> Tuple[np.ndarray, List[str]]:
-        detected = self.extract_symptoms(text)
-        feature_map = {symptom: 0.0 for symptom in SYMPTOMS}
-
-        for symptom in detected:
-            feature_map[symptom] = max(feature_map[symptom], 0.6)
-
-        for symptom, score in intensity.items():
-            if symptom in feature_map:
-                clipped = float(min(max(score, 0.0), 1.0))
-                feature_map[symptom] = max(feature_map[symptom], clipped)
-
-        vector = np.array([[feature_map[s] for s in SYMPTOMS]], dtype=np.float32)
+        return self._find(self.normalize_text(text))
+
+    def _find(self, normalized: str) -> List[str]:
+        # Synonyms are indexed with romanized words folded, so match the folded text
+        folded = fold_romanization(normalized)
+        if self._fuzzy is None:
+            return self._compiled.find(folded)
+        spans = self._compiled.find_spans(folded)
+        ranks = {rank for rank, _, _ in spans} | self._fuzzy.find_ranks(folded, spans)
+        return [SYMPTOMS[rank] for rank in sorted(ranks)]
+
+    def build_feature_vector(
+        self, text: str, intensity: Dict[str, float], layout: FeatureLayout = CATALOG_LAYOUT
+    ) -> Tuple[np.ndarray, List[str]]:
+        """A ``(1, layout.n_features)`` row in ``layout``'s column order, and the detected symptoms."""
+        vector = np.zeros((1, layout.n_features), dtype=np.float32)
+        detected = self.encode_into(vector[0], text, intensity, layout)
         return vector, detected
+
+    def encode_into(
+        self, row: np.ndarray, text: str, intensity: Dict[str, float], layout: FeatureLayout = CATALOG_LAYOUT
+    ) -> List[str]:
+        """Write ``text``'s features into the zeroed ``row``; returns the detected symptoms."""
+        normalized = self.normalize_text(text)
+        detected = self._find(normalized)
+        layout.encode_into(row, normalized, detected, intensity)
+        return detected
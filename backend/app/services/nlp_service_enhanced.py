@@ -5,11 +5,14 @@ Enhanced NLP service with dynamic multilingual dataset support.
 from __future__ import annotations
 
 import re
-from typing import Dict, List, Tuple, Optional
+import threading
+from typing import Dict, Iterable, List, Mapping, Tuple, Optional
 import numpy as np
 
 from .symptom_catalog import SYMPTOMS
 from .dataset_loader import DatasetLoader
+from .symptom_matcher import IncrementalSymptomMatcher
+from .text_normalizer import matching_form, normalize_synonyms, normalize_text
 
 
 class EnhancedBiomedicalNLPService:
@@ -26,8 +29,10 @@ class EnhancedBiomedicalNLPService:
             data_dir: Path to data directory. If None, uses default 'data/'
         """
         self.data_dir = data_dir or "data"
-        self._compiled: Dict[str, List[re.Pattern[str]]] = {}
+        self._compiled = IncrementalSymptomMatcher({})
         self._multilingual_synonyms: Dict[str, List[str]] = {}
+        # Serializes writers; readers use whatever matcher is published
+        self._update_lock = threading.Lock()
         
         # Try to load from datasets
         try:
@@ -51,29 +56,12 @@ class EnhancedBiomedicalNLPService:
         self._compile_patterns()
 
     def _compile_patterns(self) -> None:
-        """Compile regex patterns for all symptom synonyms."""
-        self._compiled = {}
-        for symptom, synonyms in self._multilingual_synonyms.items():
-            if symptom in SYMPTOMS:
-                self._compiled[symptom] = [
-                    self._compile_term(term) for term in synonyms
-                ]
-
-    def _compile_term(self, term: str) -> re.Pattern[str]:
-        """
-        Compile a single term into a regex pattern.
-        Uses word boundaries for ASCII terms, simple matching for Unicode.
-        """
-        lowered = term.lower()
-        escaped = re.escape(lowered)
-        is_ascii = all(ord(char) < 128 for char in lowered)
-        if is_ascii:
-            return re.compile(rf"\b{escaped}\b")
-        return re.compile(escaped)
+        """Build the single-pass matcher over all symptom synonyms."""
+        self._compiled = IncrementalSymptomMatcher(normalize_synonyms(self._multilingual_synonyms))
 
     def normalize_text(self, text: str) -> str:
-        """Normalize text: lowercase, strip, collapse whitespace."""
-        return re.sub(r"\s+", " ", text.lower().strip())
+        """Normalize text: NFKC, lowercase, no diacritics/nuktas, collapsed whitespace."""
+        return normalize_text(text)
 
     def extract_symptoms(self, text: str) -> List[str]:
         """
@@ -85,16 +73,7 @@ class EnhancedBiomedicalNLPService:
         Returns:
             List of detected symptom IDs
         """
-        cleaned = self.normalize_text(text)
-        hits: List[str] = []
-        
-        for symptom in SYMPTOMS:
-            for pattern in self._compiled.get(symptom, []):
-                if pattern.search(cleaned):
-                    hits.append(symptom)
-                    break
-        
-        return hits
+        return self._compiled.find(matching_form(text))
 
     def extract_symptoms_with_confidence(self, text: str) -> List[Tuple[str, float]]:
         """
@@ -163,16 +142,42 @@ class EnhancedBiomedicalNLPService:
             symptom: Symptom ID
             variants: New symptom terms/synonyms
         """
-        if symptom not in self._multilingual_synonyms:
-            self._multilingual_synonyms[symptom] = []
+        self.add_many({symptom: variants})
+
+    def add_many(self, variants: Mapping[str, Iterable[str]]) -> int:
+        """
+        Add variants for many symptoms with one matcher update.
         
-        # Add new variants
-        for variant in variants:
-            if variant not in self._multilingual_synonyms[symptom]:
-                self._multilingual_synonyms[symptom].append(variant)
+        The matcher is extended incrementally and published with a single
+        assignment, so concurrent ``extract_symptoms`` calls see either the
+        previous or the updated synonyms, never a partial index.
         
-        # Recompile patterns
-        self._compile_patterns()
+        Args:
+            variants: Symptom ID -> new symptom terms/synonyms
+        
+        Returns:
+            Number of variants that were not already known
+        """
+        with self._update_lock:
+            synonyms = dict(self._multilingual_synonyms)
+            added: Dict[str, List[str]] = {}
+            for symptom, terms in variants.items():
+                known = set(synonyms.get(symptom, []))
+                new_terms = []
+                for variant in terms:
+                    if variant not in known:
+                        known.add(variant)
+                        new_terms.append(variant)
+                if new_terms:
+                    # Copied, not appended to: readers may hold the old list
+                    synonyms[symptom] = synonyms.get(symptom, []) + new_terms
+                    added[symptom] = new_terms
+            if not added:
+                return 0
+            matcher = self._compiled.with_terms(normalize_synonyms(added))
+            self._multilingual_synonyms = synonyms
+            self._compiled = matcher
+        return sum(len(terms) for terms in added.values())
 
     def get_stats(self) -> Dict[str, int]:
         """Get NLP service statistics."""
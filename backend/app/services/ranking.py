@@ -0,0 +1,77 @@
+"""
+Top-k ranking of class probabilities.
+
+``np.argpartition`` selects the k best classes of every row in O(C), and
+only those k are sorted, instead of building and sorting a dict per class.
+Small class counts are simply argsorted. Ties are broken by class index,
+as the stable sort used before did.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+DEFAULT_TOP_K = 3
+# Up to this many classes one stable argsort beats partitioning
+FULL_SORT_CLASSES = 64
+
+Ranked = Tuple[str, float, List[Dict[str, float]]]
+
+
+def top_k(probs: np.ndarray, k: int = DEFAULT_TOP_K) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Indices and scores of the ``k`` best classes per row, best first.
+
+    ``probs`` is a C vector or an N x C matrix; both results are N x
+    min(k, C) (1 x min(k, C) for a vector).
+    """
+    if k < 1:
+        raise ValueError("k must be >= 1")
+    probs = np.atleast_2d(np.asarray(probs))
+    rows = np.arange(len(probs))[:, None]
+    classes = probs.shape[1]
+    k = min(k, classes)
+    if k == classes or classes <= FULL_SORT_CLASSES:
+        indices = np.argsort(-probs, axis=1, kind="stable")[:, :k]
+        return indices, probs[rows, indices]
+
+    indices = np.argpartition(-probs, k - 1, axis=1)[:, :k]
+    scores = probs[rows, indices]
+    order = np.lexsort((indices, -scores), axis=1)
+    indices = indices[rows, order]
+    scores = scores[rows, order]
+
+    # Classes tied with the k-th score: argpartition keeps an arbitrary
+    # subset of them, the stable sort keeps the lowest indices.
+    tied = np.count_nonzero(probs >= scores[:, -1:], axis=1) > k
+    if tied.any():
+        indices[tied] = np.argsort(-probs[tied], axis=1, kind="stable")[:, :k]
+        scores[tied] = probs[tied][np.arange(np.count_nonzero(tied))[:, None], indices[tied]]
+    return indices, scores
+
+
+def rank(
+    probs: np.ndarray, labels: Sequence[str], k: Union[int, Sequence[int]] = DEFAULT_TOP_K
+) -> List[Ranked]:
+    """
+    ``(best label, best score, [{label: score}, ...])`` for every row.
+
+    ``k`` may differ per row; scores in the top-k list are rounded to 4
+    decimals.
+    """
+    probs = np.atleast_2d(np.asarray(probs))
+    per_row = [k] * len(probs) if isinstance(k, int) else list(k)
+    if len(per_row) != len(probs):
+        raise ValueError(f"{len(per_row)} top-k values for {len(probs)} rows")
+    if not per_row:
+        return []
+    indices, scores = top_k(probs, max(per_row))
+    results: List[Ranked] = []
+    for row_indices, row_scores, row_k in zip(indices.tolist(), scores.tolist(), per_row):
+        names = [str(labels[i]) for i in row_indices[:row_k]]
+        results.append(
+            (names[0], float(row_scores[0]), [{name: round(s, 4)} for name, s in zip(names, row_scores)])
+        )
+    return results
@@ -2,9 +2,15 @@ from __future__ import annotations
 
 from typing import Dict, List
 
+import numpy as np
+
 from .symptom_catalog import DISEASE_BASELINE_SEVERITY
 
 
+RISK_THRESHOLDS = np.array([0.3, 0.5, 0.75])
+RISK_LEVELS = ("Low", "Moderate", "High", "Critical")
+
+
 class RiskAwareLayer:
     def score(
         self,
@@ -30,3 +36,27 @@ class RiskAwareLayer:
             level = "Critical"
 
         return {"risk_level": level, "risk_score": round(risk_score, 4)}
+
+    def score_batch(
+        self,
+        predicted_diseases: List[str],
+        confidences: List[float],
+        intensities: List[Dict[str, float]],
+        detected_symptoms: List[List[str]],
+    ) -> List[Dict[str, float | str]]:
+        """Vectorized ``score`` over a batch; element i matches ``score`` on row i."""
+        baseline = np.array([DISEASE_BASELINE_SEVERITY.get(d, 0.3) for d in predicted_diseases], dtype=np.float64)
+        confidence = np.asarray(confidences, dtype=np.float64)
+        avg_intensity = np.array(
+            [sum(i.values()) / max(len(i), 1) if i else 0.4 for i in intensities], dtype=np.float64
+        )
+        burden = np.minimum(np.array([len(d) for d in detected_symptoms], dtype=np.float64) / 8.0, 1.0)
+
+        risk_score = 0.45 * baseline + 0.35 * confidence + 0.2 * ((avg_intensity + burden) / 2)
+        risk_score = np.clip(risk_score, 0.0, 1.0)
+        levels = np.searchsorted(RISK_THRESHOLDS, risk_score, side="right")
+
+        return [
+            {"risk_level": RISK_LEVELS[level], "risk_score": round(float(value), 4)}
+            for level, value in zip(levels, risk_score)
+        ]
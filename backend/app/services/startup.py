@@ -0,0 +1,82 @@
+"""
+Startup timeline: how long each phase of bringing the API up took.
+
+The origin is when this module is first imported, which ``app.main`` does
+before any other app module; ``process_boot_ms`` covers the interpreter
+start and anything imported before that (Linux only).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def _process_age() -> Optional[float]:
+    """Seconds since this process started, from /proc; ``None`` elsewhere."""
+    try:
+        with open("/proc/self/stat", "r") as f:
+            # Fields after the parenthesized command name; starttime is field 22.
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", "r") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimeline:
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self._last = self._origin
+        age = _process_age()
+        self.process_boot_ms = round(age * 1000, 1) if age is not None else None
+        self.phases: List[Dict[str, Any]] = []
+        self.events: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _ms(self, t: float) -> float:
+        return round((t - self._origin) * 1000, 2)
+
+    def _record(self, name: str, start: float, end: float, error: Optional[str] = None) -> None:
+        entry: Dict[str, Any] = {"name": name, "start_ms": self._ms(start), "duration_ms": round((end - start) * 1000, 2)}
+        if error:
+            entry["error"] = error
+        with self._lock:
+            self.phases.append(entry)
+            self._last = max(self._last, end)
+
+    def mark(self, name: str) -> None:
+        """Close a phase that ran since the previous mark or phase."""
+        self._record(name, self._last, time.perf_counter())
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self._record(name, start, time.perf_counter(), f"{type(e).__name__}: {e}")
+            raise
+        self._record(name, start, time.perf_counter())
+
+    def event(self, name: str) -> None:
+        """Record the first occurrence of ``name``; later calls are no-ops."""
+        if name not in self.events:
+            with self._lock:
+                self.events.setdefault(name, self._ms(time.perf_counter()))
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "process_boot_ms": self.process_boot_ms,
+                "phases": list(self.phases),
+                "ready_ms": self._ms(self._last),
+                "events": dict(self.events),
+            }
+
+
+STARTUP = StartupTimeline()
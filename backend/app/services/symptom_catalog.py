@@ -65,6 +65,20 @@ SYMPTOMS = [
     "skin_redness",
 ]
 
+# Keywords integrate_dataset.py searches for (lowercase substring match) in
+# dataset text; the retrained model's feature_columns are the ones found.
+DATASET_KEYWORDS = [
+    'fever', 'cough', 'cold', 'flu', 'pain', 'ache', 'headache',
+    'nausea', 'vomiting', 'diarrhea', 'weakness', 'fatigue',
+    'dizziness', 'shortness of breath', 'rash', 'itching',
+    'sneezing', 'runny nose', 'eye', 'vision', 'weight loss',
+    'thirst', 'chills', 'joint', 'chest', 'stomach', 'blurred',
+    'discomfort', 'sensitivity', 'skin', 'discharge', 'sweating',
+    'loss of appetite', 'high fever', 'dry', 'productive', 'wheezing',
+    'tightness', 'throat', 'congestion', 'inflammation', 'swelling',
+    'bleeding', 'red', 'tender', 'stiff', 'numb', 'tingling'
+]
+
 # Disease severity baseline (0-10 scale)
 DISEASE_BASELINE_SEVERITY = {
     "Allergy": 2,
@@ -0,0 +1,230 @@
+"""
+Single-pass multi-pattern symptom matcher (Aho-Corasick).
+
+Replaces the per-symptom, per-synonym regex loop: the automaton is built
+once from the synonym table and every request scans the normalized text a
+single time, independent of how many synonyms or languages are indexed.
+
+``IncrementalSymptomMatcher`` accepts new terms at runtime without
+rebuilding the whole automaton for each of them; like ``SymptomMatcher``
+it is never modified in place, so it can be swapped in atomically while
+other threads are matching.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .symptom_catalog import SYMPTOMS
+
+# Terms added after the last full build live in a second, small automaton
+# until there are this many; then everything is rebuilt into one.
+DELTA_MAX_TERMS = 512
+
+
+def _is_word(char: str) -> bool:
+    # Same definition of a word character as ``re``'s Unicode ``\w``.
+    return char.isalnum() or char == "_"
+
+
+class SymptomMatcher:
+    """
+    Aho-Corasick automaton over lowercased synonym terms.
+
+    ASCII terms only match on word boundaries (the ``\\b...\\b`` rule of the
+    previous regexes); native-script terms (Devanagari, Telugu, Gujarati)
+    match as plain substrings, as before.
+    """
+
+    def __init__(self, synonyms: Mapping[str, Iterable[str]], order: Sequence[str] = SYMPTOMS) -> None:
+        self._rank = {symptom: idx for idx, symptom in enumerate(order)}
+        self._order = list(order)
+
+        # Pattern table: (symptom rank, term, needs word boundaries)
+        self._patterns: List[Tuple[int, str, bool]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for symptom, terms in synonyms.items():
+            rank = self._rank.get(symptom)
+            if rank is None:
+                continue
+            for term in terms:
+                self._insert(rank, term.lower())
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        """Number of symptoms with at least one indexed term."""
+        return len({rank for rank, _, _ in self._patterns})
+
+    @property
+    def term_count(self) -> int:
+        return len(self._patterns)
+
+    def _insert(self, rank: int, term: str) -> None:
+        if not term:
+            return
+        state = 0
+        for char in term:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(len(self._patterns))
+        self._patterns.append((rank, term, term.isascii()))
+
+    def _build_failure_links(self) -> None:
+        queue: List[int] = list(self._goto[0].values())
+        for child in queue:
+            self._fail[child] = 0
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _accepts(self, text: str, start: int, end: int, term: str) -> bool:
+        before = _is_word(text[start - 1]) if start > 0 else False
+        after = _is_word(text[end]) if end < len(text) else False
+        return before != _is_word(term[0]) and _is_word(term[-1]) != after
+
+    def terms(self) -> Dict[str, List[str]]:
+        """The indexed (lowercased) terms by symptom, in insertion order."""
+        synonyms: Dict[str, List[str]] = {}
+        for rank, term, _ in self._patterns:
+            synonyms.setdefault(self._order[rank], []).append(term)
+        return synonyms
+
+    def find(self, text: str) -> List[str]:
+        """
+        Symptoms whose terms occur in ``text`` (already normalized), in catalog order.
+        """
+        return [self._order[rank] for rank in sorted(self.find_ranks(text))]
+
+    def find_ranks(self, text: str) -> Set[int]:
+        """Catalog positions of the symptoms found in ``text``."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        patterns = self._patterns
+
+        found = set()
+        state = 0
+        for pos, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in out[state]:
+                rank, term, bounded = patterns[pattern_id]
+                if rank in found:
+                    continue
+                if bounded and not self._accepts(text, pos - len(term) + 1, pos + 1, term):
+                    continue
+                found.add(rank)
+        return found
+
+    def find_spans(self, text: str) -> List[Tuple[int, int, int]]:
+        """Every match in ``text`` as ``(rank, start, end)``, including repeats."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        patterns = self._patterns
+
+        spans = []
+        state = 0
+        for pos, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in out[state]:
+                rank, term, bounded = patterns[pattern_id]
+                start = pos - len(term) + 1
+                if bounded and not self._accepts(text, start, pos + 1, term):
+                    continue
+                spans.append((rank, start, pos + 1))
+        return spans
+
+
+def _merge(*tables: Mapping[str, Iterable[str]]) -> Dict[str, List[str]]:
+    merged: Dict[str, List[str]] = {}
+    for table in tables:
+        for symptom, terms in table.items():
+            merged.setdefault(symptom, []).extend(terms)
+    return merged
+
+
+class IncrementalSymptomMatcher:
+    """
+    ``SymptomMatcher`` that grows by returning updated copies.
+
+    ``with_terms`` only rebuilds a small delta automaton holding the terms
+    added since the last full build, and folds it into the main one once
+    it exceeds ``delta_max_terms``. Adding n terms one call at a time thus
+    costs O(n * delta_max_terms) plus one full build per
+    ``delta_max_terms`` terms, instead of a full build per call. ``find``
+    scans the main automaton and, while there is one, the delta.
+    """
+
+    def __init__(
+        self,
+        synonyms: Mapping[str, Iterable[str]],
+        order: Sequence[str] = SYMPTOMS,
+        delta_max_terms: int = DELTA_MAX_TERMS,
+    ) -> None:
+        self._order = list(order)
+        self.delta_max_terms = delta_max_terms
+        self._base = SymptomMatcher(synonyms, self._order)
+        self._delta: Optional[SymptomMatcher] = None
+
+    def _replace(self, base: SymptomMatcher, delta: Optional[SymptomMatcher]) -> "IncrementalSymptomMatcher":
+        matcher = object.__new__(IncrementalSymptomMatcher)
+        matcher._order = self._order
+        matcher.delta_max_terms = self.delta_max_terms
+        matcher._base = base
+        matcher._delta = delta
+        return matcher
+
+    def __len__(self) -> int:
+        """Number of symptoms with at least one indexed term."""
+        if self._delta is None:
+            return len(self._base)
+        return len(set(self._base.terms()) | set(self._delta.terms()))
+
+    @property
+    def term_count(self) -> int:
+        return self._base.term_count + (self._delta.term_count if self._delta is not None else 0)
+
+    @property
+    def delta_term_count(self) -> int:
+        return self._delta.term_count if self._delta is not None else 0
+
+    def with_terms(self, synonyms: Mapping[str, Iterable[str]]) -> "IncrementalSymptomMatcher":
+        """A matcher that also finds ``synonyms``; this one is left unchanged."""
+        synonyms = {symptom: [term.lower() for term in terms] for symptom, terms in synonyms.items()}
+        added = sum(len(terms) for terms in synonyms.values())
+        if not added:
+            return self
+        delta = self._delta.terms() if self._delta is not None else {}
+        if self.delta_term_count + added <= self.delta_max_terms:
+            return self._replace(self._base, SymptomMatcher(_merge(delta, synonyms), self._order))
+        return self._replace(SymptomMatcher(_merge(self._base.terms(), delta, synonyms), self._order), None)
+
+    def find(self, text: str) -> List[str]:
+        """
+        Symptoms whose terms occur in ``text`` (already normalized), in catalog order.
+        """
+        found = self._base.find_ranks(text)
+        if self._delta is not None:
+            found |= self._delta.find_ranks(text)
+        return [self._order[rank] for rank in sorted(found)]
@@ -0,0 +1,110 @@
+"""
+Text normalization shared by the symptom matchers and their synonym tables.
+
+Two stages:
+
+- ``normalize_text``: Unicode NFKC, lowercase, Latin diacritics folded to
+  the base letter ("fièvre" -> "fievre"), nuktas and zero-width joiners
+  dropped ("ज़ुकाम" -> "जुकाम"), whitespace collapsed. One ``str.translate``
+  over a table built at import. This is the text feature layouts and the
+  prediction cache see.
+- ``fold_romanization``: spelling variants of romanized Hindi/Telugu
+  collapsed per word ("bukhaar" -> "bukhar", "jwaram" -> "jvaram"). The
+  matchers look up the folded text, and ``normalize_synonyms`` folds their
+  synonym tables the same way, so a variant still matches in one pass.
+  Everyday words (``COMMON_WORDS``) are left alone: "fewer" is not a
+  spelling of "fever". Folded words are memoized in a bounded LRU cache.
+
+``normalize_synonyms`` also indexes every multi-word romanized synonym
+joined up ("sar dard" -> "sardard"), the usual way it is typed without
+the space.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping
+
+from .common_words import COMMON_WORDS
+
+# Distinct words kept by the fold memo
+FOLD_CACHE_SIZE = 16384
+
+# Nuktas (Devanagari, Bengali, Gurmukhi, Gujarati, Telugu, Kannada) and ZWNJ/ZWJ
+_DROPPED = [0x093C, 0x09BC, 0x0A3C, 0x0ABC, 0x0C3C, 0x0CBC, 0x200C, 0x200D]
+
+# Romanization digraphs, applied in order before doubled letters collapse
+_ROMAN_DIGRAPHS = (("ee", "i"), ("oo", "u"), ("ph", "f"))
+_ROMAN_LETTERS = str.maketrans({"w": "v"})
+
+_WHITESPACE = re.compile(r"\s+")
+_DOUBLED = re.compile(r"([a-z])\1+")
+_ROMAN_WORD = re.compile(r"[a-z]{3,}")
+
+
+def _script_table() -> Dict[int, object]:
+    table: Dict[int, object] = {code: None for code in _DROPPED}
+    # Combining diacritical marks; Indic vowel signs live in their own blocks
+    table.update({code: None for code in range(0x0300, 0x0370)})
+    # Precomposed Latin letters with diacritics (Latin-1 Supplement, Extended-A/B)
+    for code in range(0x00C0, 0x0250):
+        base = unicodedata.normalize("NFD", chr(code))[0]
+        if base != chr(code) and base.isascii():
+            table[code] = base
+    return table
+
+
+_SCRIPT_TABLE = _script_table()
+
+
+def normalize_text(text: str) -> str:
+    """NFKC, lowercase, diacritics and nuktas removed, whitespace collapsed."""
+    text = unicodedata.normalize("NFKC", text).lower().translate(_SCRIPT_TABLE)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+@lru_cache(maxsize=FOLD_CACHE_SIZE)
+def fold_word(word: str) -> str:
+    """Canonical spelling of one lowercase romanized word."""
+    if word in COMMON_WORDS:
+        return word
+    for digraph, replacement in _ROMAN_DIGRAPHS:
+        word = word.replace(digraph, replacement)
+    return _DOUBLED.sub(r"\1", word.translate(_ROMAN_LETTERS))
+
+
+def _fold_match(match: "re.Match[str]") -> str:
+    return fold_word(match.group())
+
+
+def fold_romanization(normalized: str) -> str:
+    """``normalized`` with each romanized (ASCII) word folded; other scripts unchanged."""
+    return _ROMAN_WORD.sub(_fold_match, normalized)
+
+
+def matching_form(text: str) -> str:
+    """The form both input text and synonyms take before matching."""
+    return fold_romanization(normalize_text(text))
+
+
+def normalize_synonyms(synonyms: Mapping[str, Iterable[str]]) -> Dict[str, List[str]]:
+    """
+    ``synonyms`` in matching form, without duplicates, plus the joined form
+    of each multi-word romanized term.
+    """
+    normalized: Dict[str, List[str]] = {}
+    for symptom, terms in synonyms.items():
+        seen = set()
+        forms = normalized.setdefault(symptom, [])
+        for term in terms:
+            term = matching_form(term)
+            variants = [term]
+            if " " in term and term.isascii():
+                variants.append(fold_word(term.replace(" ", "")))
+            for variant in variants:
+                if variant and variant not in seen:
+                    seen.add(variant)
+                    forms.append(variant)
+    return normalized
@@ -0,0 +1,273 @@
+"""
+Incremental scoring of streamed uploads for ``POST /predict/stream``.
+
+The request body is read chunk by chunk, split into records (JSON Lines, or
+CSV with a header row) and scored in fixed-size micro-batches; each batch's
+results go out as NDJSON lines before more of the body is read. At most one
+chunk's worth of records and one partial record are held at a time, so
+memory does not grow with the upload. The body is only read when the
+response side asks for more, so a client that reads its results slowly
+also slows down its own upload.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from .schemas import BatchPredictItem, PredictRequest, PredictResponse
+
+JSONL_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-lines", "application/x-jsonlines")
+CSV_MEDIA_TYPES = ("text/csv", "application/csv")
+
+# (index in the upload, item, error)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+Outcome = Tuple[Optional[PredictResponse], Optional[str]]
+
+
+class StreamFormatError(ValueError):
+    """The upload cannot be split into records; the stream stops here."""
+
+
+def validation_reasons(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in error.errors())
+
+
+class _LineSplitter:
+    """Complete ``\\n``-terminated lines from arbitrarily split chunks."""
+
+    def __init__(self, max_record_bytes: int) -> None:
+        self.max_record_bytes = max_record_bytes
+        self._buffer = bytearray()
+        # An over-long record seen after complete ones; reported by the next call
+        self._too_long = False
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        self._check(0)
+        self._buffer += chunk
+        if b"\n" not in chunk:
+            self._check(len(self._buffer))
+            return []
+        *lines, rest = self._buffer.split(b"\n")
+        self._buffer = bytearray(rest)
+        # Lines before an over-long one (or tail) still go out; the next
+        # feed or close reports it.
+        complete = []
+        for line in lines:
+            if len(line) > self.max_record_bytes:
+                self._too_long = True
+                break
+            complete.append(bytes(line).rstrip(b"\r"))
+        else:
+            self._too_long = len(rest) > self.max_record_bytes
+        return complete
+
+    def close(self) -> List[bytes]:
+        self._check(len(self._buffer))
+        rest = bytes(self._buffer).rstrip(b"\r")
+        self._buffer.clear()
+        return [rest] if rest.strip() else []
+
+    def _check(self, size: int) -> None:
+        if self._too_long or size > self.max_record_bytes:
+            raise StreamFormatError(f"record longer than {self.max_record_bytes} bytes")
+
+
+class JsonLinesParser:
+    """One JSON object per line; blank lines are skipped."""
+
+    def __init__(self, max_record_bytes: int = 65536) -> None:
+        self._lines = _LineSplitter(max_record_bytes)
+        self._index = 0
+
+    def feed(self, chunk: bytes) -> List[Record]:
+        return [self._parse(line) for line in self._lines.feed(chunk) if line.strip()]
+
+    def close(self) -> List[Record]:
+        return [self._parse(line) for line in self._lines.close()]
+
+    def _parse(self, line: bytes) -> Record:
+        index = self._index
+        self._index += 1
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            return index, None, f"Invalid JSON: {e}"
+        if not isinstance(item, dict):
+            return index, None, "Invalid item: expected a JSON object"
+        return index, item, None
+
+
+class CsvParser:
+    """
+    CSV with a header row naming at least a ``text`` column.
+
+    ``language``, ``user_id`` and ``top_k`` columns are passed through;
+    ``symptom_intensity`` holds a JSON object. Empty cells take the
+    request defaults, other columns are ignored. Quoted fields may span
+    lines.
+    """
+
+    def __init__(self, max_record_bytes: int = 65536) -> None:
+        self._lines = _LineSplitter(max_record_bytes)
+        self._header: Optional[List[str]] = None
+        self._partial: List[bytes] = []
+        self._partial_size = 0
+        self._index = 0
+
+    def feed(self, chunk: bytes) -> List[Record]:
+        return self._records(self._lines.feed(chunk))
+
+    def close(self) -> List[Record]:
+        records = self._records(self._lines.close())
+        if self._partial:
+            raise StreamFormatError("unterminated quoted field at end of upload")
+        return records
+
+    def _records(self, lines: List[bytes]) -> List[Record]:
+        records: List[Record] = []
+        for line in lines:
+            self._partial.append(line)
+            self._partial_size += len(line) + 1
+            if self._partial_size > self._lines.max_record_bytes:
+                raise StreamFormatError(f"record longer than {self._lines.max_record_bytes} bytes")
+            raw = b"\n".join(self._partial)
+            # An odd number of quotes means a quoted field continues on the next line.
+            if raw.count(b'"') % 2:
+                continue
+            self._partial, self._partial_size = [], 0
+            if raw.strip():
+                record = self._parse(raw)
+                if record is not None:
+                    records.append(record)
+        return records
+
+    def _parse(self, raw: bytes) -> Optional[Record]:
+        if self._header is None:
+            header = next(csv.reader([raw.decode("utf-8-sig", errors="replace")]))
+            self._header = [name.strip() for name in header]
+            if "text" not in self._header:
+                raise StreamFormatError("CSV header must include a 'text' column")
+            return None
+
+        index = self._index
+        self._index += 1
+        try:
+            row = next(csv.reader([raw.decode("utf-8")]))
+        except (UnicodeDecodeError, csv.Error) as e:
+            return index, None, f"Invalid CSV row: {e}"
+        if len(row) != len(self._header):
+            return index, None, f"Invalid CSV row: {len(row)} fields, header has {len(self._header)}"
+
+        item: Dict[str, Any] = {name: value for name, value in zip(self._header, row) if value != ""}
+        if "symptom_intensity" in item:
+            try:
+                item["symptom_intensity"] = json.loads(item["symptom_intensity"])
+            except ValueError as e:
+                return index, None, f"Invalid symptom_intensity JSON: {e}"
+        return index, item, None
+
+
+def make_parser(content_type: str, max_record_bytes: int) -> Optional[Any]:
+    """Parser for the body's media type, or ``None`` if it is not supported."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type in JSONL_MEDIA_TYPES:
+        return JsonLinesParser(max_record_bytes)
+    if media_type in CSV_MEDIA_TYPES:
+        return CsvParser(max_record_bytes)
+    return None
+
+
+def _line(item: Any) -> bytes:
+    return json.dumps(item, separators=(",", ":")).encode() + b"\n"
+
+
+async def _score_batch(
+    records: List[Record], score: Callable[[List[PredictRequest]], Awaitable[List[Outcome]]]
+) -> Tuple[bytes, int]:
+    """NDJSON lines for ``records`` in upload order, and how many succeeded."""
+    items: List[BatchPredictItem] = []
+    valid: List[PredictRequest] = []
+    positions: List[int] = []
+    for index, raw, error in records:
+        if error is not None:
+            items.append(BatchPredictItem(index=index, error=error))
+            continue
+        try:
+            valid.append(PredictRequest.model_validate(raw))
+            positions.append(index)
+        except ValidationError as e:
+            items.append(BatchPredictItem(index=index, error=f"Invalid item: {validation_reasons(e)}"))
+
+    outcomes = await score(valid) if valid else []
+    for index, (response, error) in zip(positions, outcomes):
+        items.append(BatchPredictItem(index=index, result=response, error=error))
+
+    items.sort(key=lambda item: item.index)
+    body = b"".join(item.model_dump_json().encode() + b"\n" for item in items)
+    return body, sum(1 for item in items if item.error is None)
+
+
+async def score_stream(
+    chunks: AsyncIterator[bytes],
+    parser: Any,
+    score: Callable[[List[PredictRequest]], Awaitable[List[Outcome]]],
+    batch_size: int,
+) -> AsyncIterator[bytes]:
+    """
+    NDJSON result lines for an uploaded body, one micro-batch at a time.
+
+    Every record yields one ``BatchPredictItem`` line. The last line is
+    ``{"summary": {...}}`` with the counts, and an ``error`` if the upload
+    could not be parsed to the end.
+    """
+    pending: List[Record] = []
+    succeeded = failed = 0
+    error: Optional[str] = None
+    try:
+        async for chunk in chunks:
+            pending.extend(parser.feed(chunk))
+            while len(pending) >= batch_size:
+                batch, pending = pending[:batch_size], pending[batch_size:]
+                body, ok = await _score_batch(batch, score)
+                succeeded, failed = succeeded + ok, failed + len(batch) - ok
+                yield body
+        pending.extend(parser.close())
+    except StreamFormatError as e:
+        error = str(e)
+
+    # Whatever was parsed before the end (or the format error) is still scored.
+    while pending:
+        batch, pending = pending[:batch_size], pending[batch_size:]
+        body, ok = await _score_batch(batch, score)
+        succeeded, failed = succeeded + ok, failed + len(batch) - ok
+        yield body
+    summary: Dict[str, Any] = {"succeeded": succeeded, "failed": failed}
+    if error is not None:
+        summary["error"] = error
+    yield _line({"summary": summary})
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    ``StreamingResponse`` whose body iterator may still be reading the request.
+
+    Starlette's version listens for a client disconnect by calling
+    ``receive()`` alongside the body iterator (ASGI < 2.4), which would take
+    request body messages away from it. Here the iterator is the only
+    reader, and a disconnect surfaces there as ``ClientDisconnect``.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except (ClientDisconnect, OSError):
+            return
+        if self.background is not None:
+            await self.background()
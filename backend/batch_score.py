@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Offline batch scoring of a symptom-text CSV with a process pool.
+
+Reads the input in chunks, cuts each chunk into shards and scores the
+shards on worker processes that each build the prediction pipeline (and
+load the model) once. Scoring is the same NLP -> model -> risk -> diet
+pipeline the API runs (``PredictionPipeline.predict_batch``), without the
+response cache. Explanations are skipped unless ``--explain`` is given.
+
+Rows are written in input order to CSV, or to Parquet (needs pyarrow)
+when the output ends in ``.parquet``. Throughput is reported in rows/s;
+with one CatBoost thread per worker it scales with the number of workers
+up to the number of cores.
+
+Usage (from backend/):
+    python batch_score.py data/merged_symptom_dataset_15000.csv predictions.csv --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+OUTPUT_COLUMNS = [
+    "row",
+    "predicted_disease",
+    "confidence",
+    "top_k",
+    "risk_level",
+    "risk_score",
+    "detected_symptoms",
+    "error",
+]
+
+# Set in each worker by _init_worker
+_pipeline: Any = None
+
+
+class _NoExplanations:
+    """Stands in for the explainer when explanations are not wanted."""
+
+    def explain(self, features: Any, detected_symptoms: List[str]) -> List[Dict[str, float]]:
+        return []
+
+    def explain_batch(self, features: Any, detected_batch: List[List[str]]) -> List[List[Dict[str, float]]]:
+        return [[] for _ in detected_batch]
+
+
+def build_pipeline(explain: bool = False) -> Any:
+    """The API's prediction pipeline, configured from the same settings, without a cache."""
+    from app.config import settings
+    from app.pipeline import PredictionPipeline
+    from app.services.diet_engine import NutrientScoredLayer
+    from app.services.explainability import build_explainer
+    from app.services.model_service import DiseaseModelService
+    from app.services.nlp_service import BiomedicalNLPService
+    from app.services.risk_engine import RiskAwareLayer
+
+    model_service = DiseaseModelService(engine=settings.model_engine, thread_count=settings.catboost_thread_count)
+    explainer = (
+        build_explainer(
+            settings.explainer, model_service, ig_steps=settings.ig_steps, shap_cache_size=settings.shap_cache_size
+        )
+        if explain
+        else _NoExplanations()
+    )
+    return PredictionPipeline(
+        BiomedicalNLPService(fuzzy_max_distance=settings.fuzzy_match_max_distance),
+        model_service,
+        explainer,
+        RiskAwareLayer(),
+        NutrientScoredLayer(),
+    )
+
+
+def _init_worker(explain: bool) -> None:
+    global _pipeline
+    _pipeline = build_pipeline(explain)
+
+
+def score_shard(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Score ``rows`` (``row``, ``text`` and optional request fields) in one pipeline call."""
+    from pydantic import ValidationError
+
+    from app.schemas import PredictRequest
+    from app.streaming import validation_reasons
+
+    out: List[Dict[str, Any]] = []
+    valid: List[PredictRequest] = []
+    positions: List[int] = []
+    for row in rows:
+        record: Dict[str, Any] = {column: None for column in OUTPUT_COLUMNS}
+        record.update({key: value for key, value in row.items() if key not in ("text", "request")})
+        out.append(record)
+        if record["error"]:
+            # Rejected while reading (e.g. an unparsable symptom_intensity)
+            continue
+        try:
+            valid.append(PredictRequest.model_validate(row["request"]))
+            positions.append(len(out) - 1)
+        except ValidationError as e:
+            record["error"] = f"Invalid item: {validation_reasons(e)}"
+
+    outcomes = _pipeline.predict_batch(valid) if valid else []
+    for pos, (response, error) in zip(positions, outcomes):
+        record = out[pos]
+        if response is None:
+            record["error"] = error
+            continue
+        record.update(
+            predicted_disease=response.predicted_disease,
+            confidence=response.confidence,
+            top_k=json.dumps(response.top_k, ensure_ascii=False),
+            risk_level=response.risk_level,
+            risk_score=response.risk_score,
+            detected_symptoms=";".join(response.detected_symptoms),
+        )
+    return out
+
+
+def read_shards(
+    path: Path, text_column: str, label_column: Optional[str], chunk_size: int, shard_size: int, args: argparse.Namespace
+) -> Iterator[List[Dict[str, Any]]]:
+    """Shards of request rows, reading ``chunk_size`` CSV rows at a time."""
+    first_row = 0
+    for chunk in pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+        if text_column not in chunk.columns:
+            raise SystemExit(f"{path} has no {text_column!r} column (columns: {', '.join(chunk.columns)})")
+        texts = chunk[text_column].tolist()
+        labels = chunk[label_column].tolist() if label_column in chunk.columns else None
+        intensities = chunk["symptom_intensity"].tolist() if "symptom_intensity" in chunk.columns else None
+        rows: List[Dict[str, Any]] = []
+        for i, text in enumerate(texts):
+            request: Dict[str, Any] = {"text": text, "language": args.language, "top_k": args.top_k}
+            row: Dict[str, Any] = {"row": first_row + i, "request": request}
+            if intensities and intensities[i]:
+                try:
+                    intensity = json.loads(intensities[i])
+                except ValueError as e:
+                    row["error"] = f"Invalid symptom_intensity: {e}"
+                else:
+                    if isinstance(intensity, dict):
+                        request["symptom_intensity"] = intensity
+                    else:
+                        kind = type(intensity).__name__
+                        row["error"] = f"Invalid symptom_intensity: expected a JSON object, got {kind}"
+            if labels is not None:
+                row["expected_disease"] = labels[i]
+            rows.append(row)
+        first_row += len(texts)
+        for start in range(0, len(rows), shard_size):
+            yield rows[start : start + shard_size]
+
+
+class _CsvWriter:
+    def __init__(self, path: Path, columns: List[str]) -> None:
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=columns, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        self._writer.writerows(records)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: Path, columns: List[str]) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow: pip install pyarrow (or write .csv)")
+        self._pa = pa
+        types = {"row": pa.int64(), "confidence": pa.float64(), "risk_score": pa.float64()}
+        self._schema = pa.schema([(column, types.get(column, pa.string())) for column in columns])
+        self._writer = pq.ParquetWriter(str(path), self._schema)
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        self._writer.write_table(self._pa.Table.from_pylist(records, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def open_writer(path: Path, columns: List[str]) -> Any:
+    return _ParquetWriter(path, columns) if path.suffix.lower() == ".parquet" else _CsvWriter(path, columns)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", type=Path, help="CSV with a text column")
+    parser.add_argument("output", type=Path, help="predictions .csv or .parquet")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 scores in this process")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--label-column", default="disease", help="copied as expected_disease to report accuracy")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--chunk-size", type=int, default=10000, help="CSV rows read at a time")
+    parser.add_argument("--shard-size", type=int, default=256, help="rows per worker task (one model call)")
+    parser.add_argument("--explain", action="store_true", help="also run the explainer, as /predict does")
+    args = parser.parse_args(argv)
+
+    # One CatBoost thread per worker: the workers are the parallelism.
+    os.environ.setdefault("CATBOOST_THREAD_COUNT", "1")
+    shards = read_shards(args.input, args.text_column, args.label_column, args.chunk_size, args.shard_size, args)
+    first = next(shards, [])
+    columns = OUTPUT_COLUMNS + (["expected_disease"] if first and "expected_disease" in first[0] else [])
+    writer = open_writer(args.output, columns)
+
+    rows = failed = correct = 0
+    started = time.perf_counter()
+
+    def write(records: List[Dict[str, Any]]) -> None:
+        nonlocal rows, failed, correct
+        writer.write(records)
+        rows += len(records)
+        failed += sum(1 for r in records if r["error"])
+        correct += sum(1 for r in records if r.get("expected_disease") and r["predicted_disease"] == r["expected_disease"])
+        elapsed = time.perf_counter() - started
+        print(f"\r  {rows} rows  {rows / elapsed:,.0f} rows/s", end="", file=sys.stderr, flush=True)
+
+    def all_shards() -> Iterator[List[Dict[str, Any]]]:
+        if first:
+            yield first
+        yield from shards
+
+    try:
+        if args.workers <= 0:
+            _init_worker(args.explain)
+            started = time.perf_counter()
+            for shard in all_shards():
+                write(score_shard(shard))
+        else:
+            with ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(args.explain,)) as pool:
+                # A few shards in flight per worker keeps them busy while
+                # bounding memory; results are written in input order.
+                in_flight: Deque[Future] = deque()
+                for shard in all_shards():
+                    in_flight.append(pool.submit(score_shard, shard))
+                    if len(in_flight) >= 2 * args.workers:
+                        write(in_flight.popleft().result())
+                while in_flight:
+                    write(in_flight.popleft().result())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    report: Dict[str, Any] = {
+        "rows": rows,
+        "failed": failed,
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+        "workers": args.workers,
+    }
+    if "expected_disease" in columns and rows:
+        report["accuracy"] = round(correct / rows, 4)
+    print(file=sys.stderr)
+    print(f"✓ Scored {rows} rows ({failed} failed) in {elapsed:.1f}s: {report['rows_per_second']:,.0f} rows/s -> {args.output}")
+    if "accuracy" in report:
+        print(f"✓ Top-1 accuracy against {args.label_column!r}: {report['accuracy']:.2%}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+DEFAULT_MODEL_PATH = BACKEND_DIR / "disease_model_15k.json"
+LEGACY_MODEL_PATH = BACKEND_DIR / "disease_model_15k.pkl"
+TRAINED_MODEL_CACHE = Path(tempfile.gettempdir()) / "symptom-checker-bench" / "disease_model_15k.json"
+
+
+def load_training_frame() -> pd.DataFrame:
+    return pd.read_csv(BACKEND_DIR / "data" / "training_data_15k.csv")
+
+
+def load_texts(rows: int) -> List[str]:
+    df = pd.read_csv(BACKEND_DIR / "data" / "merged_symptom_dataset_15000.csv", nrows=rows)
+    return df["text"].astype(str).tolist()
+
+
+def ensure_model_artifact(path: Path = DEFAULT_MODEL_PATH) -> Path:
+    """
+    Manifest path of a retrained 15k model. When ``path`` does not exist a
+    legacy pickle next to it is migrated, or else a model is trained once
+    with ModelRetrainer; either result is cached in the temp dir.
+    """
+    if path.exists():
+        return path
+    if not TRAINED_MODEL_CACHE.exists() and path.with_suffix(".pkl").exists():
+        from app.services.model_artifact import migrate_pickle
+
+        print(f"Migrating {path.with_suffix('.pkl').name} to {TRAINED_MODEL_CACHE} ...")
+        TRAINED_MODEL_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        migrate_pickle(path.with_suffix(".pkl"), TRAINED_MODEL_CACHE)
+    if not TRAINED_MODEL_CACHE.exists():
+        from retrain_model import ModelRetrainer
+
+        print(f"{path.name} not found, training one with ModelRetrainer (cached at {TRAINED_MODEL_CACHE}) ...")
+        TRAINED_MODEL_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        retrainer = ModelRetrainer(data_dir=str(BACKEND_DIR / "data"), model_path=str(TRAINED_MODEL_CACHE))
+        X, y, _ = retrainer.prepare_features_and_labels(retrainer.load_training_data())
+        retrainer.train_model(X, y)
+        retrainer.save_model()
+    return TRAINED_MODEL_CACHE
+
+
+def load_model_artifact(path: Path = DEFAULT_MODEL_PATH) -> Dict[str, Any]:
+    """The manifest of ``ensure_model_artifact(path)`` plus the loaded ``model``."""
+    from app.services.model_artifact import load_artifact
+
+    model, manifest = load_artifact(ensure_model_artifact(path))
+    return {**manifest, "model": model}
+
+
+def build_model_service(engine: str = "catboost", path: Path = DEFAULT_MODEL_PATH):
+    from app.services.model_service import DiseaseModelService
+
+    service = DiseaseModelService(engine=engine)
+    service.artifact_path = ensure_model_artifact(path)
+    service._load_if_exists()
+    return service
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Throughput of POST /predict/batch versus looping over POST /predict.
+
+Usage (from backend/):
+    python benchmarks/bench_batch_predict.py [--rows 1000] [--batch-size 250]
+"""
+
+import argparse
+import os
+import time
+
+from fastapi.testclient import TestClient
+
+from _common import load_texts
+
+# Measure the pipeline itself, not the response cache.
+os.environ.setdefault("PREDICTION_CACHE_SIZE", "0")
+
+from app.main import app  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=250)
+    args = parser.parse_args()
+
+    texts = load_texts(args.rows)
+    client = TestClient(app)
+    client.post("/predict", json={"text": texts[0]})  # warm-up
+
+    start = time.perf_counter()
+    for text in texts:
+        client.post("/predict", json={"text": text}).raise_for_status()
+    loop_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for offset in range(0, len(texts), args.batch_size):
+        chunk = texts[offset : offset + args.batch_size]
+        client.post("/predict/batch", json={"items": [{"text": t} for t in chunk]}).raise_for_status()
+    batch_elapsed = time.perf_counter() - start
+
+    print(f"rows={len(texts)} batch_size={args.batch_size}")
+    print(f"  loop /predict       : {loop_elapsed:8.3f}s  {len(texts) / loop_elapsed:10.1f} rows/s")
+    print(f"  /predict/batch      : {batch_elapsed:8.3f}s  {len(texts) / batch_elapsed:10.1f} rows/s")
+    print(f"  speedup             : {loop_elapsed / batch_elapsed:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
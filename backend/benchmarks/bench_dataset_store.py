@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+DatasetLoader appends and lookups: CSV files vs the SQLite backend.
+
+Appends ``--rows`` disease-symptom records to a fresh data directory in
+each mode, one ``add_disease_symptom_record`` call per record and as one
+``add_disease_symptom_records`` bulk call. The CSV backend rewrites the
+whole file per record, so its per-record run stops at ``--csv-rows`` and
+the full run is extrapolated from a linear fit of the per-record cost
+against the file's length. Then times
+``get_symptoms_for_disease`` on the resulting table.
+
+Usage (from backend/):
+    python benchmarks/bench_dataset_store.py [--rows 100000] [--csv-rows 2000]
+"""
+
+import argparse
+import tempfile
+import time
+import warnings
+from typing import List, Tuple
+
+import numpy as np
+
+import _common  # noqa: F401  (puts backend/ on sys.path)
+
+from app.services.dataset_loader import DatasetLoader
+
+DISEASES = [f"Disease {i}" for i in range(200)]
+
+
+def records(n: int) -> List[Tuple[str, str, float, str]]:
+    return [(DISEASES[i % len(DISEASES)], f"symptom_{i % 997}", (i % 100) / 100, "") for i in range(n)]
+
+
+def single(backend: str, rows: List[Tuple[str, str, float, str]]) -> Tuple[np.ndarray, DatasetLoader]:
+    """Seconds taken by each append, and the loader."""
+    loader = DatasetLoader(tempfile.mkdtemp(), backend=backend)
+    times = np.empty(len(rows))
+    for i, record in enumerate(rows):
+        start = time.perf_counter()
+        loader.add_disease_symptom_record(*record)
+        times[i] = time.perf_counter() - start
+    return times, loader
+
+
+def bulk(backend: str, rows: List[Tuple[str, str, float, str]]) -> Tuple[float, DatasetLoader]:
+    loader = DatasetLoader(tempfile.mkdtemp(), backend=backend)
+    start = time.perf_counter()
+    loader.add_disease_symptom_records(rows)
+    return time.perf_counter() - start, loader
+
+
+def lookup(loader: DatasetLoader, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for i in range(repeat):
+        loader.get_symptoms_for_disease(DISEASES[i])
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--csv-rows", type=int, default=2000, help="per-record CSV appends actually run")
+    args = parser.parse_args()
+
+    # The CSV backend's first append concats onto an empty frame
+    warnings.simplefilter("ignore", FutureWarning)
+    rows = records(args.rows)
+    csv_rows = min(args.csv_rows, args.rows)
+    times, _ = single("csv", rows[:csv_rows])
+    slope, intercept = np.polyfit(np.arange(csv_rows), times, 1)
+    estimate = intercept * args.rows + slope * args.rows ** 2 / 2
+    print(
+        f"csv    per-record: {csv_rows:>7} appends {times.sum():8.2f}s  ({times[-100:].mean() * 1000:.1f}ms/record at the end)"
+        f"  -> {args.rows} appends ~{estimate:,.0f}s (extrapolated)"
+    )
+
+    times, loader = single("sqlite", rows)
+    seconds = times.sum()
+    print(f"sqlite per-record: {args.rows:>7} appends {seconds:8.2f}s  ({seconds / args.rows * 1e6:.0f}us/record)")
+    sqlite_lookup = lookup(loader)
+    loader.close()
+
+    seconds, loader = bulk("csv", rows)
+    print(f"csv    bulk:       {args.rows:>7} records {seconds:8.2f}s")
+    csv_lookup = lookup(loader)
+
+    seconds, loader = bulk("sqlite", rows)
+    print(f"sqlite bulk:       {args.rows:>7} records {seconds:8.2f}s")
+    loader.close()
+
+    print(
+        f"get_symptoms_for_disease on {args.rows} rows: csv {csv_lookup * 1000:.2f}ms"
+        f"  sqlite {sqlite_lookup * 1000:.3f}ms (indexed)"
+    )
+
+
+if __name__ == "__main__":
+    main()
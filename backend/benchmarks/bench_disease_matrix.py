@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Disease-symptom weights: iterrows dict + per-key probing vs the dense matrix.
+
+``dict`` is the previous ``get_disease_symptom_matrix`` (a
+``{(disease, symptom): weight}`` dict filled with ``iterrows``), scoring a
+symptom set by probing every (disease, symptom) key. ``matrix`` pivots
+the same frame into a float32 matrix and scores all symptom sets with one
+product. Mapping tables are synthetic, ``--diseases`` x ``--symptoms``
+with ``--density`` of the pairs mapped.
+
+Usage (from backend/):
+    python benchmarks/bench_disease_matrix.py [--diseases 200] [--symptoms 1000] [--queries 1000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import _common  # noqa: F401  (puts backend/ on sys.path)
+
+from app.services.dataset_loader import DiseaseSymptomMatrix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--diseases", type=int, default=200)
+    parser.add_argument("--symptoms", type=int, default=1000)
+    parser.add_argument("--density", type=float, default=0.1)
+    parser.add_argument("--queries", type=int, default=1000, help="symptom sets to score")
+    parser.add_argument("--per-query", type=int, default=5, help="symptoms per set")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    diseases = [f"Disease {i}" for i in range(args.diseases)]
+    symptoms = [f"symptom_{i}" for i in range(args.symptoms)]
+    mapped = np.argwhere(rng.random((args.diseases, args.symptoms)) < args.density)
+    df = pd.DataFrame({
+        "disease": [diseases[d] for d in mapped[:, 0]],
+        "symptom": [symptoms[s] for s in mapped[:, 1]],
+        "weight": rng.random(len(mapped)).round(2),
+    })
+    queries = [[symptoms[s] for s in rng.choice(args.symptoms, args.per_query, replace=False)] for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    weights = {}
+    for _, row in df.iterrows():
+        weights[(row["disease"], row["symptom"])] = row["weight"]
+    dict_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix = DiseaseSymptomMatrix.from_frame(df)
+    matrix_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dict_scores = np.array([[sum(weights.get((d, s), 0.0) for s in query) for d in matrix.diseases] for query in queries])
+    dict_score = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectors = np.vstack([matrix.symptom_vector(query) for query in queries])
+    matrix_scores = matrix.score(vectors)
+    matrix_score = time.perf_counter() - start
+    np.testing.assert_allclose(matrix_scores, dict_scores, rtol=1e-5, atol=1e-5)
+
+    print(f"{len(df)} mapped pairs ({args.diseases} diseases x {args.symptoms} symptoms)")
+    print(f"  build:  dict {dict_build * 1000:9.1f}ms  matrix {matrix_build * 1000:7.1f}ms  ({dict_build / matrix_build:5.1f}x)")
+    print(
+        f"  score {args.queries} sets: dict {dict_score * 1000:9.1f}ms  matrix {matrix_score * 1000:7.1f}ms"
+        f"  ({dict_score / matrix_score:5.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
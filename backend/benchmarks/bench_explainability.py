@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Extra /predict latency of model-driven Integrated Gradients.
+
+Budget: with the default 30 steps the explainer must add at most 5 ms
+(median) per request on top of the model prediction, with either engine.
+
+Usage (from backend/):
+    python benchmarks/bench_explainability.py [--rows 300]
+"""
+
+import argparse
+import statistics
+import time
+
+from _common import build_model_service, load_texts
+
+from app.services.explainability import IntegratedGradientsExplainer
+from app.services.nlp_service import BiomedicalNLPService
+
+BUDGET_MS = 5.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=300)
+    args = parser.parse_args()
+
+    nlp = BiomedicalNLPService()
+    vectors = [nlp.build_feature_vector(text, {}) for text in load_texts(args.rows)]
+
+    print(
+        f"{'engine':>9} {'steps':>6} {'predict p50':>12} {'IG p50':>9} {'IG p95':>9}"
+        f" {'max gap':>9} {'raw gap p50':>12}  budget"
+    )
+    for engine in ("catboost", "numpy"):
+        service = build_model_service(engine)
+        predict_ms = []
+        for features, detected in vectors:
+            start = time.perf_counter()
+            service.predict(features, detected)
+            predict_ms.append((time.perf_counter() - start) * 1e3)
+
+        for steps in (10, 30, 50):
+            explainer = IntegratedGradientsExplainer(service, steps=steps)
+            explain_ms, gaps, raw_gaps = [], [], []
+            for features, _ in vectors:
+                start = time.perf_counter()
+                result = explainer.attribute(features)
+                explain_ms.append((time.perf_counter() - start) * 1e3)
+                gaps.append(result["completeness_gap"])
+                raw_gaps.append(result["raw_completeness_gap"])
+
+            p50 = statistics.median(explain_ms)
+            p95 = statistics.quantiles(explain_ms, n=20)[-1]
+            verdict = "OK" if steps != 30 or p50 <= BUDGET_MS else "OVER"
+            print(
+                f"{engine:>9} {steps:>6} {statistics.median(predict_ms):>10.2f}ms {p50:>7.2f}ms {p95:>7.2f}ms"
+                f" {max(gaps):>9.2e} {statistics.median(raw_gaps):>12.2e}  {verdict}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Retraining data load: CSV parse + float32 copy vs the memory-mapped feature cache.
+
+Each measurement runs in a fresh process that loads ``X, y`` the way
+``ModelRetrainer`` does (``csv``: ``load_training_data`` +
+``prepare_features_and_labels``; ``cache``: ``load_feature_cache``, which
+includes hashing the CSV) and reports the wall time, how much the
+process's peak RSS grew and how much private (anonymous) memory it holds
+afterwards. ``cache+touch`` also reads every page of the mapped matrix, as
+training does: those pages are page cache shared with other readers, not
+private memory. Corpora beyond 15k rows are sampled from
+training_data_15k.csv with replacement into a temp directory.
+
+Usage (from backend/, Linux only):
+    python benchmarks/bench_feature_cache.py [--rows 15000 1000000]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from _common import BACKEND_DIR, load_training_frame
+
+CHILD = r"""
+import json, sys, time
+sys.path.insert(0, {backend!r})
+import numpy as np, pandas as pd
+from app.services.feature_cache import load_feature_cache
+import retrain_model  # noqa: F401  (same imports as a retraining run)
+
+def status_kb(field):
+    # VmHWM rather than ru_maxrss, which exec inherits from the forked parent
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith(field + ":"))
+
+mode, path = sys.argv[1], sys.argv[2]
+base_peak, base_anon = status_kb("VmHWM"), status_kb("RssAnon")
+start = time.perf_counter()
+if mode == "csv":
+    df = pd.read_csv(path)
+    exclude = {{"patient_id", "disease", "text"}}
+    X = df[[c for c in df.columns if c not in exclude]].values.astype(np.float32)
+    y = df["disease"].values
+else:
+    X, y, _, _ = load_feature_cache(path)
+    if mode == "cache+touch":
+        float(X.sum())
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "peak_mb": (status_kb("VmHWM") - base_peak) / 1024,
+    "anon_mb": (status_kb("RssAnon") - base_anon) / 1024,
+}}))
+"""
+
+
+def measure(mode: str, csv_path: Path) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD.format(backend=str(BACKEND_DIR)), mode, str(csv_path)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[15000, 1000000])
+    args = parser.parse_args()
+
+    from app.services.feature_cache import write_feature_cache
+
+    source = load_training_frame()
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            df = source if rows == len(source) else source.sample(rows, replace=True, random_state=0)
+            csv_path = Path(tmp) / f"training_{rows}.csv"
+            df.to_csv(csv_path, index=False)
+            columns = df.columns[3:].tolist()
+            write_feature_cache(csv_path, df[columns].to_numpy(np.float32), df["disease"].tolist(), columns)
+
+            size = csv_path.stat().st_size / 1024 / 1024
+            parts = []
+            for mode in ("csv", "cache", "cache+touch"):
+                result = measure(mode, csv_path)
+                parts.append(
+                    f"{mode} {result['seconds'] * 1000:7.1f}ms peak +{result['peak_mb']:6.1f}MB"
+                    f" anon +{result['anon_mb']:6.1f}MB"
+                )
+            print(f"{rows:>8} rows ({size:6.1f}MB CSV): " + "  ".join(parts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Feature encoding cost: per-request dict + list vs the compiled FeatureLayout.
+
+``dict`` is the previous build_feature_vector (a dict over every catalog
+symptom, then a list comprehension into a new array); batches stacked the
+rows with ``np.vstack``. ``layout`` writes straight into a zeroed row, and
+batches into one preallocated matrix. Symptom extraction is done up front
+so only the encoding is timed; tracemalloc reports the peak memory
+allocated while encoding a row or a batch (per row).
+
+Usage (from backend/):
+    python benchmarks/bench_feature_layout.py [--rows 2000] [--batch 64]
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from _common import load_texts
+
+from app.services.feature_layout import CATALOG_LAYOUT, FeatureLayout
+from app.services.nlp_service import BiomedicalNLPService
+from app.services.symptom_catalog import DATASET_KEYWORDS, SYMPTOMS
+
+INTENSITY = {"fever": 0.8, "cough": 0.4}
+
+
+def dict_vector(detected: List[str], intensity: Dict[str, float]) -> np.ndarray:
+    feature_map = {symptom: 0.0 for symptom in SYMPTOMS}
+    for symptom in detected:
+        feature_map[symptom] = max(feature_map[symptom], 0.6)
+    for symptom, score in intensity.items():
+        if symptom in feature_map:
+            feature_map[symptom] = max(feature_map[symptom], float(min(max(score, 0.0), 1.0)))
+    return np.array([[feature_map[s] for s in SYMPTOMS]], dtype=np.float32)
+
+
+def transient_bytes(fn: Callable[[int], object], n: int) -> float:
+    """Mean peak memory allocated while encoding one row (or one batch)."""
+    tracemalloc.start()
+    total = 0
+    for i in range(n):
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn(i)
+        total += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return total / n
+
+
+def timed(fn: Callable[[int], object], n: int, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(n):
+            fn(i)
+        best = min(best, time.perf_counter() - start)
+    return best / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=64)
+    args = parser.parse_args()
+
+    nlp = BiomedicalNLPService()
+    texts: List[str] = load_texts(args.rows)
+    normalized = [nlp.normalize_text(text) for text in texts]
+    detected = [nlp.extract_symptoms(text) for text in texts]
+    keyword_layout = FeatureLayout.for_model(DATASET_KEYWORDS, len(DATASET_KEYWORDS))
+    starts = list(range(0, len(texts), args.batch))
+
+    def single_layout(layout: FeatureLayout) -> Callable[[int], object]:
+        return lambda i: layout.encode(normalized[i], detected[i], INTENSITY)
+
+    def batch_dict(b: int) -> np.ndarray:
+        rows = range(starts[b], min(starts[b] + args.batch, len(texts)))
+        return np.vstack([dict_vector(detected[i], INTENSITY) for i in rows]).astype(np.float32, copy=False)
+
+    def batch_layout(b: int) -> np.ndarray:
+        rows = range(starts[b], min(starts[b] + args.batch, len(texts)))
+        matrix = np.zeros((len(rows), CATALOG_LAYOUT.n_features), dtype=np.float32)
+        for row, i in zip(matrix, rows):
+            CATALOG_LAYOUT.encode_into(row, normalized[i], detected[i], INTENSITY)
+        return matrix
+
+    print(f"{len(texts)} texts; encoding only (symptom extraction excluded)")
+    cases = [
+        ("single dict", lambda i: dict_vector(detected[i], INTENSITY), len(texts), 1),
+        ("single layout", single_layout(CATALOG_LAYOUT), len(texts), 1),
+        (f"single keywords({keyword_layout.n_features})", single_layout(keyword_layout), len(texts), 1),
+        (f"batch{args.batch} dict+vstack", batch_dict, len(starts), args.batch),
+        (f"batch{args.batch} layout", batch_layout, len(starts), args.batch),
+    ]
+    for name, fn, n, per in cases:
+        seconds = timed(fn, n)
+        allocated = transient_bytes(fn, n)
+        print(f"{name:>22}: {seconds / per * 1e6:6.2f}us/row  peak allocated {allocated / per:7.1f} B/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Per-POST feedback write latency as total feedback grows to 100k entries.
+
+``rewrite`` is the previous behaviour: append to an in-memory dict and
+re-serialize everything to feedback_data.json with indent=2. ``store`` is
+FeedbackStore.append (enqueue only; the writer thread commits in batches).
+The rewrite path is sampled at each checkpoint rather than run 100k times.
+
+Usage (from backend/):
+    python benchmarks/bench_feedback_store.py [--entries 100000]
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import _common  # noqa: F401  (puts backend/ on sys.path)
+
+from app.services.feedback_store import FeedbackQueueFull, FeedbackStore
+
+CHECKPOINTS = (1_000, 10_000, 50_000, 100_000)
+SAMPLES = 20
+
+
+def _entry(i: int) -> dict:
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "prediction_id": f"pred_{i}",
+        "actual_disease": "Influenza",
+        "predicted_disease": "Influenza" if i % 3 else "Common Cold",
+        "confidence": 0.8,
+        "user_comment": "Felt feverish for three days with body pain",
+    }
+
+
+def bench_rewrite(workdir: Path, checkpoints) -> dict:
+    feedback_data = {"predictions": [], "features": [], "bugs": []}
+    path = workdir / "feedback_data.json"
+    results = {}
+    for checkpoint in checkpoints:
+        while len(feedback_data["predictions"]) < checkpoint - SAMPLES:
+            feedback_data["predictions"].append(_entry(len(feedback_data["predictions"])))
+        samples = []
+        for _ in range(SAMPLES):
+            start = time.perf_counter()
+            feedback_data["predictions"].append(_entry(len(feedback_data["predictions"])))
+            with open(path, "w") as f:
+                json.dump(feedback_data, f, indent=2)
+            samples.append((time.perf_counter() - start) * 1e3)
+        results[checkpoint] = samples
+    return results
+
+
+def bench_store(workdir: Path, total: int, checkpoints) -> tuple:
+    store = FeedbackStore(workdir / "feedback.db")
+    results = {checkpoint: [] for checkpoint in checkpoints}
+    rejected = 0
+    start_all = time.perf_counter()
+    for i in range(1, total + 1):
+        entry = _entry(i)
+        while True:
+            start = time.perf_counter()
+            try:
+                store.append("predictions", entry)
+                break
+            except FeedbackQueueFull:
+                # A tight loop outruns the writer; back off like a client on 503.
+                rejected += 1
+                time.sleep(0.01)
+        elapsed = (time.perf_counter() - start) * 1e3
+        for checkpoint in checkpoints:
+            if checkpoint - SAMPLES * 50 < i <= checkpoint:
+                results[checkpoint].append(elapsed)
+    store.flush()
+    drain_s = time.perf_counter() - start_all
+    store.close()
+    return results, drain_s, rejected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100_000)
+    args = parser.parse_args()
+    checkpoints = [c for c in CHECKPOINTS if c <= args.entries]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        rewrite = bench_rewrite(workdir, checkpoints)
+        store, drain_s, rejected = bench_store(workdir, args.entries, checkpoints)
+
+    print(f"{'entries':>9} {'rewrite p50':>12} {'store p50':>10} {'store p99':>10}")
+    for checkpoint in checkpoints:
+        store_p99 = statistics.quantiles(store[checkpoint], n=100)[-1]
+        print(
+            f"{checkpoint:>9} {statistics.median(rewrite[checkpoint]):>10.2f}ms"
+            f" {statistics.median(store[checkpoint]) * 1e3:>8.1f}us {store_p99 * 1e3:>8.1f}us"
+        )
+    print(f"store: {args.entries} entries durable after {drain_s:.2f}s ({args.entries / drain_s:,.0f} entries/s, {rejected} full-queue retries)")
+
+
+if __name__ == "__main__":
+    main()
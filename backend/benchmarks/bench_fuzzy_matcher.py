@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Symptom extraction latency with and without the fuzzy (deletion index) stage.
+
+Runs extract_symptoms over dataset texts as written and with one typo
+(deletion, transposition or substitution, never of the first letter)
+injected into each word of 6+ letters, and reports per-call latency,
+the index build time and how many texts gain detected symptoms.
+
+Usage (from backend/):
+    python benchmarks/bench_fuzzy_matcher.py [--rows 2000]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+import _common
+
+from app.services.nlp_service import BiomedicalNLPService
+
+
+def misspell(text: str, rng: random.Random) -> str:
+    words = []
+    for word in text.split(" "):
+        if len(word) >= 6 and word.isalpha():
+            pos = rng.randrange(1, len(word) - 1)
+            edit = rng.randrange(3)
+            if edit == 0:
+                word = word[:pos] + word[pos + 1:]
+            elif edit == 1:
+                word = word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:]
+            else:
+                word = word[:pos] + rng.choice("aeiou") + word[pos + 1:]
+        words.append(word)
+    return " ".join(words)
+
+
+def timings_us(extract: Callable[[str], List[str]], texts: List[str]) -> Tuple[np.ndarray, List[List[str]]]:
+    samples, results = [], []
+    for text in texts:
+        start = time.perf_counter()
+        results.append(extract(text))
+        samples.append(time.perf_counter() - start)
+    return np.array(samples) * 1e6, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+    texts = _common.load_texts(args.rows)
+    rng = random.Random(3)
+    typo_texts = [misspell(text, rng) for text in texts]
+
+    exact = BiomedicalNLPService()
+    start = time.perf_counter()
+    fuzzy = BiomedicalNLPService(fuzzy_max_distance=2)
+    build_ms = (time.perf_counter() - start) * 1e3
+    print(f"fuzzy index: {len(fuzzy._fuzzy)} terms, {len(fuzzy._fuzzy._index)} keys, service build {build_ms:.1f}ms")
+
+    print(f"{'texts':<10} {'stage':<7} {'mean (us)':>10} {'p50':>8} {'p99':>8} {'max':>8} {'texts with more symptoms':>26}")
+    for label, batch in (("as typed", texts), ("typos", typo_texts)):
+        for service in (exact, fuzzy):
+            timings_us(service.extract_symptoms, batch[:200])  # warm up
+        exact_us, exact_hits = timings_us(exact.extract_symptoms, batch)
+        fuzzy_us, fuzzy_hits = timings_us(fuzzy.extract_symptoms, batch)
+        gained = sum(len(f) > len(e) for e, f in zip(exact_hits, fuzzy_hits))
+        for stage, us in (("exact", exact_us), ("fuzzy", fuzzy_us)):
+            extra = f"{gained:>8} / {len(batch)}" if stage == "fuzzy" else ""
+            print(
+                f"{label:<10} {stage:<7} {us.mean():>10.1f} {np.percentile(us, 50):>8.1f} "
+                f"{np.percentile(us, 99):>8.1f} {us.max():>8.1f} {extra:>26}"
+            )
+
+
+if __name__ == "__main__":
+    main()
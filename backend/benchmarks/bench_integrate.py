@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Keyword feature extraction in integrate_dataset.py: row loop vs keyword_matrix.
+
+``iterrows`` is the previous extraction: ``extract_symptoms_from_text`` on
+every row of ``df.iterrows()``, run twice as the matrix and training-set
+builders each did. ``matrix`` is ``keyword_matrix`` (one regex scan per
+keyword over the joined texts), run once and shared; ``matrix/N`` shards
+it across N processes. Corpora are the 15k dataset and synthetic ones
+sampled from it with replacement; the row loop is skipped above
+``--loop-max-rows`` and its time extrapolated.
+
+Usage (from backend/):
+    python benchmarks/bench_integrate.py [--rows 15000 1000000] [--workers 2 4]
+"""
+
+import argparse
+import time
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from _common import BACKEND_DIR
+
+from app.services.symptom_catalog import DATASET_KEYWORDS
+from integrate_dataset import DatasetIntegration, keyword_matrix
+
+
+def loop_extract(df: pd.DataFrame) -> np.ndarray:
+    integration = DatasetIntegration.__new__(DatasetIntegration)
+    found = []
+    for _ in range(2):
+        found = [set(integration.extract_symptoms_from_text(row["text"])) for _, row in df.iterrows()]
+    return np.array([[keyword in symptoms for keyword in DATASET_KEYWORDS] for symptoms in found])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[15000, 1000000])
+    parser.add_argument("--workers", type=int, nargs="*", default=[2, 4])
+    parser.add_argument("--loop-max-rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    source = pd.read_csv(BACKEND_DIR / "data" / "merged_symptom_dataset_15000.csv")
+    for rows in args.rows:
+        df = source if rows == len(source) else source.sample(rows, replace=True, random_state=0)
+        df = df.reset_index(drop=True)
+        texts = df["text"].tolist()
+        results: Dict[str, float] = {}
+
+        start = time.perf_counter()
+        expected = keyword_matrix(texts)
+        results["matrix"] = time.perf_counter() - start
+        for workers in args.workers:
+            start = time.perf_counter()
+            sharded = keyword_matrix(texts, workers=workers)
+            results[f"matrix/{workers}"] = time.perf_counter() - start
+            assert np.array_equal(sharded, expected)
+
+        loop_rows = min(rows, args.loop_max_rows)
+        start = time.perf_counter()
+        assert np.array_equal(loop_extract(df.iloc[:loop_rows]), expected[:loop_rows])
+        results["iterrows"] = (time.perf_counter() - start) * rows / loop_rows
+        estimated = " (extrapolated)" if loop_rows < rows else ""
+
+        line = "  ".join(f"{name} {seconds:7.2f}s" for name, seconds in results.items())
+        print(f"{rows:>8} rows: {line}{estimated}  ({results['iterrows'] / results['matrix']:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Loading new symptom variants at runtime: full rebuild per call vs incremental updates.
+
+Adds ``--variants`` synthetic variants to EnhancedBiomedicalNLPService
+(the dataset synonyms plus the static catalog). ``rebuild`` is the
+previous ``add_symptom_variants``: every call rebuilt the matcher over all
+synonyms. ``per-call`` calls the current ``add_symptom_variants`` once per
+variant (delta automaton, folded in every DELTA_MAX_TERMS terms) and
+``add_many`` loads them in one call. Also reports ``extract_symptoms``
+latency while a delta automaton is pending.
+
+Usage (from backend/):
+    python benchmarks/bench_matcher_updates.py [--variants 5000]
+"""
+
+import argparse
+import random
+import string
+import time
+from typing import Dict, List, Tuple
+
+import _common  # noqa: F401  (puts backend/ on sys.path)
+
+from app.services.nlp_service_enhanced import EnhancedBiomedicalNLPService
+from app.services.symptom_catalog import SYMPTOMS
+from app.services.symptom_matcher import SymptomMatcher
+from app.services.text_normalizer import matching_form, normalize_synonyms
+
+TEXT = "mujhe bukhar aur khansi hai, sar dard bhi and body ache since two days"
+
+
+def variants(n: int, seed: int = 11) -> List[Tuple[str, str]]:
+    rng = random.Random(seed)
+    return [
+        (rng.choice(SYMPTOMS), "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10))))
+        for _ in range(n)
+    ]
+
+
+def latency_us(service: EnhancedBiomedicalNLPService, repeat: int = 2000) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        service.extract_symptoms(TEXT)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--variants", type=int, default=5000)
+    args = parser.parse_args()
+    pairs = variants(args.variants)
+
+    service = EnhancedBiomedicalNLPService()
+    synonyms: Dict[str, List[str]] = {s: list(t) for s, t in service._multilingual_synonyms.items()}
+    start = time.perf_counter()
+    for symptom, variant in pairs:
+        synonyms.setdefault(symptom, []).append(variant)
+        matcher = SymptomMatcher(normalize_synonyms(synonyms))
+    rebuild = time.perf_counter() - start
+
+    service = EnhancedBiomedicalNLPService()
+    start = time.perf_counter()
+    for symptom, variant in pairs:
+        service.add_symptom_variants(symptom, [variant])
+    per_call = time.perf_counter() - start
+    assert service._compiled.term_count == matcher.term_count
+    pending = service._compiled.delta_term_count
+    with_delta = latency_us(service)
+
+    service = EnhancedBiomedicalNLPService()
+    bulk: Dict[str, List[str]] = {}
+    for symptom, variant in pairs:
+        bulk.setdefault(symptom, []).append(variant)
+    start = time.perf_counter()
+    service.add_many(bulk)
+    add_many = time.perf_counter() - start
+    assert service.extract_symptoms(pairs[-1][1]) == matcher.find(matching_form(pairs[-1][1]))
+
+    print(f"{args.variants} variants onto {matcher.term_count - args.variants} existing terms:")
+    print(f"  rebuild per call      {rebuild:8.2f}s")
+    print(f"  add_symptom_variants  {per_call:8.2f}s  ({rebuild / per_call:5.1f}x)")
+    print(f"  add_many              {add_many:8.2f}s  ({rebuild / add_many:5.1f}x)")
+    print(f"  extract_symptoms: {latency_us(service):6.1f}us single automaton, {with_delta:6.1f}us with {pending} delta terms")
+
+
+if __name__ == "__main__":
+    main()
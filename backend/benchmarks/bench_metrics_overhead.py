@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Per-request cost of the pipeline instrumentation.
+
+Replays exactly what one uncached /predict records: six perf_counter
+reads, five stage observations, one end-to-end observation and one model
+path increment. Then runs real /predict pipelines and prints where the
+time went, read back from the stage histograms.
+
+Usage (from backend/):
+    python benchmarks/bench_metrics_overhead.py [--iterations 200000] [--rows 300]
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("PREDICTION_CACHE_SIZE", "0")
+
+from _common import load_texts  # noqa: E402
+
+from app.main import pipeline  # noqa: E402
+from app.pipeline import STAGES  # noqa: E402
+from app.schemas import PredictRequest  # noqa: E402
+from app.services.metrics import PREDICT_SECONDS, PREDICTIONS_BY_PATH, STAGE_SECONDS  # noqa: E402
+
+BUDGET_US = 5.0
+REPEATS = 5
+
+
+def instrumentation_cost(iterations: int) -> float:
+    stages = [STAGE_SECONDS.labels("bench", stage) for stage in STAGES]
+    total = PREDICT_SECONDS.labels("bench")
+    path = PREDICTIONS_BY_PATH.labels("bench")
+    perf_counter = time.perf_counter
+
+    start = perf_counter()
+    for _ in range(iterations):
+        t0 = perf_counter()
+        previous = t0
+        for timer in stages:
+            now = perf_counter()
+            timer.observe(now - previous)
+            previous = now
+        path.inc()
+        total.observe(perf_counter() - t0)
+    instrumented = perf_counter() - start
+
+    start = perf_counter()
+    for _ in range(iterations):
+        for timer in stages:
+            pass
+    loop_only = perf_counter() - start
+    return (instrumented - loop_only) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--rows", type=int, default=300)
+    args = parser.parse_args()
+
+    # Best of several repeats, as timeit does: the minimum is the cost
+    # itself, the rest is scheduler noise.
+    costs = sorted(instrumentation_cost(args.iterations // REPEATS) for _ in range(REPEATS))
+    verdict = "OK" if costs[0] <= BUDGET_US else "OVER"
+    print(
+        f"instrumentation: {costs[0]:.2f}us per request (median {costs[len(costs) // 2]:.2f}us,"
+        f" budget {BUDGET_US:.0f}us) {verdict}"
+    )
+
+    timers = {stage: STAGE_SECONDS.labels("predict", stage) for stage in STAGES}
+    before = {stage: (timer.sum, sum(timer.counts)) for stage, timer in timers.items()}
+    start = time.perf_counter()
+    for text in load_texts(args.rows):
+        pipeline.predict(PredictRequest(text=text))
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.rows} /predict pipelines, {elapsed / args.rows * 1e3:.2f}ms mean")
+    for stage, timer in timers.items():
+        spent = timer.sum - before[stage][0]
+        calls = sum(timer.counts) - before[stage][1]
+        print(f"  {stage:>9} {spent / calls * 1e3:>8.3f}ms mean  {spent / elapsed:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Load time and memory of the legacy pickle vs the .cbm + manifest artifact.
+
+Each format is loaded in a fresh interpreter so import costs (scikit-learn
+for the pickle's LabelEncoder) and RSS are measured from a clean start.
+``import`` is catboost + numpy, paid by both; ``load`` is unpickling, or
+the streaming checksum plus ``CatBoostClassifier.load_model``.
+
+Usage (from backend/):
+    python benchmarks/bench_model_artifact.py [--pickle disease_model_15k.pkl] [--repeat 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from _common import BACKEND_DIR, LEGACY_MODEL_PATH
+
+from app.services.model_artifact import migrate_pickle
+
+_PROBE = r"""
+import json, sys, time
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+
+fmt, path = sys.argv[1], sys.argv[2]
+t0 = time.perf_counter(); base = rss_mb()
+import catboost, numpy
+t1 = time.perf_counter(); imported = rss_mb()
+if fmt == "pickle":
+    import pickle
+    with open(path, "rb") as f:
+        model = pickle.load(f)["model"]
+else:
+    sys.path.insert(0, sys.argv[3])
+    from app.services.model_artifact import load_artifact
+    model, _ = load_artifact(path)
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1e3, "load_ms": (t2 - t1) * 1e3,
+    "rss_mb": rss_mb(), "load_rss_mb": rss_mb() - imported,
+    "sklearn": "sklearn" in sys.modules,
+}))
+"""
+
+
+def probe(fmt: str, path: Path) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE, fmt, str(path), str(BACKEND_DIR)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pickle", default=str(LEGACY_MODEL_PATH))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pickle_path = Path(args.pickle)
+    if not pickle_path.exists():
+        sys.exit(f"{pickle_path} not found; pass --pickle with a legacy model pickle")
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest_path = Path(tmp) / "model.json"
+        manifest = migrate_pickle(pickle_path, manifest_path)
+        print(f"pickle {pickle_path.stat().st_size / 1e6:.1f} MB -> cbm {manifest['model_size'] / 1e6:.1f} MB")
+
+        for fmt, path in (("pickle", pickle_path), ("cbm", manifest_path)):
+            runs = [probe(fmt, path) for _ in range(args.repeat)]
+            print(
+                f"{fmt:>6}: load {statistics.median(r['load_ms'] for r in runs):7.1f}ms"
+                f"  (+import {statistics.median(r['import_ms'] for r in runs):6.1f}ms)"
+                f"  load RSS +{statistics.median(r['load_rss_mb'] for r in runs):6.1f}MB"
+                f"  total RSS {statistics.median(r['rss_mb'] for r in runs):6.1f}MB"
+                f"  sklearn imported: {runs[0]['sklearn']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
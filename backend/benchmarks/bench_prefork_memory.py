@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Per-worker memory of pre-forked vs independently loading workers.
+
+Runs the API with N workers three ways: ``uvicorn --workers N`` (each
+worker imports the app and loads its own model), ``serve_prefork.py``
+(the master loads once, freezes the GC and forks) and the same without
+``gc.freeze()``. After sending some /predict traffic it reads
+/proc/<pid>/smaps_rollup for every worker and reports USS, the memory
+only that worker holds (what adding a worker costs); PSS, which splits
+shared pages among their users; and RSS.
+
+Put the model artifact in place first (disease_model_15k.json + .cbm, or
+the legacy pickle), otherwise every mode serves the rule-based fallback
+and the difference is only the Python heap.
+
+Usage (from backend/, Linux only):
+    python benchmarks/bench_prefork_memory.py [--workers 4] [--requests 200]
+"""
+
+import argparse
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from _common import BACKEND_DIR, load_texts
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _children(pid: int) -> List[int]:
+    found = []
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            found.append(int(stat.parent.name))
+    return found
+
+
+def _is_worker(pid: int) -> bool:
+    try:
+        cmdline = Path(f"/proc/{pid}/cmdline").read_bytes()
+    except OSError:
+        return False
+    return b"resource_tracker" not in cmdline
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    values: Dict[str, int] = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        key, value = line.split(":", 1)
+        values[key] = int(value.split()[0])
+    return {
+        "uss": values["Private_Clean"] + values["Private_Dirty"],
+        "pss": values["Pss"],
+        "rss": values["Rss"],
+    }
+
+
+def measure(mode: str, workers: int, texts: List[str], requests: int, timeout: float) -> List[Dict[str, int]]:
+    port = _free_port()
+    if mode.startswith("prefork"):
+        cmd = [sys.executable, "serve_prefork.py", "--workers", str(workers), "--port", str(port)]
+        if mode == "prefork-nofreeze":
+            cmd.append("--no-gc-freeze")
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--workers", str(workers), "--port", str(port)]
+    cmd += ["--log-level", "warning"]
+    master = subprocess.Popen(cmd, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL)
+    try:
+        deadline = time.perf_counter() + timeout
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=10.0) as client:
+            while True:
+                if time.perf_counter() > deadline:
+                    raise TimeoutError(f"{mode}: server not ready within {timeout}s")
+                try:
+                    if client.post("/predict", json={"text": texts[0]}).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.1)
+            # New connections are spread over the workers by the kernel.
+            for i in range(requests):
+                with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=10.0) as fresh:
+                    fresh.post("/predict", json={"text": texts[i % len(texts)], "language": "en"})
+        time.sleep(0.5)
+        pids = [pid for pid in _children(master.pid) if _is_worker(pid)]
+        return [memory_kb(pid) for pid in pids]
+    finally:
+        master.terminate()
+        master.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    texts = load_texts(500)
+    for mode in ("uvicorn", "prefork-nofreeze", "prefork"):
+        stats = measure(mode, args.workers, texts, args.requests, args.timeout)
+        if not stats:
+            print(f"{mode:>16}: no worker processes found")
+            continue
+        med = {key: statistics.median(s[key] for s in stats) / 1024 for key in ("uss", "pss", "rss")}
+        total_pss = sum(s["pss"] for s in stats) / 1024
+        print(
+            f"{mode:>16}: {len(stats)} workers  per-worker USS {med['uss']:6.1f}MB  "
+            f"PSS {med['pss']:6.1f}MB  RSS {med['rss']:6.1f}MB  (workers' total PSS {total_pss:6.1f}MB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
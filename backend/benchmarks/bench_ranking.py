@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Top-k ranking cost by class count: per-class dicts + full sort vs argpartition.
+
+``sorted`` is the previous ``_rank`` (a dict per class, sorted, first k
+kept), called once per row. ``rank`` is app.services.ranking on the whole
+N x C matrix; ``rank/row`` calls it one row at a time, as /predict does.
+
+Usage (from backend/):
+    python benchmarks/bench_ranking.py [--rows 256] [--k 3]
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+import _common  # noqa: F401  (puts backend/ on sys.path)
+
+from app.services.ranking import rank
+
+
+def sorted_rank(probs: np.ndarray, labels: List[str], k: int):
+    pairs = sorted(
+        [{"disease": str(label), "score": float(prob)} for label, prob in zip(labels, probs)],
+        key=lambda x: x["score"],
+        reverse=True,
+    )
+    best = pairs[0]
+    return str(best["disease"]), float(best["score"]), [{p["disease"]: round(p["score"], 4)} for p in pairs[:k]]
+
+
+def timed(fn: Callable[[], object], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=256)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for classes in (15, 200, 1000):
+        probs = rng.dirichlet(np.ones(classes), size=args.rows).astype(np.float32)
+        labels = [f"Disease {i}" for i in range(classes)]
+        assert rank(probs, labels, args.k) == [sorted_rank(row, labels, args.k) for row in probs]
+
+        results: Dict[str, float] = {
+            "sorted": timed(lambda: [sorted_rank(row, labels, args.k) for row in probs]),
+            "rank/row": timed(lambda: [rank(row, labels, args.k) for row in probs]),
+            "rank": timed(lambda: rank(probs, labels, args.k)),
+        }
+        line = "  ".join(f"{name} {seconds / args.rows * 1e6:8.2f}us/row" for name, seconds in results.items())
+        print(f"{classes:>5} classes: {line}  ({results['sorted'] / results['rank']:5.1f}x batched)")
+
+
+if __name__ == "__main__":
+    main()
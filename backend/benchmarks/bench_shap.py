@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+TreeSHAP explanation latency: cold (every vector computed) vs memoized.
+
+Real request traffic repeats the same few active-symptom vectors, so the
+warm pass replays the same texts against the populated cache. The batch
+pass explains all rows with one ``explain_batch`` call on a cold cache.
+
+Usage (from backend/):
+    python benchmarks/bench_shap.py [--rows 300]
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+from _common import build_model_service, load_texts
+
+from app.services.explainability import IntegratedGradientsExplainer, TreeShapExplainer
+from app.services.nlp_service import BiomedicalNLPService
+
+
+def _percentiles(samples):
+    return statistics.median(samples), statistics.quantiles(samples, n=20)[-1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=300)
+    args = parser.parse_args()
+
+    nlp = BiomedicalNLPService()
+    vectors = [nlp.build_feature_vector(text, {}) for text in load_texts(args.rows)]
+    matrix = np.vstack([features for features, _ in vectors])
+    detected_batch = [detected for _, detected in vectors]
+    distinct = len(np.unique(matrix, axis=0))
+
+    service = build_model_service("catboost")
+    ig = IntegratedGradientsExplainer(service)
+    explainer = TreeShapExplainer(service, fallback=ig)
+
+    print(f"{len(vectors)} requests, {distinct} distinct feature vectors")
+    print(f"{'mode':>12} {'p50':>9} {'p95':>9}")
+
+    timings = {"ig": [], "shap cold": [], "shap warm": []}
+    for features, detected in vectors:
+        start = time.perf_counter()
+        ig.explain(features, detected)
+        timings["ig"].append((time.perf_counter() - start) * 1e3)
+    for label in ("shap cold", "shap warm"):
+        for features, detected in vectors:
+            start = time.perf_counter()
+            explainer.explain(features, detected)
+            timings[label].append((time.perf_counter() - start) * 1e3)
+    for label, samples in timings.items():
+        p50, p95 = _percentiles(samples)
+        print(f"{label:>12} {p50:>7.2f}ms {p95:>7.2f}ms")
+
+    explainer.cache.clear()
+    start = time.perf_counter()
+    explainer.explain_batch(matrix, detected_batch)
+    batch_ms = (time.perf_counter() - start) * 1e3
+    print(f"{'shap batch':>12} {batch_ms:>7.1f}ms total, {batch_ms / len(vectors):.2f}ms/request")
+    print(f"cache: {explainer.cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
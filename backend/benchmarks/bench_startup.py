@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Time from launching the API process to its first successful /predict.
+
+Starts ``uvicorn app.main:app`` on a free port, polls /predict until it
+answers 200, then prints the elapsed wall time next to the server's own
+/debug/startup timeline. Repeated runs report the median.
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from _common import BACKEND_DIR
+
+PAYLOAD = {"text": "I have fever and cough since 2 days", "language": "en", "symptom_intensity": {}}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_once(timeout: float) -> dict:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=url, timeout=5.0) as client:
+            while True:
+                if time.perf_counter() - started > timeout:
+                    raise TimeoutError(f"no successful /predict within {timeout}s")
+                if server.poll() is not None:
+                    raise RuntimeError(f"server exited with {server.returncode}")
+                try:
+                    if client.post("/predict", json=PAYLOAD).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+            first_predict = time.perf_counter() - started
+            response = client.get("/debug/startup")
+            timeline = response.json() if response.status_code == 200 else {}
+    finally:
+        server.terminate()
+        server.wait()
+    return {"first_predict_ms": first_predict * 1000, "timeline": timeline}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    results = [run_once(args.timeout) for _ in range(args.runs)]
+    for i, result in enumerate(results, 1):
+        timeline = result["timeline"]
+        phases = "  ".join(f"{p['name']}={p['duration_ms']:.0f}" for p in timeline.get("phases", []))
+        print(
+            f"run {i}: first /predict {result['first_predict_ms']:7.0f}ms  "
+            f"boot={timeline.get('process_boot_ms')}  {phases}  (model: {(timeline.get('model') or {}).get('kind')})"
+        )
+    print(f"median time to first successful /predict: {statistics.median(r['first_predict_ms'] for r in results):.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+/predict/stream throughput and server memory as the upload grows.
+
+Starts ``uvicorn app.main:app`` on a free port and streams JSON Lines
+uploads of increasing size to /predict/stream, reading the NDJSON results
+as they arrive. While each upload runs, the server's RSS is sampled; it
+should stay flat however many rows are sent. Records are padded
+(``--pad-bytes``) so the upload is far larger than the socket buffers,
+and "ahead" reports how many rows the client had sent beyond the results
+it had read: it stays bounded because the server stops reading the upload
+while its results are not being read. ``--read-delay`` sleeps per result
+line to simulate a slow reader.
+
+Usage (from backend/, Linux only):
+    python benchmarks/bench_stream.py [--rows 2000 10000] [--pad-bytes 4096] [--read-delay 0]
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Tuple
+
+import httpx
+
+from _common import BACKEND_DIR, load_texts
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _chunks(texts: List[str], rows: int, pad: int, per_chunk: int = 50) -> Iterator[Tuple[int, bytes]]:
+    # "note" is not a request field; it only makes the upload larger than the socket buffers.
+    note = "x" * pad
+    for first in range(0, rows, per_chunk):
+        count = min(per_chunk, rows - first)
+        records = (json.dumps({"text": texts[i % len(texts)], "note": note}) for i in range(first, first + count))
+        yield count, "".join(record + "\n" for record in records).encode()
+
+
+def _read_chunked(stream) -> Iterator[bytes]:
+    """Body chunks of a chunked HTTP/1.1 response."""
+    while True:
+        size = int(stream.readline().split(b";")[0], 16)
+        if size == 0:
+            stream.readline()
+            return
+        data = stream.read(size)
+        stream.readline()
+        yield data
+
+
+def run(port: int, pid: int, texts: List[str], rows: int, pad: int, read_delay: float) -> Dict[str, float]:
+    """
+    Upload on one thread while reading results on this one.
+
+    A plain socket client, since httpx sends the whole request body before
+    reading any of the response.
+    """
+    samples: List[float] = []
+    sent = [0]
+    stop = threading.Event()
+
+    def sample() -> None:
+        while not stop.is_set():
+            samples.append(_rss_mb(pid))
+            time.sleep(0.05)
+
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.sendall(
+        b"POST /predict/stream HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+        b"Content-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n"
+    )
+
+    def send() -> None:
+        for count, body in _chunks(texts, rows, pad):
+            sock.sendall(b"%x\r\n%s\r\n" % (len(body), body))
+            sent[0] += count
+        sock.sendall(b"0\r\n\r\n")
+
+    threads = [threading.Thread(target=sample, daemon=True), threading.Thread(target=send, daemon=True)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    received = ahead = 0
+    stream = sock.makefile("rb")
+    try:
+        status = stream.readline()
+        if b" 200 " not in status:
+            raise RuntimeError(f"unexpected response: {status!r}")
+        while stream.readline() not in (b"\r\n", b""):
+            pass
+        pending = b""
+        for data in _read_chunked(stream):
+            pending += data
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if line.startswith(b'{"summary"'):
+                    continue
+                received += 1
+                ahead = max(ahead, sent[0] - received)
+                if read_delay:
+                    time.sleep(read_delay)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=30)
+        sock.close()
+    elapsed = time.perf_counter() - start
+    return {"rows/s": received / elapsed, "rss_peak_mb": max(samples), "rss_start_mb": samples[0], "max_ahead": ahead}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[2000, 10000])
+    parser.add_argument("--pad-bytes", type=int, default=4096, help="filler per uploaded record")
+    parser.add_argument("--read-delay", type=float, default=0.0, help="seconds to sleep per result line")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    texts = load_texts(500)
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PREDICTION_CACHE_SIZE": "0"},
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.perf_counter() + args.timeout
+        while True:
+            try:
+                if httpx.get(f"{url}/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                if time.perf_counter() > deadline:
+                    raise TimeoutError(f"server not ready within {args.timeout}s")
+                time.sleep(0.1)
+        for rows in args.rows:
+            result = run(port, server.pid, texts, rows, args.pad_bytes, args.read_delay)
+            print(
+                f"{rows:>7} rows: {result['rows/s']:7.0f} rows/s  server RSS {result['rss_start_mb']:6.1f}MB"
+                f" -> peak {result['rss_peak_mb']:6.1f}MB  upload ahead of results: at most {result['max_ahead']} rows"
+            )
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
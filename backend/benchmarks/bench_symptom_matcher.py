@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Symptom extraction latency as the synonym table grows: regex loop vs SymptomMatcher.
+
+Usage (from backend/):
+    python benchmarks/bench_symptom_matcher.py
+"""
+
+import random
+import re
+import string
+import time
+
+import _common  # noqa: F401  (puts backend/ on sys.path)
+
+from app.services.symptom_catalog import SYMPTOM_SYNONYMS, SYMPTOMS
+from app.services.symptom_matcher import SymptomMatcher
+
+TEXTS = [
+    "i have had fever and cough since two days with body ache",
+    "mujhe bukhar aur khansi hai, sar dard bhi",
+    "सर दर्द और बुखार, थकान",
+    "itching rash sneezing watery eyes and hives",
+    "headache dizziness blurred vision chest pain",
+]
+
+
+def grow_synonyms(total: int, seed: int = 7) -> dict:
+    """Pad the catalog synonyms with synthetic terms up to ``total`` terms."""
+    rng = random.Random(seed)
+    synonyms = {symptom: list(terms) for symptom, terms in SYMPTOM_SYNONYMS.items()}
+    count = sum(len(terms) for terms in synonyms.values())
+    while count < total:
+        symptom = rng.choice(SYMPTOMS)
+        if rng.random() < 0.7:
+            term = " ".join(
+                "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(rng.randint(1, 2))
+            )
+        else:
+            term = "".join(chr(rng.randint(0x0915, 0x0939)) for _ in range(rng.randint(3, 6)))
+        synonyms.setdefault(symptom, []).append(term)
+        count += 1
+    return synonyms
+
+
+def compile_regex_loop(synonyms: dict) -> dict:
+    compiled = {}
+    for symptom, terms in synonyms.items():
+        patterns = []
+        for term in terms:
+            escaped = re.escape(term.lower())
+            patterns.append(re.compile(rf"\b{escaped}\b" if term.isascii() else escaped))
+        compiled[symptom] = patterns
+    return compiled
+
+
+def regex_extract(compiled: dict, text: str) -> list:
+    hits = []
+    for symptom in SYMPTOMS:
+        for pattern in compiled.get(symptom, []):
+            if pattern.search(text):
+                hits.append(symptom)
+                break
+    return hits
+
+
+def per_call_us(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in TEXTS:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(TEXTS)) * 1e6
+
+
+def main() -> None:
+    print(f"{'terms':>7} {'regex loop (us)':>16} {'matcher (us)':>13} {'speedup':>8} {'build (ms)':>11}")
+    for total in (150, 500, 1000, 2500, 5000, 10000):
+        synonyms = grow_synonyms(total)
+        compiled = compile_regex_loop(synonyms)
+
+        start = time.perf_counter()
+        matcher = SymptomMatcher(synonyms)
+        build_ms = (time.perf_counter() - start) * 1e3
+
+        for text in TEXTS:
+            assert matcher.find(text) == regex_extract(compiled, text)
+
+        repeat = max(5, 20000 // total)
+        regex_us = per_call_us(lambda t: regex_extract(compiled, t), repeat)
+        matcher_us = per_call_us(matcher.find, repeat)
+        print(f"{matcher.term_count:>7} {regex_us:>16.1f} {matcher_us:>13.1f} {regex_us / matcher_us:>7.1f}x {build_ms:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
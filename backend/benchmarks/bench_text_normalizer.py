@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Cost of the normalization stage: previous lowercase+whitespace vs NFKC, diacritics and romanization folding.
+
+Times normalize_text alone and the whole extract_symptoms call over
+dataset texts, plus the fold memo's hit rate, and counts romanized
+variant spellings ("bukhaar", "sardard", ...) that only the normalized
+matcher finds.
+
+Usage (from backend/):
+    python benchmarks/bench_text_normalizer.py [--rows 5000]
+"""
+
+import argparse
+import re
+import time
+from typing import Callable, List
+
+import _common
+
+from app.services.nlp_service import BiomedicalNLPService
+from app.services.symptom_catalog import SYMPTOM_SYNONYMS
+from app.services.symptom_matcher import SymptomMatcher
+from app.services.text_normalizer import _ROMAN_WORD, fold_word, matching_form, normalize_text
+
+VARIANTS = [
+    "mujhe bukhaar hai",
+    "sardard ho raha hai",
+    "khaansi aur thakaan",
+    "petdard since morning",
+    "ｆｅｖｅｒ and ｃｏｕｇｈ",
+    "bahut zyada ulti",
+]
+
+
+def previous_normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text.lower().strip())
+
+
+def unmemoized_form(text: str) -> str:
+    return _ROMAN_WORD.sub(lambda m: fold_word.__wrapped__(m.group()), normalize_text(text))
+
+
+def per_call_us(fn: Callable[[str], object], texts: List[str], repeat: int = 3) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+    texts = _common.load_texts(args.rows)
+
+    raw = SymptomMatcher(SYMPTOM_SYNONYMS)
+    service = BiomedicalNLPService()
+
+    fold_word.cache_clear()
+    cold = per_call_us(matching_form, texts, repeat=1)
+    info = fold_word.cache_info()
+    print(f"{len(texts)} texts, fold memo: {info.currsize} words, hit rate {info.hits / (info.hits + info.misses):.1%}")
+    print(f"{'stage':<40} {'us/call':>8}")
+    print(f"{'previous normalize_text':<40} {per_call_us(previous_normalize, texts):>8.1f}")
+    print(f"{'normalize_text':<40} {per_call_us(normalize_text, texts):>8.1f}")
+    print(f"{'normalize_text + fold (no memo)':<40} {per_call_us(unmemoized_form, texts):>8.1f}")
+    print(f"{'normalize_text + fold (cold memo)':<40} {cold:>8.1f}")
+    print(f"{'normalize_text + fold (warm memo)':<40} {per_call_us(matching_form, texts):>8.1f}")
+    print(f"{'extract_symptoms, previous':<40} {per_call_us(lambda t: raw.find(previous_normalize(t)), texts):>8.1f}")
+    print(f"{'extract_symptoms, normalized':<40} {per_call_us(service.extract_symptoms, texts):>8.1f}")
+
+    changed = sum(raw.find(previous_normalize(t)) != service.extract_symptoms(t) for t in texts)
+    print(f"dataset texts whose detected symptoms changed: {changed}")
+    for text in VARIANTS:
+        print(f"  {text!r:<28} previous {raw.find(previous_normalize(text))}, now {service.extract_symptoms(text)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Parity and latency of the NumPy oblivious-tree evaluator against CatBoost.
+
+Uses disease_model_15k.pkl when present, otherwise trains one with
+ModelRetrainer on data/training_data_15k.csv.
+
+Usage (from backend/):
+    python benchmarks/bench_tree_evaluator.py [--model disease_model_15k.pkl]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from _common import DEFAULT_MODEL_PATH, load_model_artifact, load_training_frame
+
+from app.services.tree_evaluator import ObliviousTreeEvaluator
+
+
+def per_call_us(fn, rows: np.ndarray, repeat: int) -> float:
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(rows[i % len(rows)][None, :])
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default=str(DEFAULT_MODEL_PATH))
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    df = load_training_frame()
+    artifact = load_model_artifact(Path(args.model))
+    model, feature_columns = artifact["model"], artifact["feature_columns"]
+    X = df[feature_columns].values.astype(np.float32)
+
+    start = time.perf_counter()
+    evaluator = ObliviousTreeEvaluator.from_catboost(model)
+    export_ms = (time.perf_counter() - start) * 1e3
+    print(f"trees={evaluator.n_trees} depth={evaluator.depth} classes={evaluator.n_dims} export={export_ms:.1f}ms")
+
+    start = time.perf_counter()
+    expected = model.predict_proba(X)
+    catboost_batch = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = evaluator.predict_proba(X)
+    numpy_batch = time.perf_counter() - start
+
+    max_diff = float(np.abs(expected - actual).max())
+    print(f"parity on {len(X)} rows: max |p_catboost - p_numpy| = {max_diff:.2e} ({'OK' if max_diff < 1e-6 else 'FAIL'})")
+
+    catboost_single = per_call_us(model.predict_proba, X, args.repeat)
+    numpy_single = per_call_us(evaluator.predict_proba, X, args.repeat)
+    print(f"single row : catboost {catboost_single:8.1f}us   numpy {numpy_single:8.1f}us   ({catboost_single / numpy_single:.1f}x)")
+    print(f"{len(X)} rows : catboost {catboost_batch * 1e3:8.1f}ms   numpy {numpy_batch * 1e3:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
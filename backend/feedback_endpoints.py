@@ -3,13 +3,17 @@ FastAPI endpoints for feedback collection
 Add these endpoints to the main app
 """
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, Optional
 from datetime import datetime
-import json
 from pathlib import Path
 
+from app.config import settings
+from app.services.feedback_store import FeedbackNotSaved, FeedbackQueueFull, FeedbackStore
+
 router = APIRouter(prefix="/feedback", tags=["Feedback"])
 
 # Models for feedback
@@ -32,12 +36,17 @@ class BugReport(BaseModel):
     steps_to_reproduce: Optional[str] = None
     device_info: Optional[str] = None
 
-# In-memory storage (use database in production)
-feedback_data = {
-    "predictions": [],
-    "features": [],
-    "bugs": []
-}
+# Append-only SQLite store; handlers enqueue and a writer thread commits
+feedback_store = FeedbackStore(settings.feedback_db_path)
+
+LEGACY_FEEDBACK_FILE = Path("feedback_data.json")
+if LEGACY_FEEDBACK_FILE.exists() and not any(feedback_store.stats()["counts"].values()):
+    print(f"✓ Imported {feedback_store.import_json(LEGACY_FEEDBACK_FILE)} entries from {LEGACY_FEEDBACK_FILE}")
+
+
+@router.on_event("shutdown")
+def _close_feedback_store() -> None:
+    feedback_store.close()
 
 @router.post("/prediction")
 async def submit_prediction_feedback(feedback: PredictionFeedback):
@@ -59,15 +68,12 @@ async def submit_prediction_feedback(feedback: PredictionFeedback):
         "timestamp": datetime.now().isoformat(),
         **feedback.dict()
     }
-    feedback_data["predictions"].append(entry)
-    
-    # Save to file
-    _save_feedback_to_file()
+    seq = await _append("predictions", entry)
     
     return {
         "status": "success",
         "message": "Thank you for your feedback! This helps us improve the model.",
-        "feedback_id": f"fb_{len(feedback_data['predictions'])}"
+        "feedback_id": f"fb_{seq}"
     }
 
 @router.post("/feature-request")
@@ -88,8 +94,7 @@ async def submit_feature_request(request: FeatureRequest):
         **request.dict(),
         "votes": 1
     }
-    feedback_data["features"].append(entry)
-    _save_feedback_to_file()
+    await _append("features", entry)
     
     return {
         "status": "success",
@@ -116,44 +121,41 @@ async def submit_bug_report(report: BugReport):
         **report.dict(),
         "status": "new"
     }
-    feedback_data["bugs"].append(entry)
-    _save_feedback_to_file()
+    seq = await _append("bugs", entry)
     
     return {
         "status": "success",
         "message": "Bug report submitted. Thank you for helping us improve!",
-        "ticket_id": f"bug_{len(feedback_data['bugs'])}"
+        "ticket_id": f"bug_{seq}"
     }
 
 @router.get("/stats")
 async def get_feedback_stats():
     """Get feedback statistics (admin endpoint)"""
     
-    # Calculate accuracy from prediction feedback
-    predictions = feedback_data["predictions"]
-    if predictions:
-        correct = sum(1 for p in predictions 
-                     if p["actual_disease"].lower() == p["predicted_disease"].lower())
-        accuracy = (correct / len(predictions)) * 100
+    # Calculate accuracy from prediction feedback (counters kept by the store)
+    stats = feedback_store.stats()
+    counts = stats["counts"]
+    if counts["predictions"]:
+        accuracy = (stats["correct_predictions"] / counts["predictions"]) * 100
     else:
         accuracy = 0
     
     return {
-        "total_predictions_feedback": len(predictions),
+        "total_predictions_feedback": counts["predictions"],
         "model_accuracy_from_feedback": f"{accuracy:.1f}%",
-        "total_feature_requests": len(feedback_data["features"]),
-        "total_bug_reports": len(feedback_data["bugs"]),
+        "total_feature_requests": counts["features"],
+        "total_bug_reports": counts["bugs"],
+        "pending_writes": stats["pending"],
         "last_updated": datetime.now().isoformat()
     }
 
-def _save_feedback_to_file():
-    """Save feedback to JSON file"""
-    feedback_file = Path("feedback_data.json")
+async def _append(kind: str, entry: Dict[str, Any]) -> int:
+    """Queue an entry for the writer thread and wait for its sequence number."""
     try:
-        with open(feedback_file, 'w') as f:
-            json.dump(feedback_data, f, indent=2)
-    except Exception as e:
-        print(f"Error saving feedback: {e}")
+        return await asyncio.wrap_future(feedback_store.append(kind, entry))
+    except (FeedbackQueueFull, FeedbackNotSaved) as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 # Usage in main.py:
 # from .feedback_endpoints import router as feedback_router
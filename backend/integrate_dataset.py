@@ -3,23 +3,77 @@ Integration script for large merged symptom dataset (15000 records).
 Analyzes, processes, and integrates the dataset into the system.
 """
 
+import argparse
+import numpy as np
 import pandas as pd
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from collections import Counter, defaultdict
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Optional, Sequence, Tuple, Set
+
+from app.services.feature_cache import write_feature_cache
+from app.services.symptom_catalog import DATASET_KEYWORDS
+
+# Rows per process-pool task in keyword_matrix
+SHARD_ROWS = 50000
+
+
+def _keyword_matrix_shard(texts: List[str], keywords: Sequence[str]) -> np.ndarray:
+    # One lower-cased string for the shard; each keyword is found with one
+    # regex scan over it and its hits mapped back to rows by offset.
+    # Keywords never contain the separator, so a hit cannot span two rows.
+    lowered = "\x00".join(texts).lower()
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    if len(lowered) != int(lengths.sum()) + max(len(texts) - 1, 0):
+        # Some character changed length when lower-cased (e.g. "İ")
+        texts = [text.lower() for text in texts]
+        lowered = "\x00".join(texts)
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+
+    matrix = np.zeros((len(texts), len(keywords)), dtype=bool)
+    for j, keyword in enumerate(keywords):
+        hits = np.fromiter(
+            (match.start() for match in re.finditer(re.escape(keyword.lower()), lowered)), dtype=np.int64
+        )
+        if hits.size:
+            matrix[np.searchsorted(starts, hits, side="right") - 1, j] = True
+    return matrix
+
+
+def keyword_matrix(
+    texts: Sequence[str], keywords: Sequence[str] = DATASET_KEYWORDS, workers: int = 0
+) -> np.ndarray:
+    """
+    Binary (rows x keywords) matrix: True where the keyword occurs in the
+    lower-cased text, as ``DatasetIntegration.extract_symptoms_from_text``
+    decides per row. Missing texts match nothing.
+
+    With ``workers`` > 0 the rows are split into shards of ``SHARD_ROWS``
+    scanned on a process pool.
+    """
+    texts = ["" if not isinstance(text, str) else text for text in texts]
+    keywords = list(keywords)
+    if workers <= 0 or len(texts) <= SHARD_ROWS:
+        return _keyword_matrix_shard(texts, keywords)
+    shards = [texts[start : start + SHARD_ROWS] for start in range(0, len(texts), SHARD_ROWS)]
+    with ProcessPoolExecutor(workers) as pool:
+        return np.vstack(list(pool.map(_keyword_matrix_shard, shards, [keywords] * len(shards))))
 
 
 class DatasetIntegration:
     """Integrate and analyze large symptom dataset."""
 
-    def __init__(self, dataset_path: str, data_dir: str = "data"):
+    def __init__(self, dataset_path: str, data_dir: str = "data", workers: int = 0):
         self.dataset_path = Path(dataset_path)
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
+        self.workers = workers
         self.df = None
         self.disease_symptom_map: Dict[str, Set[str]] = defaultdict(set)
+        self._keyword_matrix: Optional[np.ndarray] = None
 
     def load_dataset(self) -> pd.DataFrame:
         """Load the merged dataset."""
@@ -27,6 +81,7 @@ class DatasetIntegration:
         self.df = pd.read_csv(self.dataset_path)
         print(f"✓ Loaded {len(self.df)} records")
         print(f"✓ Columns: {list(self.df.columns)}")
+        self._keyword_matrix = None
         return self.df
 
     def get_statistics(self) -> Dict:
@@ -53,27 +108,26 @@ class DatasetIntegration:
         Extract symptom terms from text.
         Uses common symptom keywords.
         """
-        symptom_keywords = [
-            'fever', 'cough', 'cold', 'flu', 'pain', 'ache', 'headache',
-            'nausea', 'vomiting', 'diarrhea', 'weakness', 'fatigue',
-            'dizziness', 'shortness of breath', 'rash', 'itching',
-            'sneezing', 'runny nose', 'eye', 'vision', 'weight loss',
-            'thirst', 'chills', 'joint', 'chest', 'stomach', 'blurred',
-            'discomfort', 'sensitivity', 'skin', 'discharge', 'sweating',
-            'loss of appetite', 'high fever', 'dry', 'productive', 'wheezing',
-            'tightness', 'throat', 'congestion', 'inflammation', 'swelling',
-            'bleeding', 'red', 'tender', 'stiff', 'numb', 'tingling'
-        ]
-        
         text_lower = text.lower()
         found = []
         
-        for keyword in symptom_keywords:
+        for keyword in DATASET_KEYWORDS:
             if keyword in text_lower:
                 found.append(keyword)
         
         return found
 
+    def keyword_matrix(self) -> np.ndarray:
+        """
+        ``keyword_matrix`` of the loaded texts against ``DATASET_KEYWORDS``,
+        extracted once and shared by the matrix and training-set builders.
+        """
+        if self.df is None:
+            self.load_dataset()
+        if self._keyword_matrix is None:
+            self._keyword_matrix = keyword_matrix(self.df['text'].tolist(), DATASET_KEYWORDS, self.workers)
+        return self._keyword_matrix
+
     def build_disease_symptom_matrix(self) -> Tuple[pd.DataFrame, Dict[str, float]]:
         """
         Build disease-symptom mapping with weights.
@@ -84,21 +138,22 @@ class DatasetIntegration:
         if self.df is None:
             self.load_dataset()
 
-        disease_symptom_records = []
+        matrix = self.keyword_matrix()
+        keywords = np.array(DATASET_KEYWORDS, dtype=object)
+        # Row-major, so records come out in the same order as a row-by-row scan
+        rows, cols = np.nonzero(matrix)
+        diseases = self.df['disease'].to_numpy(dtype=object)[rows]
+        disease_symptom_records = {'disease': diseases, 'symptom': keywords[cols]} if len(rows) else []
+
+        for disease, symptom in set(zip(diseases.tolist(), keywords[cols].tolist())):
+            self.disease_symptom_map[disease].add(symptom)
+
+        # Counted in order of first appearance, as a Counter fed row by row is
         symptom_counts = Counter()
-        
-        for _, row in self.df.iterrows():
-            disease = row['disease']
-            text = row['text']
-            symptoms = self.extract_symptoms_from_text(text)
-            
-            for symptom in symptoms:
-                self.disease_symptom_map[disease].add(symptom)
-                symptom_counts[symptom] += 1
-                disease_symptom_records.append({
-                    'disease': disease,
-                    'symptom': symptom,
-                })
+        seen, first = np.unique(cols, return_index=True)
+        counts = matrix.sum(axis=0)
+        for col in seen[np.argsort(first)].tolist():
+            symptom_counts[DATASET_KEYWORDS[col]] = int(counts[col])
         
         # Convert to DataFrame
         disease_symptom_df = pd.DataFrame(disease_symptom_records)
@@ -135,24 +190,17 @@ class DatasetIntegration:
         print(f"  {', '.join(all_symptoms[:20])}...")
         
         # Create feature vectors
-        training_records = []
+        matrix = self.keyword_matrix()
+        columns = {DATASET_KEYWORDS.index(symptom): symptom for symptom in all_symptoms}
+        training_records = {
+            'patient_id': [f'P{idx:05d}' for idx in self.df.index],
+            'disease': self.df['disease'].to_numpy(),
+            'text': self.df['text'].str[:100].to_numpy(),  # First 100 chars
+        }
         
-        for idx, row in self.df.iterrows():
-            disease = row['disease']
-            text = row['text']
-            symptoms = set(self.extract_symptoms_from_text(text))
-            
-            record = {
-                'patient_id': f'P{idx:05d}',
-                'disease': disease,
-                'text': text[:100],  # First 100 chars
-            }
-            
-            # Add binary features for each symptom
-            for symptom in all_symptoms:
-                record[symptom] = 1.0 if symptom in symptoms else 0.0
-            
-            training_records.append(record)
+        # Add binary features for each symptom
+        for col, symptom in columns.items():
+            training_records[symptom] = matrix[:, col].astype(float)
         
         training_df = pd.DataFrame(training_records)
         print(f"\n✓ Created training dataset with {len(training_df)} records")
@@ -202,6 +250,11 @@ class DatasetIntegration:
         train_csv = self.data_dir / 'training_data_15k.csv'
         training_df.to_csv(train_csv, index=False)
         print(f"✓ Saved training data to {train_csv}")
+        feature_columns = training_df.columns[3:].tolist()
+        schema = write_feature_cache(
+            train_csv, training_df[feature_columns].to_numpy(np.float32), training_df['disease'].tolist(), feature_columns
+        )
+        print(f"✓ Saved feature cache to {schema['features_file']} ({schema['rows']} x {len(feature_columns)})")
         
         # 3. Save updated catalog
         catalog = self.update_symptom_catalog()
@@ -249,19 +302,19 @@ class DatasetIntegration:
         
         print(f"\nProcessed Datasets:")
         print(f"  ✓ disease_symptom_matrix_15k.csv")
-        print(f"  ✓ training_data_15k.csv")
+        print(f"  ✓ training_data_15k.csv (+ .features.npy, .labels.npy, .schema.json)")
         print(f"  ✓ expanded_symptom_catalog.json")
         print(f"  ✓ dataset_statistics.json")
         print("\n" + "="*80)
 
 
 if __name__ == "__main__":
-    import sys
-    
-    dataset_path = sys.argv[1] if len(sys.argv) > 1 else \
-        "merged_symptom_dataset_15000.csv"
+    parser = argparse.ArgumentParser(description="Integrate a merged symptom dataset into the system.")
+    parser.add_argument("dataset_path", nargs="?", default="merged_symptom_dataset_15000.csv")
+    parser.add_argument("--workers", type=int, default=0, help="processes for keyword extraction (0: in-process)")
+    args = parser.parse_args()
     
-    integrator = DatasetIntegration(dataset_path, "data")
+    integrator = DatasetIntegration(args.dataset_path, "data", workers=args.workers)
     integrator.load_dataset()
     
     # Print statistics
@@ -0,0 +1,278 @@
+"""
+Concurrent load generator for the Symptom Checker API.
+
+Two modes:
+- closed loop (``--concurrency N``): N virtual users, each sends its next
+  request as soon as the previous one completes;
+- open loop (``--rps R``): requests are scheduled at a fixed rate whatever
+  the server does. Latency is measured from the scheduled send time, so a
+  stalled server shows up in the percentiles instead of silently lowering
+  the offered load (coordinated omission).
+
+Payloads are drawn from data/merged_symptom_dataset_15000.csv and all
+requests share one pooled ``httpx.AsyncClient``.
+
+Usage:
+    python load_test.py --concurrency 16 --duration 30
+    python load_test.py --rps 200 --duration 60 --output load_test_results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import math
+import random
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+DATASET_PATH = Path(__file__).resolve().parent / "data" / "merged_symptom_dataset_15000.csv"
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of integer microsecond latencies.
+
+    Values below ``2 * sub_buckets`` are stored exactly; above that every
+    power-of-two range is split into ``sub_buckets`` linear buckets, so
+    any recorded value is reported within ``1 / sub_buckets`` of itself
+    (under 1% with the default 128) at a fixed memory cost.
+    """
+
+    def __init__(self, sub_buckets: int = 128) -> None:
+        if sub_buckets & (sub_buckets - 1):
+            raise ValueError("sub_buckets must be a power of two")
+        self.sub_buckets = sub_buckets
+        self._sub_bits = sub_buckets.bit_length() - 1
+        self.counts: Counter = Counter()
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+        self._sum = 0
+
+    def _index(self, value: int) -> int:
+        if value < 2 * self.sub_buckets:
+            return value
+        shift = value.bit_length() - self._sub_bits - 1
+        return 2 * self.sub_buckets + (shift - 1) * self.sub_buckets + ((value >> shift) - self.sub_buckets)
+
+    def _highest_equivalent(self, index: int) -> int:
+        if index < 2 * self.sub_buckets:
+            return index
+        shift, offset = divmod(index - 2 * self.sub_buckets, self.sub_buckets)
+        shift += 1
+        return ((self.sub_buckets + offset) << shift) + (1 << shift) - 1
+
+    def record(self, value_us: int) -> None:
+        value_us = max(0, int(value_us))
+        self.counts[self._index(value_us)] += 1
+        self.total += 1
+        self._sum += value_us
+        self.min = value_us if self.min is None else min(self.min, value_us)
+        self.max = max(self.max, value_us)
+
+    def percentile(self, pct: float) -> int:
+        if not self.total:
+            return 0
+        rank = max(1, math.ceil(pct / 100.0 * self.total))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.total if self.total else 0.0
+
+    def summary_ms(self) -> Dict[str, float]:
+        summary = {f"p{pct:g}": self.percentile(pct) / 1000.0 for pct in PERCENTILES}
+        summary.update(
+            {
+                "min": (self.min or 0) / 1000.0,
+                "mean": round(self.mean / 1000.0, 3),
+                "max": self.max / 1000.0,
+            }
+        )
+        return summary
+
+
+def load_payloads(path: Path = DATASET_PATH, limit: Optional[int] = None, seed: int = 42) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        texts = [row["text"] for row in csv.DictReader(f) if row.get("text")]
+    random.Random(seed).shuffle(texts)
+    if limit:
+        texts = texts[:limit]
+    return [{"text": text, "language": "en", "symptom_intensity": {}} for text in texts]
+
+
+class LoadTest:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        payloads: List[Dict[str, Any]],
+        endpoint: str = "/predict",
+        duration: float = 30.0,
+        warmup: float = 0.0,
+    ) -> None:
+        if not payloads:
+            raise ValueError("No payloads to send")
+        self.client = client
+        self.payloads = payloads
+        self.endpoint = endpoint
+        self.duration = duration
+        self.warmup = warmup
+        self.histogram = LatencyHistogram()
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+        self._next_payload = 0
+        self._measure_from = 0.0
+
+    def _payload(self) -> Dict[str, Any]:
+        payload = self.payloads[self._next_payload % len(self.payloads)]
+        self._next_payload += 1
+        return payload
+
+    async def _send(self, intended_start: float) -> None:
+        payload = self._payload()
+        error: Optional[str] = None
+        try:
+            response = await self.client.post(self.endpoint, json=payload)
+            status = str(response.status_code)
+            if response.status_code >= 400:
+                error = f"HTTP {response.status_code}"
+        except httpx.HTTPError as e:
+            status = "exception"
+            error = type(e).__name__
+        finished = time.perf_counter()
+
+        if intended_start < self._measure_from:
+            return  # warm-up request
+        self.statuses[status] += 1
+        if error:
+            self.errors[error] += 1
+        else:
+            self.histogram.record(int((finished - intended_start) * 1e6))
+
+    async def run_closed(self, concurrency: int) -> Dict[str, Any]:
+        start = time.perf_counter()
+        self._measure_from = start + self.warmup
+        deadline = self._measure_from + self.duration
+
+        async def user() -> None:
+            while time.perf_counter() < deadline:
+                await self._send(time.perf_counter())
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        return self._report("closed", {"concurrency": concurrency}, time.perf_counter() - self._measure_from)
+
+    async def run_open(self, rps: float, max_inflight: int = 1000) -> Dict[str, Any]:
+        interval = 1.0 / rps
+        slots = asyncio.Semaphore(max_inflight)
+        tasks = set()
+        start = time.perf_counter()
+        self._measure_from = start + self.warmup
+        deadline = self._measure_from + self.duration
+
+        async def fire(intended_start: float) -> None:
+            # Waiting for a slot counts towards latency: it is queueing the
+            # client would not do if the server kept up.
+            async with slots:
+                await self._send(intended_start)
+
+        scheduled = 0
+        while True:
+            intended_start = start + scheduled * interval
+            if intended_start >= deadline:
+                break
+            delay = intended_start - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(fire(intended_start))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            scheduled += 1
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        return self._report("open", {"target_rps": rps, "max_inflight": max_inflight}, time.perf_counter() - self._measure_from)
+
+    def _report(self, mode: str, settings: Dict[str, Any], elapsed: float) -> Dict[str, Any]:
+        completed = sum(self.statuses.values())
+        failed = sum(self.errors.values())
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "mode": mode,
+            "endpoint": self.endpoint,
+            **settings,
+            "duration_s": round(elapsed, 3),
+            "requests": completed,
+            "errors": failed,
+            "error_rate": round(failed / completed, 4) if completed else 0.0,
+            "throughput_rps": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+            "latency_ms": self.histogram.summary_ms(),
+            "status_codes": dict(self.statuses),
+            "error_types": dict(self.errors),
+        }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print("\n" + "=" * 70)
+    print(f"📊 LOAD TEST ({report['mode']} loop, {report['endpoint']})")
+    print("=" * 70)
+    print(f"\n🚀 Throughput: {report['throughput_rps']:.1f} req/s over {report['duration_s']:.1f}s")
+    print(f"✓ Requests: {report['requests']}  ✗ Errors: {report['errors']} ({report['error_rate']:.2%})")
+    print("\n⏱️  Latency:")
+    for key, value in report["latency_ms"].items():
+        print(f"   {key:>6}: {value:.2f}ms")
+    if report["error_types"]:
+        print(f"\n⚠️  Error types: {report['error_types']}")
+    print("\n" + "=" * 70)
+
+
+async def _main(args: argparse.Namespace) -> Dict[str, Any]:
+    payloads = load_payloads(limit=args.payloads)
+    pool = args.concurrency or min(args.max_inflight, 256)
+    limits = httpx.Limits(max_connections=pool, max_keepalive_connections=pool)
+    async with httpx.AsyncClient(base_url=args.api_url, limits=limits, timeout=args.timeout) as client:
+        test = LoadTest(client, payloads, args.endpoint, args.duration, args.warmup)
+        if args.rps:
+            return await test.run_open(args.rps, args.max_inflight)
+        return await test.run_closed(args.concurrency)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent load generator for the Symptom Checker API")
+    parser.add_argument("--api-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--endpoint", default="/predict")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--concurrency", type=int, help="closed loop: number of concurrent users")
+    mode.add_argument("--rps", type=float, help="open loop: target requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds excluded from the report")
+    parser.add_argument("--max-inflight", type=int, default=1000, help="open loop: cap on outstanding requests")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--payloads", type=int, help="use only the first N (shuffled) dataset rows")
+    parser.add_argument("--output", default="load_test_results.json")
+    args = parser.parse_args()
+    if not args.rps and not args.concurrency:
+        args.concurrency = 8
+
+    report = asyncio.run(_main(args))
+    print_report(report)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
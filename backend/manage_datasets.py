@@ -6,12 +6,18 @@ Usage: python manage_datasets.py [command] [args]
 import sys
 import json
 from pathlib import Path
+from app.config import settings
 from app.services.dataset_loader import DatasetLoader
 
 
+def _loader() -> DatasetLoader:
+    """Loader for data/ with the DATASET_BACKEND storage."""
+    return DatasetLoader("data", backend=settings.dataset_backend, db_path=settings.dataset_db_path or None)
+
+
 def print_datasets():
     """Print all loaded datasets."""
-    loader = DatasetLoader("data")
+    loader = _loader()
     
     print("\n" + "="*80)
     print("DATASET STATISTICS")
@@ -54,14 +60,14 @@ def print_datasets():
 
 def add_disease(disease: str, symptom: str, weight: float, description: str = ""):
     """Add a new disease-symptom mapping."""
-    loader = DatasetLoader("data")
+    loader = _loader()
     loader.add_disease_symptom_record(disease, symptom, weight, description)
     print(f"✓ Added mapping: {disease} -> {symptom} (weight: {weight})")
 
 
 def add_language_variants(symptom_id: str, language: str, variants_json: str):
     """Add multilingual variants for a symptom."""
-    loader = DatasetLoader("data")
+    loader = _loader()
     variants = json.loads(variants_json)
     loader.add_multilingual_variant(symptom_id, language, variants)
     print(f"✓ Added {language} variants for {symptom_id}")
@@ -69,7 +75,7 @@ def add_language_variants(symptom_id: str, language: str, variants_json: str):
 
 def export_data(format_type: str = 'csv'):
     """Export datasets to specified format."""
-    loader = DatasetLoader("data")
+    loader = _loader()
     loader.export_to_format(format_type, "exports")
     print(f"✓ Exported data to {format_type} format in 'exports/' directory")
 
@@ -96,6 +102,10 @@ Dataset Management Commands:
 
   python manage_datasets.py help
     Show this help message
+
+  With DATASET_BACKEND=sqlite the commands read and write data/datasets.db
+  (DATASET_DB_PATH), seeded from the files in data/ on first use; use
+  export to write CSV/JSON files from it.
     """)
 
 
@@ -5,27 +5,32 @@ Retrain CatBoost model with expanded 15000-record dataset.
 import pandas as pd
 import numpy as np
 from catboost import CatBoostClassifier
-import pickle
 from pathlib import Path
 from sklearn.preprocessing import LabelEncoder
 from sklearn.model_selection import train_test_split
 from typing import Tuple
 
+from app.services.feature_cache import FeatureCacheError, load_feature_cache
+from app.services.model_artifact import file_sha256, save_artifact
+
 
 class ModelRetrainer:
     """Retrain disease prediction model with new dataset."""
 
-    def __init__(self, data_dir: str = "data", model_path: str = "disease_model.pkl"):
+    def __init__(self, data_dir: str = "data", model_path: str = "disease_model.json"):
         self.data_dir = Path(data_dir)
-        self.model_path = Path(model_path)
+        # Manifest path; the CatBoost model is written next to it as .cbm
+        self.model_path = Path(model_path).with_suffix(".json")
         self.model = None
         self.label_encoder = LabelEncoder()
         self.feature_columns = None
+        self.training_data_sha256 = None
 
     def load_training_data(self) -> pd.DataFrame:
         """Load the processed training dataset."""
         train_file = self.data_dir / 'training_data_15k.csv'
         print(f"Loading training data from {train_file}...")
+        self.training_data_sha256 = file_sha256(train_file)
         df = pd.read_csv(train_file)
         print(f"✓ Loaded {len(df)} training records")
         print(f"✓ Features: {len(df.columns)} columns")
@@ -54,6 +59,28 @@ class ModelRetrainer:
         
         return X, y, feature_cols
 
+    def load_features_and_labels(self) -> Tuple[np.ndarray, np.ndarray, list]:
+        """
+        ``(X, y, feature_names)`` from the columnar feature cache written by
+        integrate_dataset.py, memory-mapped, when its hash matches the CSV;
+        otherwise parsed from the CSV.
+        """
+        train_file = self.data_dir / 'training_data_15k.csv'
+        self.training_data_sha256 = file_sha256(train_file)
+        try:
+            X, y, feature_cols, _ = load_feature_cache(train_file, self.training_data_sha256)
+        except FeatureCacheError as e:
+            print(f"⚠️  {e}; parsing {train_file.name}")
+            return self.prepare_features_and_labels(self.load_training_data())
+
+        self.feature_columns = feature_cols
+        print(f"✓ Memory-mapped cached features for {train_file.name}")
+        print(f"\n✓ Features: {len(feature_cols)}")
+        print(f"✓ Training samples: {X.shape[0]}")
+        print(f"✓ Classes (diseases): {len(np.unique(y))}")
+        print(f"  {sorted(np.unique(y).tolist())}")
+        return X, y, feature_cols
+
     def train_model(self, X: np.ndarray, y: np.ndarray) -> None:
         """
         Train CatBoost model.
@@ -128,17 +155,16 @@ class ModelRetrainer:
         
         print(f"\nSaving model to {self.model_path}...")
         
-        model_data = {
-            'model': self.model,
-            'label_encoder': self.label_encoder,
-            'feature_columns': self.feature_columns,
-        }
-        
-        with open(self.model_path, 'wb') as f:
-            pickle.dump(model_data, f)
+        manifest = save_artifact(
+            self.model,
+            self.label_encoder.classes_,
+            self.feature_columns,
+            self.model_path,
+            self.training_data_sha256,
+        )
         
-        print(f"✓ Model saved to {self.model_path}")
-        print(f"✓ File size: {self.model_path.stat().st_size / 1024 / 1024:.2f} MB")
+        print(f"✓ Model saved to {self.model_path.with_name(manifest['model_file'])}")
+        print(f"✓ File size: {manifest['model_size'] / 1024 / 1024:.2f} MB")
 
     def print_summary(self, train_acc: float, test_acc: float) -> None:
         """Print training summary."""
@@ -185,11 +211,10 @@ def retrain_model():
         return
     
     # Initialize retrainer
-    retrainer = ModelRetrainer(data_dir="data", model_path="disease_model_15k.pkl")
+    retrainer = ModelRetrainer(data_dir="data", model_path="disease_model_15k.json")
     
     # Load and prepare data
-    df = retrainer.load_training_data()
-    X, y, features = retrainer.prepare_features_and_labels(df)
+    X, y, features = retrainer.load_features_and_labels()
     
     # Train model
     train_acc, test_acc = retrainer.train_model(X, y)
@@ -201,7 +226,7 @@ def retrain_model():
     retrainer.print_summary(train_acc, test_acc)
     
     print("\n✅ Model retraining complete!")
-    print("   Updated model: disease_model_15k.pkl")
+    print("   Updated model: disease_model_15k-<sha>.cbm (manifest: disease_model_15k.json)")
     return retrainer
 
 
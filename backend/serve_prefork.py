@@ -0,0 +1,135 @@
+"""
+Pre-fork server for the Symptom Checker API (Linux/macOS).
+
+The master imports the app, which builds the symptom matcher and catalog
+structures, and loads the model artifact. It then moves every object into
+the permanent GC generation with ``gc.freeze()`` and forks the workers.
+Workers therefore start with everything ready, and the cyclic collector
+never writes to the inherited objects' headers, so their pages stay
+copy-on-write shared instead of being duplicated per worker as with
+``uvicorn --workers N`` (each worker imports the app and loads its own
+model).
+
+The master only loads the model; it makes no predictions and starts no
+threads before forking. Each worker warms up in its startup hook, and a
+hot reload (``/admin/reload-model`` or the watcher) replaces the model in
+that worker only, giving up the sharing for it.
+
+Usage:
+    python serve_prefork.py --workers 4 --port 8000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Dict
+
+
+def _bind(host: str, port: int, backlog: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def preload(freeze: bool = True) -> None:
+    """Build the app and load the model in the master, then freeze the heap."""
+    from app import main
+    from app.services.startup import STARTUP
+
+    with STARTUP.phase("model_load"):
+        main.model_service.ensure_loaded()
+    # Collect once so garbage is not frozen, then exempt the survivors from
+    # future collections: the collector would otherwise touch every object
+    # header in each worker and un-share its page.
+    if freeze:
+        gc.collect()
+        gc.freeze()
+        STARTUP.mark("gc_freeze")
+
+
+def _serve(sock: socket.socket, args: argparse.Namespace) -> None:
+    import uvicorn
+
+    from app.main import app
+
+    config = uvicorn.Config(app, log_level=args.log_level, timeout_keep_alive=args.keep_alive)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(sock: socket.socket, args: argparse.Namespace) -> int:
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        try:
+            _serve(sock, args)
+            code = 0
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        # Skip the master's atexit handlers and buffered state.
+        os._exit(code)
+    return pid
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-fork server for the Symptom Checker API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--keep-alive", type=int, default=5)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--no-gc-freeze", action="store_true", help="fork without gc.freeze() (for comparison)")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        sys.exit("serve_prefork.py needs os.fork(); use uvicorn --workers on this platform")
+
+    sock = _bind(args.host, args.port, args.backlog)
+    preload(freeze=not args.no_gc_freeze)
+    workers: Dict[int, int] = {}  # pid -> slot
+    for slot in range(args.workers):
+        workers[_spawn(sock, args)] = slot
+    print(f"✓ Master {os.getpid()} serving on {args.host}:{args.port} with {args.workers} pre-forked workers")
+
+    stopping = False
+
+    def stop(signum: int, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        slot = workers.pop(pid, None)
+        if slot is None or stopping:
+            continue
+        print(f"⚠️  Worker {pid} exited with status {status}; restarting")
+        time.sleep(0.5)
+        workers[_spawn(sock, args)] = slot
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -40,17 +40,18 @@ def test_model_loading():
     print("🔄 Loading Model Service...")
     service = DiseaseModelService()
     
-    if service._retrained_model:
+    snapshot = service.snapshot
+    if snapshot.kind == "retrained":
         print("✅ Retrained model loaded successfully!")
-        print(f"   Model type: {type(service._retrained_model['model'])}")
-        print(f"   Supported diseases: {len(service._retrained_model['label_encoder'].classes_)}")
-        print(f"   Model classes: {list(service._retrained_model['label_encoder'].classes_[:5])}...")
-    elif service._is_fitted:
+        print(f"   Model type: {type(snapshot.model)}")
+        print(f"   Supported diseases: {len(snapshot.labels)}")
+        print(f"   Model classes: {snapshot.labels[:5]}...")
+    elif snapshot.kind == "original":
         print("⚠️  Using original model (retrained not found)")
     else:
         print("❌ No model loaded")
     
-    return service._retrained_model is not None
+    return snapshot.kind == "retrained"
 
 
 def test_predictions():
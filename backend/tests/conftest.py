@@ -19,7 +19,7 @@ def nlp_service():
 @pytest.fixture
 def model_service():
     service = DiseaseModelService()
-    if not service._is_fitted:
+    if service.snapshot.kind == "rule_based":
         from app.services.model_service import train_and_save_model
         model_path = Path(__file__).parent.parent / "models" / "catboost_disease.cbm"
         train_and_save_model(model_path)
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
@@ -153,3 +155,192 @@ class TestPredictEndpoint:
         data = response.json()
         assert len(data["top_k"]) > 0
         assert all(isinstance(item, dict) for item in data["top_k"])
+
+    def test_predict_custom_top_k(self, client):
+        payload = {"language": "en", "text": "fever and cough", "top_k": 5}
+        data = client.post("/predict", json=payload).json()
+        assert len(data["top_k"]) == 5
+        scores = [next(iter(item.values())) for item in data["top_k"]]
+        assert scores == sorted(scores, reverse=True)
+        assert data["predicted_disease"] in data["top_k"][0]
+
+    def test_predict_top_k_out_of_range(self, client):
+        payload = {"language": "en", "text": "fever and cough", "top_k": 0}
+        assert client.post("/predict", json=payload).status_code == 422
+
+
+class TestStreamPredictEndpoint:
+    def test_jsonl_upload_streams_ndjson(self, client):
+        def body():
+            for text in ("fever and cough", "headache and nausea", "x"):
+                yield (json.dumps({"text": text}) + "\n").encode()
+
+        response = client.post("/predict/stream", content=body(), headers={"Content-Type": "application/x-ndjson"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["index"] for line in lines[:-1]] == [0, 1, 2]
+        assert "predicted_disease" in lines[0]["result"]
+        assert lines[2]["error"].startswith("Invalid item")
+        assert lines[-1] == {"summary": {"succeeded": 2, "failed": 1}}
+
+    def test_csv_upload_matches_batch(self, client):
+        csv_body = 'text,symptom_intensity\n"fever, cough and sore throat","{""cough"": 0.7}"\n'
+        response = client.post("/predict/stream", content=csv_body, headers={"Content-Type": "text/csv"})
+        streamed = json.loads(response.text.splitlines()[0])["result"]
+        item = {"text": "fever, cough and sore throat", "symptom_intensity": {"cough": 0.7}}
+        batch = client.post("/predict/batch", json={"items": [item]}).json()["results"][0]["result"]
+        assert streamed["predicted_disease"] == batch["predicted_disease"]
+        assert streamed["detected_symptoms"] == batch["detected_symptoms"]
+
+    def test_unsupported_media_type(self, client):
+        response = client.post("/predict/stream", json={"text": "fever"})
+        assert response.status_code == 415
+
+
+class TestBatchPredictEndpoint:
+    def test_batch_returns_result_per_item(self, client):
+        payload = {
+            "items": [
+                {"text": "fever and cough", "symptom_intensity": {"fever": 0.8}},
+                {"text": "headache and nausea"},
+                {"text": "itching rash sneezing"},
+            ]
+        }
+        response = client.post("/predict/batch", json=payload)
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["index"] for item in data["results"]] == [0, 1, 2]
+        assert data["succeeded"] == 3
+        assert data["failed"] == 0
+        for item in data["results"]:
+            assert item["error"] is None
+            assert "predicted_disease" in item["result"]
+
+    def test_batch_matches_single_predict(self, client):
+        item = {"text": "fever, cough and sore throat", "symptom_intensity": {"cough": 0.7}}
+        single = client.post("/predict", json=item).json()
+        batch = client.post("/predict/batch", json={"items": [item]}).json()
+        result = batch["results"][0]["result"]
+        assert result["predicted_disease"] == single["predicted_disease"]
+        assert result["risk_level"] == single["risk_level"]
+        assert result["detected_symptoms"] == single["detected_symptoms"]
+        assert abs(result["confidence"] - single["confidence"]) < 1e-4
+
+    def test_batch_bad_item_does_not_fail_batch(self, client):
+        payload = {
+            "items": [
+                {"text": "fever and cough"},
+                {"text": ""},
+                {"language": "en"},
+                {"text": "   "},
+            ]
+        }
+        response = client.post("/predict/batch", json=payload)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["succeeded"] == 1
+        assert data["failed"] == 3
+        assert data["results"][0]["result"] is not None
+        for item in data["results"][1:]:
+            assert item["result"] is None
+            assert item["error"]
+
+    def test_batch_empty_items_rejected(self, client):
+        response = client.post("/predict/batch", json={"items": []})
+        assert response.status_code == 422
+
+
+class TestPredictionCache:
+    def test_repeated_phrasing_hits_cache(self, client):
+        from app.main import prediction_cache
+
+        payload = {"text": "Cache   probe: fever and COUGH", "symptom_intensity": {"fever": 0.4}}
+        client.post("/predict", json=payload)
+        hits_before = prediction_cache.hits
+        payload["text"] = "cache probe: fever and cough"
+        response = client.post("/predict", json=payload)
+        assert response.status_code == 200
+        assert prediction_cache.hits == hits_before + 1
+
+    def test_model_reload_invalidates_cache(self, client, monkeypatch):
+        from app.main import model_service, prediction_cache
+
+        payload = {"text": "fever and chills", "symptom_intensity": {}}
+        client.post("/predict", json=payload)
+        monkeypatch.setattr(model_service, "version", model_service.version + "-reloaded")
+        hits_before = prediction_cache.hits
+        client.post("/predict", json=payload)
+        assert prediction_cache.hits == hits_before
+        assert prediction_cache.invalidations >= 1
+
+    def test_cache_stats_endpoint(self, client):
+        data = client.get("/cache/stats").json()
+        for field in ["hits", "misses", "evictions", "size", "max_size", "fingerprint"]:
+            assert field in data
+
+
+class TestStartupEndpoint:
+    def test_startup_timeline(self):
+        with TestClient(app) as client:
+            assert client.post("/predict", json={"text": "fever and cough"}).status_code == 200
+            data = client.get("/debug/startup").json()
+        names = [phase["name"] for phase in data["phases"]]
+        assert names[:2] == ["imports", "services"]
+        assert "model_load" in names
+        assert "first_predict" in data["events"]
+        assert data["model"]["kind"] in ("retrained", "original", "rule_based")
+
+
+class TestMetricsEndpoint:
+    def test_metrics_exposes_stage_histograms(self, client):
+        client.post("/predict", json={"language": "en", "text": "metrics probe fever", "symptom_intensity": {}})
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        for stage in ("features", "model", "explain", "risk", "diet"):
+            assert f'symptom_checker_stage_seconds_count{{endpoint="predict",stage="{stage}"}}' in body
+        assert 'symptom_checker_predict_seconds_bucket{endpoint="predict",le="+Inf"}' in body
+        assert "# TYPE symptom_checker_model_predictions_total counter" in body
+
+
+class TestInferenceAdmission:
+    def test_saturated_executor_returns_503(self, client, monkeypatch):
+        from app import main
+        from app.services.inference_executor import ExecutorSaturated
+
+        def full():
+            raise ExecutorSaturated(retry_after=2)
+
+        monkeypatch.setattr(main.inference, "_admit", full)
+        response = client.post("/predict", json={"text": "fever and cough"})
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "2"
+
+    def test_inference_stats_endpoint(self, client):
+        client.post("/predict", json={"text": "fever and cough"})
+        data = client.get("/inference/stats").json()
+        assert data["in_flight"] == 0
+        assert data["completed"] >= 1
+        assert "symptom_checker_inference_queue_depth" in client.get("/metrics").text
+
+
+class TestReloadEndpoint:
+    def test_process_executor_reports_worker_reload(self, client, monkeypatch):
+        from dataclasses import replace
+
+        from app import main
+
+        monkeypatch.setattr(main.reloader, "reload", lambda force: {"status": "unchanged"})
+        monkeypatch.setattr(main, "settings", replace(main.settings, inference_executor="process"))
+        assert client.post("/admin/reload-model").json()["workers"].startswith("not reloaded")
+
+        monkeypatch.setattr(main, "settings", replace(main.settings, model_watch_interval_seconds=5.0))
+        assert client.post("/admin/reload-model").json()["workers"] == "reload via their own watchers"
+
+    def test_thread_executor_report_has_no_worker_status(self, client, monkeypatch):
+        from app import main
+
+        monkeypatch.setattr(main.reloader, "reload", lambda force: {"status": "unchanged"})
+        assert "workers" not in client.post("/admin/reload-model").json()
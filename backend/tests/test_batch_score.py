@@ -0,0 +1,88 @@
+import csv
+import json
+
+import pytest
+
+import batch_score
+from app.schemas import PredictRequest
+
+TEXTS = [
+    "I have fever and a bad cough",
+    "headache, nausea and vomiting since yesterday",
+    "itchy rash on my arms",
+    "",
+    "feeling tired with body pain and chills",
+]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    path = tmp_path / "corpus.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["text", "disease"])
+        for i, text in enumerate(TEXTS):
+            writer.writerow([text, f"Disease {i}"])
+    return path
+
+
+def _read(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_scores_rows_in_order_like_the_pipeline(corpus, tmp_path, workers):
+    output = tmp_path / "out.csv"
+    report = batch_score.main([str(corpus), str(output), "--workers", str(workers), "--shard-size", "2", "--top-k", "2"])
+
+    assert report["rows"] == len(TEXTS)
+    assert report["failed"] == 1
+    assert "accuracy" in report
+
+    rows = _read(output)
+    assert [int(r["row"]) for r in rows] == list(range(len(TEXTS)))
+    assert [r["expected_disease"] for r in rows] == [f"Disease {i}" for i in range(len(TEXTS))]
+    assert "text" in rows[3]["error"]
+
+    pipeline = batch_score.build_pipeline()
+    scored = [i for i, text in enumerate(TEXTS) if text]
+    expected = pipeline.predict_batch([PredictRequest(text=TEXTS[i], top_k=2) for i in scored])
+    for i, (response, error) in zip(scored, expected):
+        assert error is None
+        assert rows[i]["error"] == ""
+        assert rows[i]["predicted_disease"] == response.predicted_disease
+        assert float(rows[i]["confidence"]) == pytest.approx(response.confidence)
+        assert json.loads(rows[i]["top_k"]) == response.top_k
+        assert rows[i]["risk_level"] == response.risk_level
+        assert rows[i]["detected_symptoms"] == ";".join(response.detected_symptoms)
+
+
+def test_missing_text_column_is_reported(tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text("symptoms,disease\nfever,Flu\n")
+    with pytest.raises(SystemExit, match="no 'text' column"):
+        batch_score.main([str(path), str(tmp_path / "out.csv"), "--workers", "0"])
+
+
+def test_bad_symptom_intensity_fails_only_its_row(tmp_path):
+    path = tmp_path / "intensity.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["text", "symptom_intensity"])
+        writer.writerow(["fever and cough", '{"fever": 0.9}'])
+        writer.writerow(["fever and cough", "{not json"])
+        writer.writerow(["fever and cough", "[1]"])
+        writer.writerow(["fever and cough", "3"])
+        writer.writerow(["headache", ""])
+    output = tmp_path / "out.csv"
+    report = batch_score.main([str(path), str(output), "--workers", "0"])
+
+    assert report["rows"] == 5
+    assert report["failed"] == 3
+    rows = _read(output)
+    assert [r["error"] == "" for r in rows] == [True, False, False, False, True]
+    assert rows[1]["error"].startswith("Invalid symptom_intensity:")
+    assert rows[2]["error"] == "Invalid symptom_intensity: expected a JSON object, got list"
+    assert rows[3]["error"] == "Invalid symptom_intensity: expected a JSON object, got int"
+    assert rows[0]["predicted_disease"] and rows[4]["predicted_disease"]
@@ -0,0 +1,71 @@
+import pytest
+
+from app.services.cache import LRUCache, PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache:
+    def test_get_put_counts_hits_and_misses(self):
+        cache = LRUCache(max_size=4)
+        assert cache.get("a") is None
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_ttl_expires_entries(self):
+        clock = FakeClock()
+        cache = LRUCache(max_size=2, ttl_seconds=10, clock=clock)
+        cache.put("a", 1)
+        clock.now = 5
+        assert cache.get("a") == 1
+        clock.now = 16
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+        assert len(cache) == 0
+
+    def test_zero_size_disables_cache(self):
+        cache = LRUCache(max_size=0)
+        cache.put("a", 1)
+        assert not cache.enabled
+        assert cache.get("a") is None
+        assert cache.stats()["misses"] == 0
+
+
+class TestPredictionCache:
+    def test_new_fingerprint_invalidates(self):
+        cache = PredictionCache(max_size=8)
+        cache.bind("model-v1")
+        key = PredictionCache.make_key("fever", {}, "en", "model-v1")
+        cache.put(key, "response")
+        cache.bind("model-v1")
+        assert cache.get(key) == "response"
+        cache.bind("model-v2")
+        assert len(cache) == 0
+        assert cache.invalidations == 1
+
+    def test_key_ignores_intensity_order(self):
+        first = PredictionCache.make_key("fever", {"fever": 0.5, "cough": 0.2}, "en", "v")
+        second = PredictionCache.make_key("fever", {"cough": 0.2, "fever": 0.5}, "en", "v")
+        assert first == second
+        assert first != PredictionCache.make_key("fever", {}, "hi", "v")
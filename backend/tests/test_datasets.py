@@ -6,6 +6,8 @@ import pytest
 from pathlib import Path
 import json
 
+import numpy as np
+
 from app.services.dataset_loader import DatasetLoader
 from app.services.nlp_service_enhanced import EnhancedBiomedicalNLPService
 
@@ -89,6 +91,57 @@ class TestDatasetLoader:
             assert symptom in symptoms
             assert 0 <= weight <= 1
 
+    def test_disease_symptom_matrix_dense(self, loader):
+        """The dense matrix agrees with the CSV rows and the dict form."""
+        matrix = loader.get_disease_symptom_matrix()
+        df = loader.load_disease_symptoms_csv()
+
+        assert matrix.weights.dtype == np.float32
+        assert matrix.weights.shape == (len(matrix.diseases), len(matrix.symptoms))
+        assert matrix.diseases == sorted(df['disease'].unique())
+        expected = {}
+        for _, row in df.iterrows():
+            expected[(row['disease'], row['symptom'])] = row['weight']
+        assert list(loader.get_disease_symptom_weights().items()) == list(expected.items())
+        for (disease, symptom), weight in expected.items():
+            assert matrix.weights[matrix.disease_index[disease], matrix.symptom_index[symptom]] == np.float32(weight)
+        assert np.count_nonzero(matrix.weights) <= len(expected)
+
+    def test_disease_symptom_matrix_score(self, loader):
+        """Scoring is one product with the weights."""
+        matrix = loader.get_disease_symptom_matrix()
+        vector = matrix.symptom_vector({"fever": 0.5, "cough": 1.0, "unknown": 1.0})
+        scores = matrix.score(vector)
+        for disease, i in matrix.disease_index.items():
+            assert scores[i] == pytest.approx(
+                0.5 * matrix.weight(disease, "fever") + matrix.weight(disease, "cough"), rel=1e-6
+            )
+        assert matrix.score(np.vstack([vector, vector])).shape == (2, len(matrix.diseases))
+        assert matrix.weight("Nope", "fever") == 0.0
+
+    def test_disease_symptom_matrix_cache(self, tmp_path):
+        """The matrix is reused until the mappings change."""
+        temp_loader = DatasetLoader(str(tmp_path))
+        temp_loader.add_disease_symptom_record("A", "fever", 0.5)
+        first = temp_loader.get_disease_symptom_matrix()
+        assert temp_loader.get_disease_symptom_matrix() is first
+
+        temp_loader.add_disease_symptom_record("B", "cough", 0.25)
+        second = temp_loader.get_disease_symptom_matrix()
+        assert second is not first
+        assert second.diseases == ["A", "B"]
+
+        store_loader = DatasetLoader(str(tmp_path), backend="sqlite")
+        cached = store_loader.get_disease_symptom_matrix()
+        assert store_loader.get_disease_symptom_matrix() is cached
+        store_loader.add_disease_symptom_record("C", "rash", 1.0)
+        assert store_loader.get_disease_symptom_matrix().weight("C", "rash") == 1.0
+        store_loader.close()
+
+    def test_empty_disease_symptom_matrix(self, tmp_path):
+        diseases, symptoms, weights = DatasetLoader(str(tmp_path)).get_disease_symptom_matrix()
+        assert (diseases, symptoms, weights) == ([], [], {})
+
     def test_get_symptom_synonyms(self, loader):
         """Test symptom synonym extraction."""
         synonyms = loader.get_symptom_synonyms()
@@ -147,6 +200,108 @@ class TestDatasetLoader:
         assert 'test_language' in data['multilingual_symptoms']['test_symptom']
 
 
+class TestSQLiteDatasetLoader:
+    """Test the SQLite storage backend."""
+
+    @pytest.fixture
+    def data_dir(self, tmp_path):
+        for name in ("diseases_symptoms.csv", "training_data.csv", "multilingual_symptoms.json"):
+            (tmp_path / name).write_bytes((Path("data") / name).read_bytes())
+        return tmp_path
+
+    @pytest.fixture
+    def loader(self, data_dir):
+        loader = DatasetLoader(str(data_dir), backend="sqlite")
+        yield loader
+        loader.close()
+
+    def test_seeded_from_files(self, loader, data_dir):
+        """A new database starts with the same data as the files."""
+        files = DatasetLoader(str(data_dir))
+        assert loader.load_disease_symptoms_csv()[['disease', 'symptom', 'weight']].equals(
+            files.load_disease_symptoms_csv()[['disease', 'symptom', 'weight']]
+        )
+        assert len(loader.load_training_data_csv()) == len(files.load_training_data_csv())
+        assert loader.load_multilingual_symptoms_json() == files.load_multilingual_symptoms_json()
+        assert loader.get_statistics() == files.get_statistics()
+
+    def test_seeded_once(self, loader, data_dir):
+        """Reopening the database does not import the files again."""
+        count = len(loader.load_disease_symptoms_csv())
+        loader.add_disease_symptom_record("TestDisease", "fever", 0.8)
+        reopened = DatasetLoader(str(data_dir), backend="sqlite")
+        assert len(reopened.load_disease_symptoms_csv()) == count + 1
+        reopened.close()
+
+    def test_appends_do_not_touch_files(self, loader, data_dir):
+        """Appends go to the database; the CSV files are left alone."""
+        before = (data_dir / "diseases_symptoms.csv").read_bytes()
+        loader.add_disease_symptom_record("TestDisease", "fever", 0.8, "Test description")
+        added = loader.add_disease_symptom_records(
+            [("TestDisease", "cough", 0.5), {"disease": "Other", "symptom": "fever", "weight": 0.3}]
+        )
+        assert added == 2
+        assert (data_dir / "diseases_symptoms.csv").read_bytes() == before
+        assert loader.get_symptoms_for_disease("TestDisease") == [("fever", 0.8), ("cough", 0.5)]
+        assert ("Other", 0.3) in loader.get_diseases_for_symptom("fever")
+
+    def test_training_records(self, loader):
+        """Training records keep their columns; bulk inserts are counted."""
+        count = len(loader.load_training_data_csv())
+        loader.add_training_record({"patient_id": "T1", "disease": "Flu", "fever": 0.9})
+        assert loader.add_training_records(
+            [{"patient_id": f"T{i}", "disease": "Flu", "new_column": i} for i in range(2, 5)]
+        ) == 3
+        df = loader.load_training_data_csv()
+        assert len(df) == count + 4
+        assert df.iloc[-1]["new_column"] == 4
+        assert df.iloc[count]["fever"] == 0.9
+
+    def test_add_multilingual_variant(self, loader):
+        """Variants are added or replaced in place."""
+        loader.add_multilingual_variant("test_symptom", "test_language", ["term1", "term2"])
+        loader.add_multilingual_variant("fever", "hindi", ["bukhar"])
+        symptoms = loader.load_multilingual_symptoms_json()['multilingual_symptoms']
+        assert symptoms["test_symptom"] == {"test_language": ["term1", "term2"]}
+        assert symptoms["fever"]["hindi"] == ["bukhar"]
+        assert list(symptoms)[0] == "fever"
+        assert list(symptoms)[-1] == "test_symptom"
+
+    def test_export_writes_files(self, loader, tmp_path):
+        """The CSV/JSON files are produced from the database by export."""
+        loader.add_disease_symptom_record("TestDisease", "fever", 0.8)
+        out = tmp_path / "exports"
+        loader.export_to_format('csv', str(out))
+        loader.export_to_format('json', str(out))
+        exported = DatasetLoader(str(out))
+        assert 'TestDisease' in set(exported.load_disease_symptoms_csv()['disease'])
+        with open(out / 'multilingual_symptoms.json', encoding='utf-8') as f:
+            assert json.load(f) == loader.load_multilingual_symptoms_json()
+
+    def test_concurrent_writers(self, loader, data_dir):
+        """Writers on separate connections do not lose each other's records."""
+        import threading
+
+        count = len(loader.load_disease_symptoms_csv())
+
+        def write(n):
+            writer = DatasetLoader(str(data_dir), backend="sqlite")
+            for i in range(25):
+                writer.add_disease_symptom_record(f"Writer{n}", f"symptom_{i}", 0.5)
+            writer.close()
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(loader.load_disease_symptoms_csv()) == count + 100
+
+    def test_unknown_backend(self, tmp_path):
+        with pytest.raises(ValueError):
+            DatasetLoader(str(tmp_path), backend="parquet")
+
+
 class TestEnhancedBiomedicalNLPService:
     """Test enhanced NLP service with datasets."""
 
@@ -213,6 +368,44 @@ class TestEnhancedBiomedicalNLPService:
         updated_syns = nlp_service.get_symptom_synonyms("fever")
         assert len(updated_syns) >= initial_count
 
+    def test_add_many(self, nlp_service):
+        """Bulk variants are matched and counted once."""
+        added = nlp_service.add_many({
+            "fever": ["tapmaan", "tapmaan", "fever"],
+            "cough": ["khaansi"],
+        })
+        assert added == 2
+        assert nlp_service.extract_symptoms("tapmaan aur khaansi") == ["fever", "cough"]
+        assert nlp_service.get_symptom_synonyms("fever").count("tapmaan") == 1
+        assert nlp_service.add_many({"cough": ["khaansi"]}) == 0
+
+    def test_add_many_concurrent_readers(self, nlp_service):
+        """Readers always see a complete matcher while variants are added."""
+        import threading
+
+        errors = []
+        stop = threading.Event()
+
+        def read():
+            while not stop.is_set():
+                try:
+                    hits = nlp_service.extract_symptoms("i have fever and cough")
+                    assert {"fever", "cough"} <= set(hits)
+                except Exception as e:  # pragma: no cover - reported below
+                    errors.append(e)
+
+        readers = [threading.Thread(target=read) for _ in range(3)]
+        for reader in readers:
+            reader.start()
+        for i in range(300):
+            nlp_service.add_symptom_variants("rash", [f"rash_variant_{i}"])
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+        assert not errors
+        assert nlp_service.extract_symptoms("rash_variant_299") == ["rash"]
+
     def test_get_stats(self, nlp_service):
         """Test statistics generation."""
         stats = nlp_service.get_stats()
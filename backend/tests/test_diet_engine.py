@@ -68,3 +68,9 @@ class TestNutrientScoredLayer:
         assert len(result["recommended"]) > 0
         assert len(result["avoid"]) > 0
         assert any("dietitian" in item.lower() for item in result["notes"])
+
+    def test_recommend_batch_matches_recommend(self, diet_layer):
+        diseases = ["Common Cold", "Migraine", "Common Cold", "Unknown"]
+        levels = ["Low", "High", "Low", "Critical"]
+        batch = diet_layer.recommend_batch(diseases, levels)
+        assert batch == [diet_layer.recommend(d, l) for d, l in zip(diseases, levels)]
@@ -1,6 +1,8 @@
 import pytest
 import numpy as np
-from app.services.explainability import IntegratedGradientsExplainer
+from catboost import CatBoostClassifier, Pool
+
+from app.services.explainability import IntegratedGradientsExplainer, TreeShapExplainer, build_explainer
 from app.services.symptom_catalog import SYMPTOMS
 
 
@@ -56,3 +58,157 @@ class TestIntegratedGradientsExplainer:
         assert len(explanations) > 0
         max_contribution = max(e["contribution"] for e in explanations)
         assert max_contribution > 0.0
+
+
+class LinearModelService:
+    """Additive stand-in: P(class 0) = w . x, so IG completeness is exact."""
+
+    def __init__(self, weights):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.calls = 0
+
+    def predict_proba(self, features, detected_batch=None):
+        self.calls += 1
+        p = np.asarray(features, dtype=np.float64) @ self.weights
+        return np.column_stack([p, 1.0 - p]), ["A", "B"]
+
+
+class TestModelIntegratedGradients:
+    @pytest.fixture
+    def linear_service(self):
+        weights = np.zeros(len(SYMPTOMS))
+        weights[SYMPTOMS.index("fever")] = 0.5
+        weights[SYMPTOMS.index("cough")] = 0.3
+        return LinearModelService(weights)
+
+    def test_attributions_follow_model(self, linear_service):
+        explainer = IntegratedGradientsExplainer(linear_service, steps=10)
+        features = np.zeros((1, len(SYMPTOMS)), dtype=np.float32)
+        features[0, SYMPTOMS.index("fever")] = 0.8
+        features[0, SYMPTOMS.index("cough")] = 0.6
+        features[0, SYMPTOMS.index("rash")] = 0.9
+        result = explainer.attribute(features, target=0)
+        attributions = result["attributions"]
+        assert attributions[SYMPTOMS.index("fever")] == pytest.approx(0.4, abs=1e-6)
+        assert attributions[SYMPTOMS.index("cough")] == pytest.approx(0.18, abs=1e-6)
+        assert attributions[SYMPTOMS.index("rash")] == pytest.approx(0.0, abs=1e-6)
+
+    def test_completeness_reported(self, linear_service):
+        explainer = IntegratedGradientsExplainer(linear_service, steps=30)
+        features = np.zeros((1, len(SYMPTOMS)), dtype=np.float32)
+        features[0, SYMPTOMS.index("fever")] = 1.0
+        result = explainer.attribute(features, target=0)
+        assert result["prediction"] - result["baseline_prediction"] == pytest.approx(0.5, abs=1e-6)
+        assert result["completeness_gap"] < 1e-6
+
+    def test_default_target_is_predicted_class(self, linear_service):
+        explainer = IntegratedGradientsExplainer(linear_service, steps=5)
+        features = np.zeros((1, len(SYMPTOMS)), dtype=np.float32)
+        assert explainer.attribute(features)["target"] == 1
+
+    def test_batch_uses_single_model_call(self, linear_service):
+        explainer = IntegratedGradientsExplainer(linear_service, steps=12)
+        features = np.random.rand(6, len(SYMPTOMS)).astype(np.float32) * 0.1
+        explanations = explainer.explain_batch(features, [["fever"]] * 6)
+        assert linear_service.calls == 1
+        assert len(explanations) == 6
+
+    def test_batch_matches_single_row(self, linear_service):
+        explainer = IntegratedGradientsExplainer(linear_service, steps=8)
+        features = np.random.rand(3, len(SYMPTOMS)).astype(np.float32) * 0.1
+        batch = explainer.attribute_batch(features, [0, 0, 0])
+        for i in range(3):
+            single = explainer.attribute(features[i : i + 1], target=0)
+            np.testing.assert_allclose(batch[i]["attributions"], single["attributions"], atol=1e-9)
+
+    def test_invalid_steps_rejected(self):
+        with pytest.raises(ValueError):
+            IntegratedGradientsExplainer(steps=0)
+
+    def test_interaction_residual_keeps_completeness(self):
+        class ThresholdModel:
+            """P(class 0) jumps only when fever and cough are both above 0.5."""
+
+            def predict_proba(self, features, detected_batch=None):
+                f = np.asarray(features, dtype=np.float64)
+                both = (f[:, SYMPTOMS.index("fever")] > 0.5) & (f[:, SYMPTOMS.index("cough")] > 0.5)
+                p = np.where(both, 0.9, 0.1)
+                return np.column_stack([p, 1.0 - p]), ["A", "B"]
+
+        explainer = IntegratedGradientsExplainer(ThresholdModel(), steps=10)
+        features = np.zeros((1, len(SYMPTOMS)), dtype=np.float32)
+        features[0, SYMPTOMS.index("fever")] = 0.8
+        features[0, SYMPTOMS.index("cough")] = 0.8
+        result = explainer.attribute(features, target=0)
+        assert result["raw_completeness_gap"] == pytest.approx(0.8, abs=1e-6)
+        assert result["completeness_gap"] < 1e-9
+        assert result["attributions"][SYMPTOMS.index("fever")] == pytest.approx(0.4, abs=1e-6)
+
+
+class CatBoostModelService:
+    """Just enough of DiseaseModelService for the SHAP explainer."""
+
+    def __init__(self, model, version="test:1"):
+        self.model = model
+        self.version = version
+
+    def active_model(self):
+        return self.model
+
+    def predict_proba(self, features, detected_batch=None):
+        return self.model.predict_proba(features), [str(c) for c in self.model.classes_]
+
+
+@pytest.fixture(scope="module")
+def symptom_model():
+    rng = np.random.default_rng(0)
+    X = (rng.random((300, len(SYMPTOMS))) > 0.85).astype(np.float32) * 0.6
+    y = (X[:, 0] > 0).astype(int) + 2 * (X[:, 1] > 0).astype(int)
+    model = CatBoostClassifier(iterations=40, depth=4, loss_function="MultiClass", random_seed=0, verbose=False)
+    model.fit(X, y)
+    return model, X
+
+
+class TestTreeShapExplainer:
+    def test_contributions_add_up_to_predicted_raw_score(self, symptom_model):
+        model, X = symptom_model
+        explainer = TreeShapExplainer(CatBoostModelService(model))
+        contributions = explainer.shap_batch(X[:20])
+        raw = model.predict(X[:20], prediction_type="RawFormulaVal")
+        expected_value = model.get_feature_importance(Pool(X[:1]), type="ShapValues")[0, :, -1]
+        predicted = raw.argmax(axis=1)
+        np.testing.assert_allclose(
+            contributions.sum(axis=1) + expected_value[predicted], raw[np.arange(20), predicted], atol=1e-6
+        )
+
+    def test_memoized_on_quantized_vector(self, symptom_model):
+        model, X = symptom_model
+        explainer = TreeShapExplainer(CatBoostModelService(model))
+        first = explainer.shap_batch(X[:1])
+        jittered = explainer.shap_batch(X[:1] + 0.001)
+        np.testing.assert_array_equal(first, jittered)
+        assert explainer.cache.misses == 1
+        assert explainer.cache.hits == 1
+
+    def test_batch_matches_single(self, symptom_model):
+        model, X = symptom_model
+        explainer = TreeShapExplainer(CatBoostModelService(model))
+        detected = [[SYMPTOMS[j] for j in np.flatnonzero(row)] for row in X[:10]]
+        batch = explainer.explain_batch(X[:10], detected)
+        singles = [explainer.explain(X[i : i + 1], detected[i]) for i in range(10)]
+        assert batch == singles
+
+    def test_falls_back_without_model(self):
+        service = CatBoostModelService(None)
+        fallback = IntegratedGradientsExplainer()
+        explainer = TreeShapExplainer(service, fallback=fallback)
+        features = np.zeros((1, len(SYMPTOMS)), dtype=np.float32)
+        features[0, 0] = 0.6
+        assert explainer.explain(features, [SYMPTOMS[0]]) == fallback.explain(features, [SYMPTOMS[0]])
+
+    def test_build_explainer(self, symptom_model):
+        service = CatBoostModelService(symptom_model[0])
+        assert isinstance(build_explainer("ig", service), IntegratedGradientsExplainer)
+        assert isinstance(build_explainer("shap", service), TreeShapExplainer)
+        with pytest.raises(ValueError):
+            build_explainer("lime", service)
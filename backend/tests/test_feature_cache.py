@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.feature_cache import FeatureCacheError, cache_paths, load_feature_cache, write_feature_cache
+from integrate_dataset import DatasetIntegration
+from retrain_model import ModelRetrainer
+
+TEXTS = [
+    "High fever with dry cough and chest tightness",
+    "Runny nose, sneezing and a sore throat",
+    "Stomach pain and diarrhea since morning",
+    "Headache with nausea and sensitivity to light",
+    "Joint pain, rash and eye pain",
+]
+DISEASES = ["Flu", "Common Cold", "Gastritis", "Migraine", "Dengue"]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    merged = tmp_path / "merged.csv"
+    pd.DataFrame({"text": TEXTS, "disease": DISEASES}).to_csv(merged, index=False)
+    DatasetIntegration(str(merged), str(tmp_path)).save_processed_datasets()
+    return tmp_path
+
+
+def test_integration_writes_a_cache_matching_the_csv(data_dir):
+    csv_path = data_dir / "training_data_15k.csv"
+    assert all(path.exists() for path in cache_paths(csv_path))
+
+    retrainer = ModelRetrainer(data_dir=str(data_dir))
+    X_csv, y_csv, columns_csv = retrainer.prepare_features_and_labels(retrainer.load_training_data())
+    X, y, columns, schema = load_feature_cache(csv_path)
+
+    assert isinstance(X, np.memmap) and X.dtype == np.float32
+    np.testing.assert_array_equal(X, X_csv)
+    assert y.tolist() == y_csv.tolist() == DISEASES
+    assert columns == columns_csv
+    assert schema["rows"] == len(TEXTS) and schema["labels"] == sorted(DISEASES)
+
+
+def test_retrainer_uses_the_cache(data_dir, capsys):
+    retrainer = ModelRetrainer(data_dir=str(data_dir))
+    X, _, columns = retrainer.load_features_and_labels()
+
+    assert isinstance(X, np.memmap)
+    assert retrainer.feature_columns == columns
+    assert retrainer.training_data_sha256 == load_feature_cache(data_dir / "training_data_15k.csv")[3]["source_sha256"]
+    assert "Memory-mapped" in capsys.readouterr().out
+
+
+def test_edited_csv_falls_back_to_parsing(data_dir, capsys):
+    csv_path = data_dir / "training_data_15k.csv"
+    df = pd.read_csv(csv_path)
+    df.loc[0, "disease"] = "Malaria"
+    df.to_csv(csv_path, index=False)
+
+    with pytest.raises(FeatureCacheError, match="stale"):
+        load_feature_cache(csv_path)
+    X, y, _ = ModelRetrainer(data_dir=str(data_dir)).load_features_and_labels()
+    assert not isinstance(X, np.memmap)
+    assert y[0] == "Malaria"
+    assert "stale" in capsys.readouterr().out
+
+
+def test_missing_or_inconsistent_cache(tmp_path):
+    csv_path = tmp_path / "train.csv"
+    csv_path.write_text("patient_id,disease,text,fever\nP00000,Flu,fever,1.0\n")
+    with pytest.raises(FeatureCacheError, match="no feature cache"):
+        load_feature_cache(csv_path)
+    with pytest.raises(ValueError):
+        write_feature_cache(csv_path, np.ones((2, 1)), ["Flu"], ["fever"])
+
+    write_feature_cache(csv_path, np.ones((1, 1)), ["Flu"], ["fever"])
+    np.save(cache_paths(csv_path)[1], np.ones((1, 2), dtype=np.float32))
+    with pytest.raises(FeatureCacheError, match="do not match"):
+        load_feature_cache(csv_path)
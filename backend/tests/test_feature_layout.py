@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from app.services.feature_layout import CATALOG_LAYOUT, FeatureLayout, FeatureLayoutError
+from app.services.symptom_catalog import SYMPTOMS
+
+# feature_columns of the retrained 15-disease model
+DATASET_COLUMNS = [
+    "ache", "blurred", "chest", "chills", "congestion", "cough", "diarrhea", "discomfort", "dizziness",
+    "dry", "eye", "fatigue", "fever", "headache", "high fever", "joint", "loss of appetite", "nausea",
+    "pain", "rash", "red", "runny nose", "sensitivity", "shortness of breath", "skin", "sneezing",
+    "stiff", "stomach", "sweating", "swelling", "thirst", "throat", "tightness", "vision", "vomiting",
+    "weakness", "weight loss", "wheezing",
+]
+
+
+def _old_vector(nlp, text, intensity):
+    """The dict-per-request encoding the catalog layout replaced."""
+    detected = nlp.extract_symptoms(text)
+    feature_map = {symptom: 0.0 for symptom in SYMPTOMS}
+    for symptom in detected:
+        feature_map[symptom] = max(feature_map[symptom], 0.6)
+    for symptom, score in intensity.items():
+        if symptom in feature_map:
+            feature_map[symptom] = max(feature_map[symptom], float(min(max(score, 0.0), 1.0)))
+    return np.array([[feature_map[s] for s in SYMPTOMS]], dtype=np.float32), detected
+
+
+class TestFeatureLayout:
+    @pytest.mark.parametrize(
+        "text,intensity",
+        [
+            ("I have fever and cough with headache", {}),
+            ("nausea and vomiting since morning", {"nausea": 0.9, "vomiting": -1.0, "unknown": 1.0}),
+            ("मुझे बुखार है और खांसी", {"fever": 2.0}),
+            ("", {"rash": 0.3}),
+        ],
+    )
+    def test_catalog_layout_matches_previous_encoding(self, nlp_service, text, intensity):
+        vector, detected = nlp_service.build_feature_vector(text, intensity)
+        expected, expected_detected = _old_vector(nlp_service, text, intensity)
+        np.testing.assert_array_equal(vector, expected)
+        assert detected == expected_detected
+
+    def test_dataset_columns_follow_training_semantics(self, nlp_service):
+        layout = FeatureLayout.for_model(DATASET_COLUMNS, len(DATASET_COLUMNS))
+        assert layout.text_keywords
+        text = "High fever with a runny nose and stiff joints"
+        vector, detected = nlp_service.build_feature_vector(text, {"headache": 0.9}, layout)
+        row = dict(zip(DATASET_COLUMNS, vector[0]))
+        # Keywords found in the text get the training value
+        for keyword in ("high fever", "fever", "runny nose", "stiff", "joint"):
+            assert row[keyword] == 1.0
+        # headache feeds both "headache" and "ache"
+        assert row["headache"] == pytest.approx(0.9)
+        assert row["ache"] == pytest.approx(0.9)
+        assert row["cough"] == 0.0
+        assert "fever" in detected
+
+    def test_detected_synonyms_feed_keyword_columns(self, nlp_service):
+        layout = FeatureLayout.for_model(DATASET_COLUMNS, len(DATASET_COLUMNS))
+        vector, detected = nlp_service.build_feature_vector("मुझे बुखार है", {}, layout)
+        assert "fever" in detected
+        assert vector[0, DATASET_COLUMNS.index("fever")] == pytest.approx(0.6)
+        assert vector[0, DATASET_COLUMNS.index("high fever")] == 0.0
+
+    def test_active_symptoms_reads_back_catalog_names(self):
+        row = np.zeros(len(SYMPTOMS), dtype=np.float32)
+        row[SYMPTOMS.index("cough")] = 0.6
+        row[SYMPTOMS.index("fever")] = 0.2
+        assert CATALOG_LAYOUT.active_symptoms(row) == ["fever", "cough"]
+
+    def test_encode_into_writes_in_place(self, nlp_service):
+        matrix = np.zeros((2, CATALOG_LAYOUT.n_features), dtype=np.float32)
+        nlp_service.encode_into(matrix[1], "fever", {}, CATALOG_LAYOUT)
+        assert not matrix[0].any()
+        assert matrix[1, SYMPTOMS.index("fever")] == pytest.approx(0.6)
+
+    @pytest.mark.parametrize(
+        "columns,n_features",
+        [
+            (DATASET_COLUMNS, len(DATASET_COLUMNS) + 1),
+            ([], 6),
+            (["fever", "fever"], 2),
+            (["f0", "f1", "f2"], 3),
+        ],
+    )
+    def test_irreconcilable_layouts_raise(self, columns, n_features):
+        with pytest.raises(FeatureLayoutError):
+            FeatureLayout.for_model(columns, n_features)
+
+    def test_catalog_columns_use_catalog_layout(self):
+        assert FeatureLayout.for_model(SYMPTOMS, len(SYMPTOMS)) is CATALOG_LAYOUT
+        assert FeatureLayout.for_model([], len(SYMPTOMS)) is CATALOG_LAYOUT
+        subset = FeatureLayout.for_model(["cough", "fever"], 2)
+        assert not subset.text_keywords
+        assert subset.encode("high fever", ["fever"], {}).tolist() == [[0.0, pytest.approx(0.6)]]
+
@@ -0,0 +1,163 @@
+import json
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from app.services.feedback_store import FeedbackNotSaved, FeedbackQueueFull, FeedbackStore
+
+
+class _FlakyConnection:
+    """Wraps the store's connection; the first ``failures`` inserts raise ``error``."""
+
+    def __init__(self, conn, failures, error=sqlite3.OperationalError("database is locked")):
+        self._conn = conn
+        self.failures = failures
+        self.error = error
+        self.attempts = 0
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+    def execute(self, *args):
+        return self._conn.execute(*args)
+
+    def executemany(self, *args):
+        self.attempts += 1
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        return self._conn.executemany(*args)
+
+    def close(self):
+        self._conn.close()
+
+
+def _prediction(actual="Flu", predicted="Flu"):
+    return {
+        "timestamp": "2024-01-01T00:00:00",
+        "prediction_id": "pred_001",
+        "actual_disease": actual,
+        "predicted_disease": predicted,
+        "confidence": 0.8,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FeedbackStore(tmp_path / "feedback.db", flush_interval=0.01)
+    yield store
+    store.close()
+
+
+class TestFeedbackStore:
+    def test_sequence_numbers_per_kind(self, store):
+        assert store.append("predictions", _prediction()).result(timeout=5) == 1
+        assert store.append("predictions", _prediction()).result(timeout=5) == 2
+        assert store.append("bugs", {"bug_description": "crash"}).result(timeout=5) == 1
+
+    def test_entries_reach_disk_in_batches(self, store):
+        for _ in range(600):
+            store.append("features", {"feature": "x", "description": "y"})
+        store.flush()
+        with sqlite3.connect(str(store.path)) as conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM feedback WHERE kind = 'features'").fetchone()
+        assert count == 600
+
+    def test_counters_recovered_after_restart(self, tmp_path):
+        path = tmp_path / "feedback.db"
+        store = FeedbackStore(path)
+        store.append("predictions", _prediction("Flu", "flu"))
+        store.append("predictions", _prediction("Flu", "Migraine"))
+        store.append("bugs", {"bug_description": "crash"})
+        store.close()
+
+        reopened = FeedbackStore(path)
+        try:
+            stats = reopened.stats()
+            assert stats["counts"] == {"predictions": 2, "features": 0, "bugs": 1}
+            assert stats["correct_predictions"] == 1
+            assert reopened.append("predictions", _prediction()).result(timeout=5) == 3
+        finally:
+            reopened.close()
+
+    def test_full_queue_rejects_instead_of_blocking(self, tmp_path, monkeypatch):
+        store = FeedbackStore(tmp_path / "feedback.db", max_pending=1)
+        release = threading.Event()
+        monkeypatch.setattr(store, "_write", lambda batch: release.wait())
+        try:
+            store.append("bugs", {"bug_description": "a"})
+            deadline = time.monotonic() + 5
+            while store.stats()["pending"] and time.monotonic() < deadline:
+                time.sleep(0.001)  # writer picks up "a" and stalls in _write
+            pending = store.append("bugs", {"bug_description": "b"})
+            with pytest.raises(FeedbackQueueFull):
+                store.append("bugs", {"bug_description": "c"})
+            # Nothing has been committed yet
+            assert store.stats()["counts"]["bugs"] == 0
+            assert not pending.done()
+        finally:
+            release.set()
+            store.close()
+
+    def test_unknown_kind(self, store):
+        with pytest.raises(ValueError):
+            store.append("reviews", {})
+
+    def test_import_legacy_json(self, store, tmp_path):
+        legacy = tmp_path / "feedback_data.json"
+        legacy.write_text(json.dumps({"predictions": [_prediction()] * 3, "features": [], "bugs": [{"x": 1}]}))
+        assert store.import_json(legacy) == 4
+        assert store.stats()["counts"] == {"predictions": 3, "features": 0, "bugs": 1}
+
+    def test_failed_batch_is_retried_not_dropped(self, store, monkeypatch):
+        monkeypatch.setattr("app.services.feedback_store.RETRY_INITIAL_DELAY", 0.001)
+        flaky = store._conn = _FlakyConnection(store._conn, failures=3)
+        store.append("predictions", _prediction())
+        store.append("predictions", _prediction("Flu", "Migraine"))
+        store.flush()
+
+        assert flaky.attempts == 4
+        stats = store.stats()
+        assert stats["counts"]["predictions"] == 2
+        assert stats["correct_predictions"] == 1
+        assert (stats["write_errors"], stats["dropped"]) == (3, 0)
+        with sqlite3.connect(str(store.path)) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM feedback").fetchone() == (2,)
+
+    def test_close_gives_up_and_restart_keeps_sequence(self, tmp_path):
+        path = tmp_path / "feedback.db"
+        store = FeedbackStore(path)
+        assert store.append("bugs", {"bug_description": "a"}).result(timeout=5) == 1
+        store._conn = _FlakyConnection(store._conn, failures=10**6)
+        lost = store.append("bugs", {"bug_description": "b"})
+        store.close()
+        assert store.stats()["counts"]["bugs"] == 1
+        assert store.stats()["dropped"] == 1
+        with pytest.raises(FeedbackNotSaved):
+            lost.result(timeout=5)
+
+        reopened = FeedbackStore(path)
+        try:
+            assert reopened.stats()["counts"]["bugs"] == 1
+            assert reopened.append("bugs", {"bug_description": "c"}).result(timeout=5) == 2
+        finally:
+            reopened.close()
+
+    def test_stores_sharing_a_database_never_reuse_numbers(self, tmp_path):
+        path = tmp_path / "feedback.db"
+        stores = [FeedbackStore(path, flush_interval=0.01) for _ in range(2)]
+        try:
+            futures = [stores[i % 2].append("bugs", {"bug_description": str(i)}) for i in range(10)]
+            seqs = [future.result(timeout=5) for future in futures]
+            assert sorted(seqs) == list(range(1, 11))
+            assert sum(store.stats()["dropped"] for store in stores) == 0
+        finally:
+            for store in stores:
+                store.close()
+        with sqlite3.connect(str(path)) as conn:
+            assert conn.execute("SELECT COUNT(*), COUNT(DISTINCT seq) FROM feedback").fetchone() == (10, 10)
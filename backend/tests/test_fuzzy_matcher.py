@@ -0,0 +1,163 @@
+import pytest
+
+from app.services.fuzzy_matcher import (
+    FuzzySymptomIndex,
+    allowed_distance,
+    edit_distance,
+    load_multilingual_synonyms,
+)
+from app.services.nlp_service import BiomedicalNLPService
+from app.services.symptom_catalog import SYMPTOM_SYNONYMS, SYMPTOMS
+
+
+def brute_force(synonyms, phrase):
+    """Closest synonym by scanning every term, with the index's rules."""
+    limit = allowed_distance(len(phrase))
+    scored = {}
+    for symptom, terms in synonyms.items():
+        if symptom not in SYMPTOMS:
+            continue
+        for term in terms:
+            term = term.lower()
+            if term[0] == phrase[0] and edit_distance(phrase, term, limit) <= limit:
+                scored.setdefault(edit_distance(phrase, term, limit), {}).setdefault(term, set()).add(symptom)
+    if not scored:
+        return None
+    best = min(scored)
+    named = {frozenset(symptoms) for symptoms in scored[best].values()}
+    if len(named) != 1:
+        return None
+    return tuple(sorted(SYMPTOMS.index(s) for s in named.pop())), best
+
+
+@pytest.fixture(scope="module")
+def fuzzy_nlp():
+    return BiomedicalNLPService(fuzzy_max_distance=2)
+
+
+class TestEditDistance:
+    @pytest.mark.parametrize(
+        "a, b, expected",
+        [
+            ("fever", "fever", 0),
+            ("fevr", "fever", 1),
+            ("couhg", "cough", 1),
+            ("headach", "headache", 1),
+            ("vomitting", "vomiting", 1),
+            ("diarhea", "diarrhoea", 2),
+        ],
+    )
+    def test_distance(self, a, b, expected):
+        assert edit_distance(a, b, 2) == expected
+
+    def test_stops_past_limit(self):
+        assert edit_distance("fever", "xyzzy", 1) == 2
+        assert edit_distance("a", "abcd", 2) == 3
+
+    def test_allowed_distance_grows_with_length(self):
+        assert [allowed_distance(n) for n in (5, 6, 8, 9, 20)] == [0, 1, 1, 2, 2]
+        assert allowed_distance(20, max_distance=1) == 1
+
+
+class TestFuzzySymptomIndex:
+    def test_lookup_matches_brute_force(self):
+        synonyms = {s: list(t) for s, t in SYMPTOM_SYNONYMS.items()}
+        index = FuzzySymptomIndex(synonyms)
+        for phrase in ["diarhea", "fatige", "itchng", "headach", "sneezng", "exausted", "nausia", "body ake", "abcdef", "migrane"]:
+            assert index.lookup(phrase) == brute_force(synonyms, phrase), phrase
+
+    def test_one_term_for_several_symptoms(self):
+        index = FuzzySymptomIndex({"fatigue": ["exhausted"], "weakness": ["exhausted"]})
+        assert index.lookup("exausted") == ((SYMPTOMS.index("fatigue"), SYMPTOMS.index("weakness")), 1)
+
+    def test_equally_close_terms_are_ambiguous(self):
+        index = FuzzySymptomIndex({"fever": ["abcdef"], "cough": ["abcdeg"]})
+        assert index.lookup("abcdeh") is None
+
+    def test_first_character_must_match(self):
+        index = FuzzySymptomIndex({"swelling": ["swelling"]})
+        assert index.lookup("dwelling") is None
+        assert index.lookup("swleling") == ((SYMPTOMS.index("swelling"),), 1)
+
+    def test_short_words_need_exact_match(self):
+        index = FuzzySymptomIndex({"pain": ["pain"], "chills": ["chils"]})
+        for word in ["pian", "paint", "child"]:
+            assert index.lookup(word) is None, word
+
+    def test_common_words_are_not_corrected(self):
+        index = FuzzySymptomIndex({"swelling": ["swelling"]})
+        for word in ["smelling", "spelling", "selling"]:
+            assert index.lookup(word) is None, word
+        assert index.lookup("swellin") == ((SYMPTOMS.index("swelling"),), 1)
+
+    def test_zero_distance_only_finds_exact_terms(self):
+        index = FuzzySymptomIndex({"fever": ["jwaram"]}, max_distance=0)
+        assert index.lookup("jwaram") == ((SYMPTOMS.index("fever"),), 0)
+        assert index.lookup("jwarm") is None
+
+    def test_rejects_distance_above_two(self):
+        with pytest.raises(ValueError):
+            FuzzySymptomIndex({}, max_distance=3)
+
+    def test_skips_consumed_words(self):
+        index = FuzzySymptomIndex({"headache": ["headache"], "sneezing": ["sneezing"]})
+        text = "headach and sneezng"
+        assert index.find_ranks(text) == {SYMPTOMS.index("headache"), SYMPTOMS.index("sneezing")}
+        assert index.find_ranks(text, [(0, 0, 7)]) == {SYMPTOMS.index("sneezing")}
+
+    def test_multi_word_phrases(self):
+        index = FuzzySymptomIndex({"sore_throat": ["sore throat"], "fever": ["fever"]})
+        assert index.find_ranks("i have a sore throte") == {SYMPTOMS.index("sore_throat")}
+        # Phrases do not span punctuation
+        assert index.find_ranks("sore, throte") == set()
+
+    def test_loads_multilingual_terms(self):
+        synonyms = load_multilingual_synonyms()
+        assert "jwaram" in synonyms["fever"]
+
+
+class TestFuzzyNLPService:
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("fatige and itchng", ["fatigue", "itching"]),
+            ("bad headach since morning", ["headache"]),
+            ("vomitting and diarhea", ["vomiting", "diarrhea"]),
+            ("mujhe bukhaar hai", ["fever"]),
+        ],
+    )
+    def test_misspelled_symptoms(self, fuzzy_nlp, text, expected):
+        assert fuzzy_nlp.extract_symptoms(text) == [s for s in SYMPTOMS if s in expected]
+
+    def test_exact_matches_unchanged(self, fuzzy_nlp):
+        exact = BiomedicalNLPService()
+        for text in ["i have fever and cough", "mujhe bukhar aur khansi hai", "सर दर्द और बुखार", ""]:
+            assert fuzzy_nlp.extract_symptoms(text) == exact.extract_symptoms(text)
+
+    def test_no_false_positives_on_plain_words(self, fuzzy_nlp):
+        assert fuzzy_nlp.extract_symptoms("xyz abc qwerty") == []
+        assert fuzzy_nlp.extract_symptoms("the weather is beautiful today") == []
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("my child has fever", ["fever"]),
+            ("I have acne on my face", []),
+            ("I am in a rush today", []),
+            ("paint", []),
+            ("fewer", []),
+            ("smelling", []),
+            ("spelling", []),
+            ("selling", []),
+        ],
+    )
+    def test_no_false_positives_on_near_words(self, fuzzy_nlp, text, expected):
+        assert fuzzy_nlp.extract_symptoms(text) == expected
+
+    def test_disabled_by_default(self):
+        assert BiomedicalNLPService().extract_symptoms("fatige and itchng") == []
+
+    def test_feature_vector_uses_fuzzy_matches(self, fuzzy_nlp):
+        vector, detected = fuzzy_nlp.build_feature_vector("fatige", {})
+        assert detected == ["fatigue"]
+        assert vector[0, SYMPTOMS.index("fatigue")] > 0
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.inference_executor import ExecutorSaturated, InferenceExecutor
+from app.services.metrics import STAGE_SECONDS
+
+
+def _record_stage(seconds):
+    # Runs in a pool worker, which records into its own registry
+    STAGE_SECONDS.labels("test", "worker").observe(seconds)
+
+
+class TestInferenceExecutor:
+    def test_rejects_when_queue_full(self):
+        executor = InferenceExecutor("thread", workers=1, max_queue=1, retry_after=3)
+        release = threading.Event()
+
+        async def scenario():
+            first = asyncio.create_task(executor.run(release.wait))
+            second = asyncio.create_task(executor.run(release.wait))
+            await asyncio.sleep(0.05)
+            assert executor.stats()["queue_depth"] == 1
+            with pytest.raises(ExecutorSaturated) as excinfo:
+                await executor.run(release.wait)
+            assert excinfo.value.retry_after == 3
+            release.set()
+            await asyncio.gather(first, second)
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            release.set()
+            executor.shutdown()
+        stats = executor.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert stats["in_flight"] == 0
+
+    def test_cancelled_call_keeps_its_slot_until_it_finishes(self):
+        executor = InferenceExecutor("thread", workers=1, max_queue=1)
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.create_task(executor.run(release.wait))
+            queued = asyncio.create_task(executor.run(release.wait))
+            await asyncio.sleep(0.05)
+            # Both callers give up, e.g. their clients disconnected
+            running.cancel()
+            queued.cancel()
+            await asyncio.gather(running, queued, return_exceptions=True)
+            # The queued call never started and is gone; the running one still holds the worker
+            assert executor.stats()["in_flight"] == 1
+            third = asyncio.create_task(executor.run(release.wait))
+            await asyncio.sleep(0.05)
+            with pytest.raises(ExecutorSaturated):
+                await executor.run(release.wait)
+            release.set()
+            await third
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            release.set()
+            executor.shutdown()
+        stats = executor.stats()
+        assert stats["in_flight"] == 0
+        assert stats["rejected"] == 1
+
+    def test_returns_result_and_propagates_errors(self):
+        executor = InferenceExecutor("thread", workers=2)
+
+        async def scenario():
+            assert await executor.run(sum, [1, 2, 3]) == 6
+            with pytest.raises(ZeroDivisionError):
+                await executor.run(divmod, 1, 0)
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert executor.stats()["in_flight"] == 0
+
+    def test_process_pool(self):
+        executor = InferenceExecutor("process", workers=1)
+        try:
+            assert asyncio.run(executor.run(pow, 2, 10)) == 1024
+        finally:
+            executor.shutdown()
+
+    def test_process_pool_metrics_reach_parent(self):
+        stage = STAGE_SECONDS.labels("test", "worker")
+        before = sum(stage.counts)
+        executor = InferenceExecutor("process", workers=1)
+        try:
+            asyncio.run(executor.run(_record_stage, 0.2))
+            asyncio.run(executor.run(_record_stage, 0.3))
+        finally:
+            executor.shutdown()
+        assert sum(stage.counts) == before + 2
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError):
+            InferenceExecutor("gpu")
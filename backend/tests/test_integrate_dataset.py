@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import integrate_dataset
+from integrate_dataset import DatasetIntegration, keyword_matrix
+from app.services.symptom_catalog import DATASET_KEYWORDS
+
+TEXTS = [
+    "High fever with dry cough and chest tightness",
+    "Runny nose, SNEEZING and a sore throat",
+    "İstanbul trip, now stomach pain and diarrhea",
+    "nothing relevant",
+    "",
+    "Blurred vision\nand eye pain (red, swollen?)",
+]
+
+
+def _rows(texts):
+    integration = DatasetIntegration.__new__(DatasetIntegration)
+    return np.array(
+        [[keyword in integration.extract_symptoms_from_text(text) for keyword in DATASET_KEYWORDS] for text in texts]
+    )
+
+
+def test_matrix_matches_row_by_row_extraction():
+    np.testing.assert_array_equal(keyword_matrix(TEXTS), _rows(TEXTS))
+
+
+def test_missing_text_matches_nothing():
+    assert not keyword_matrix([None, float("nan")]).any()
+
+
+def test_sharded_matrix_is_identical(monkeypatch):
+    monkeypatch.setattr(integrate_dataset, "SHARD_ROWS", 4)
+    texts = TEXTS * 5
+    np.testing.assert_array_equal(keyword_matrix(texts, workers=2), _rows(texts))
+
+
+def test_integration_outputs(tmp_path):
+    path = tmp_path / "merged.csv"
+    pd.DataFrame({"text": TEXTS[:4], "disease": ["Flu", "Common Cold", "Gastritis", "Flu"]}).to_csv(path, index=False)
+    integration = DatasetIntegration(str(path), str(tmp_path))
+
+    pairs, counts = integration.build_disease_symptom_matrix()
+    training = integration.create_training_dataset()
+
+    assert list(pairs.columns) == ["disease", "symptom", "weight", "description"]
+    assert not pairs.duplicated(["disease", "symptom"]).any()
+    assert counts["fever"] == 1 and counts["pain"] == 1
+    assert list(counts)[:3] == ["fever", "cough", "chest"]
+    assert integration.disease_symptom_map["Gastritis"] == {"pain", "diarrhea", "stomach"}
+
+    assert list(training.columns[:3]) == ["patient_id", "disease", "text"]
+    assert list(training.columns[3:]) == sorted(counts)
+    assert training.loc[0, "high fever"] == 1.0 and training.loc[1, "high fever"] == 0.0
+    assert training.iloc[3, 3:].sum() == 0.0
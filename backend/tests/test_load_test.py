@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from load_test import LatencyHistogram, LoadTest, load_payloads
+
+
+def _app(fail_every: int = 0) -> FastAPI:
+    app = FastAPI()
+    calls = {"n": 0}
+
+    @app.post("/predict")
+    async def predict(payload: dict):
+        calls["n"] += 1
+        if fail_every and calls["n"] % fail_every == 0:
+            return JSONResponse({"detail": "boom"}, status_code=500)
+        return {"ok": True}
+
+    return app
+
+
+def _run(coro_factory, app):
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await coro_factory(client)
+
+    return asyncio.run(go())
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_one_percent(self):
+        values = np.random.default_rng(0).lognormal(mean=9, sigma=1, size=20_000).astype(int)
+        hist = LatencyHistogram()
+        for v in values:
+            hist.record(v)
+        for pct in (50, 90, 99, 99.9):
+            exact = np.percentile(values, pct, method="inverted_cdf")
+            assert abs(hist.percentile(pct) - exact) <= exact / 128 + 1
+        assert hist.max == values.max()
+        assert hist.total == len(values)
+
+    def test_small_values_exact(self):
+        hist = LatencyHistogram()
+        for v in range(1, 101):
+            hist.record(v)
+        assert hist.percentile(50) == 50
+        assert hist.percentile(100) == 100
+
+    def test_rejects_non_power_of_two(self):
+        with pytest.raises(ValueError):
+            LatencyHistogram(sub_buckets=100)
+
+
+class TestLoadTest:
+    def test_payloads_from_dataset(self):
+        payloads = load_payloads(limit=5)
+        assert len(payloads) == 5
+        assert all(p["text"] for p in payloads)
+
+    def test_closed_loop_counts_errors(self):
+        payloads = [{"text": "fever"}]
+        report = _run(lambda c: LoadTest(c, payloads, duration=0.3).run_closed(4), _app(fail_every=5))
+        assert report["requests"] > 0
+        assert report["errors"] == report["status_codes"].get("500", 0)
+        assert report["errors"] > 0
+        assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99.9"]
+
+    def test_open_loop_offers_target_rate(self):
+        payloads = [{"text": "fever"}]
+        report = _run(lambda c: LoadTest(c, payloads, duration=0.5).run_open(rps=100), _app())
+        assert report["errors"] == 0
+        assert 40 <= report["requests"] <= 60
@@ -0,0 +1,62 @@
+import pytest
+
+from app.services.metrics import Counter, Histogram, MetricsRegistry
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative(self):
+        hist = Histogram("latency_seconds", "test", buckets=(0.1, 1.0))
+        child = hist.labels()
+        for value in (0.05, 0.1, 0.5, 3.0):
+            child.observe(value)
+        lines = hist.render()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert "latency_seconds_count 4" in lines
+        assert "latency_seconds_sum 3.65" in lines
+
+    def test_labels_must_match(self):
+        hist = Histogram("stage_seconds", "test", ("stage",))
+        with pytest.raises(ValueError):
+            hist.labels("model", "extra")
+        assert hist.labels("model") is hist.labels("model")
+
+
+class TestCounterAndRegistry:
+    def test_counter_render(self):
+        counter = Counter("requests_total", "test", ("path",))
+        counter.labels("retrained").inc(3)
+        counter.labels("rule_based").inc()
+        assert counter.render() == [
+            "# HELP requests_total test",
+            "# TYPE requests_total counter",
+            'requests_total{path="retrained"} 3',
+            'requests_total{path="rule_based"} 1',
+        ]
+
+    def test_duplicate_registration_rejected(self):
+        registry = MetricsRegistry()
+        registry.counter("a_total", "test")
+        with pytest.raises(ValueError):
+            registry.histogram("a_total", "test")
+        assert registry.render().endswith("\n")
+
+    def test_delta_and_merge(self):
+        worker, parent = MetricsRegistry(), MetricsRegistry()
+        stages, calls = [], []
+        for registry in (worker, parent):
+            stages.append(registry.histogram("stage_seconds", "test", ("stage",), buckets=(0.1, 1.0)))
+            calls.append(registry.counter("calls_total", "test"))
+        stages[0].labels("model").observe(0.5)
+        calls[0].labels().inc()
+
+        delta = worker.delta()
+        assert delta == {"stage_seconds": {("model",): [0, 1, 0, 0.5]}, "calls_total": {(): [1]}}
+        parent.merge(delta)
+        parent.merge(worker.delta())  # nothing new since the last delta
+        assert stages[1].labels("model").counts == [0, 1, 0]
+        assert calls[1].labels().value == 1
+
+        calls[0].labels().inc(2)
+        assert worker.delta() == {"calls_total": {(): [2]}}
@@ -0,0 +1,148 @@
+import json
+import pickle
+
+import numpy as np
+import pytest
+from catboost import CatBoostClassifier
+
+from app.services.model_artifact import (
+    ArtifactError,
+    file_sha256,
+    load_artifact,
+    migrate_pickle,
+    save_artifact,
+)
+from app.services.model_service import DiseaseModelService
+
+LABELS = ["Alpha", "Beta", "Gamma"]
+COLUMNS = ["fever", "cough", "headache", "nausea", "rash", "fatigue"]
+
+
+@pytest.fixture(scope="module")
+def trained():
+    rng = np.random.default_rng(0)
+    X = rng.random((200, 6)).astype(np.float32)
+    y = (X[:, 0] * 3).astype(int)
+    model = CatBoostClassifier(iterations=20, depth=3, loss_function="MultiClass", random_seed=0, verbose=False)
+    model.fit(X, y)
+    return model, X
+
+
+class TestModelArtifact:
+    def test_round_trip(self, trained, tmp_path):
+        model, X = trained
+        columns = [f"f{i}" for i in range(6)]
+        manifest = save_artifact(model, LABELS, columns, tmp_path / "model.json", training_data_sha256="abc")
+        assert manifest["model_file"] == f"model-{manifest['model_sha256'][:12]}.cbm"
+        assert manifest["model_sha256"] == file_sha256(tmp_path / manifest["model_file"])
+
+        loaded, read = load_artifact(tmp_path / "model.json")
+        assert read["labels"] == LABELS
+        assert read["feature_columns"] == columns
+        assert read["training_data_sha256"] == "abc"
+        np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X))
+
+    def test_streaming_hash_matches_whole_file_hash(self, tmp_path):
+        import hashlib
+
+        path = tmp_path / "blob"
+        data = np.random.default_rng(1).bytes(3 * 1024 + 17)
+        path.write_bytes(data)
+        assert file_sha256(path, chunk_size=1024) == hashlib.sha256(data).hexdigest()
+
+    def test_tampered_model_is_rejected(self, trained, tmp_path):
+        model, _ = trained
+        manifest = save_artifact(model, LABELS, [], tmp_path / "model.json")
+        cbm = tmp_path / manifest["model_file"]
+        data = bytearray(cbm.read_bytes())
+        data[-1] ^= 0xFF
+        cbm.write_bytes(bytes(data))
+        with pytest.raises(ArtifactError):
+            load_artifact(tmp_path / "model.json")
+
+    def test_overwrite_keeps_old_pair_until_manifest_swap(self, trained, tmp_path, monkeypatch):
+        import app.services.model_artifact as model_artifact
+
+        model, X = trained
+        old = save_artifact(model, LABELS, [], tmp_path / "model.json")
+        other = CatBoostClassifier(iterations=5, depth=2, loss_function="MultiClass", random_seed=1, verbose=False)
+        other.fit(X, (X[:, 1] * 3).astype(int))
+
+        seen = {}
+        write_atomic = model_artifact._write_atomic
+
+        def check_then_write(path, data):
+            # Just before the manifest swap the old pair must still load
+            _, manifest = load_artifact(path)
+            seen["old"] = manifest["model_sha256"]
+            write_atomic(path, data)
+
+        monkeypatch.setattr(model_artifact, "_write_atomic", check_then_write)
+        new = save_artifact(other, LABELS, [], tmp_path / "model.json")
+
+        assert seen["old"] == old["model_sha256"]
+        assert new["model_file"] != old["model_file"]
+        # A reader holding the old manifest can still open its model
+        assert (tmp_path / old["model_file"]).exists()
+        loaded, _ = load_artifact(tmp_path / "model.json")
+        np.testing.assert_allclose(loaded.predict_proba(X), other.predict_proba(X))
+
+    def test_models_older_than_previous_are_removed(self, trained, tmp_path):
+        model, X = trained
+        files = []
+        for seed in range(3):
+            other = CatBoostClassifier(iterations=5, depth=2, loss_function="MultiClass", random_seed=seed, verbose=False)
+            other.fit(X, (X[:, 1] * 3).astype(int))
+            files.append(save_artifact(other, LABELS, [], tmp_path / "model.json")["model_file"])
+        (tmp_path / "other-0123456789ab.cbm").write_bytes(b"x")
+
+        assert len(set(files)) == 3
+        assert sorted(p.name for p in tmp_path.glob("model-*.cbm")) == sorted(files[1:])
+        assert (tmp_path / "other-0123456789ab.cbm").exists()
+
+    def test_newer_format_is_rejected(self, trained, tmp_path):
+        model, _ = trained
+        manifest = save_artifact(model, LABELS, [], tmp_path / "model.json")
+        manifest["format_version"] += 1
+        (tmp_path / "model.json").write_text(json.dumps(manifest))
+        with pytest.raises(ArtifactError):
+            load_artifact(tmp_path / "model.json")
+
+    def test_label_count_must_match_model(self, trained, tmp_path):
+        model, _ = trained
+        save_artifact(model, LABELS[:2], [], tmp_path / "model.json")
+        with pytest.raises(ArtifactError):
+            load_artifact(tmp_path / "model.json")
+
+    def test_migrates_legacy_pickle(self, trained, tmp_path):
+        from sklearn.preprocessing import LabelEncoder
+
+        model, X = trained
+        encoder = LabelEncoder().fit(LABELS)
+        with open(tmp_path / "legacy.pkl", "wb") as f:
+            pickle.dump({"model": model, "label_encoder": encoder, "feature_columns": ["a", "b"]}, f)
+
+        manifest = migrate_pickle(tmp_path / "legacy.pkl")
+        assert manifest["labels"] == LABELS
+        loaded, _ = load_artifact(tmp_path / "legacy.json")
+        np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X))
+
+    def test_service_prefers_manifest_artifact(self, trained, tmp_path):
+        model, X = trained
+        save_artifact(model, LABELS, COLUMNS, tmp_path / "model.json")
+        service = DiseaseModelService()
+        service.artifact_path = tmp_path / "model.json"
+        service._load_if_exists()
+        assert service.snapshot.kind == "retrained"
+        assert service.snapshot.labels == LABELS
+        _, labels = service.predict_proba(X[:5])
+        assert labels == LABELS
+
+    def test_service_rejects_unmappable_feature_columns(self, trained, tmp_path):
+        model, _ = trained
+        save_artifact(model, LABELS, [f"f{i}" for i in range(6)], tmp_path / "model.json")
+        service = DiseaseModelService(autoload=False)
+        service.artifact_path = tmp_path / "model.json"
+        service.retrained_model_path = tmp_path / "missing.pkl"
+        service.model_path = tmp_path / "missing.cbm"
+        assert service.load_snapshot() is None
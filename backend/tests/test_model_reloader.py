@@ -0,0 +1,113 @@
+import json
+
+import numpy as np
+import pytest
+from catboost import CatBoostClassifier
+
+from app.services.model_reloader import GOLDEN_SET_PATH, ModelReloader
+from app.services.model_service import DiseaseModelService
+from app.services.nlp_service import BiomedicalNLPService
+
+
+@pytest.fixture(scope="module")
+def golden_rows():
+    with open(GOLDEN_SET_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def golden_features(golden_rows):
+    nlp = BiomedicalNLPService()
+    return np.vstack([nlp.build_feature_vector(row["text"], {})[0] for row in golden_rows])
+
+
+def _save_model(path, features, labels):
+    model = CatBoostClassifier(iterations=40, depth=4, loss_function="MultiClass", random_seed=0, verbose=False)
+    model.fit(features, labels)
+    model.save_model(str(path))
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = DiseaseModelService()
+    service.artifact_path = tmp_path / "missing.json"
+    service.retrained_model_path = tmp_path / "missing.pkl"
+    service.model_path = tmp_path / "catboost_disease.cbm"
+    return service
+
+
+@pytest.fixture
+def reloader(service):
+    return ModelReloader(BiomedicalNLPService(), service)
+
+
+class TestModelReloader:
+    def test_swaps_in_valid_artifact(self, service, reloader, golden_rows, golden_features):
+        _save_model(service.model_path, golden_features, [row["disease"] for row in golden_rows])
+        report = reloader.reload()
+        assert report["status"] == "swapped"
+        assert report["version_after"] == service.version != report["version_before"]
+        assert service.snapshot.kind == "original"
+        assert report["validation"]["rows"] == len(golden_rows)
+        assert report["duration_ms"] >= report["load_ms"] >= 0
+
+    def test_unchanged_artifact_is_not_reloaded(self, service, reloader, golden_rows, golden_features):
+        _save_model(service.model_path, golden_features, [row["disease"] for row in golden_rows])
+        reloader.reload()
+        snapshot = service.snapshot
+        assert reloader.reload()["status"] == "unchanged"
+        assert service.snapshot is snapshot
+
+    def test_regressed_artifact_is_rejected(self, service, reloader, golden_rows, golden_features):
+        labels = [row["disease"] for row in golden_rows]
+        _save_model(service.model_path, golden_features, labels)
+        reloader.reload()
+        healthy = service.snapshot
+
+        # Same classes, wrong answers: rotate every label to the next row's
+        _save_model(service.model_path, golden_features, labels[4:] + labels[:4])
+        report = reloader.reload(force=True)
+        assert report["status"] == "rejected"
+        assert report["validation"]["errors"]
+        assert service.snapshot is healthy
+
+    def test_corrupt_artifact_keeps_serving_model(self, service, reloader, golden_rows, golden_features):
+        _save_model(service.model_path, golden_features, [row["disease"] for row in golden_rows])
+        reloader.reload()
+        healthy = service.snapshot
+
+        service.model_path.write_bytes(b"not a model")
+        report = reloader.reload()
+        assert report["status"] == "failed"
+        assert service.snapshot is healthy
+        # The watcher does not retry a version that already failed
+        assert reloader.poll(service.artifact_version()) == service.artifact_version()
+        assert reloader.last_report is report
+
+    def test_corrupt_artifact_does_not_fall_back_to_older_model(self, service, reloader, golden_rows, golden_features):
+        _save_model(service.model_path, golden_features, [row["disease"] for row in golden_rows])
+        service.artifact_path = service.model_path.with_name("disease_model_15k.json")
+        service.artifact_path.write_text("{not json")
+        report = reloader.reload()
+        assert report["status"] == "failed"
+        assert service.snapshot.kind == "rule_based"
+        # Startup still falls back to whatever loads
+        assert service.load_snapshot().kind == "original"
+
+    def test_pinned_call_keeps_old_model_across_swap(self, service, reloader, golden_rows, golden_features):
+        assert service.snapshot.kind == "rule_based"
+        _save_model(service.model_path, golden_features, [row["disease"] for row in golden_rows])
+        with service.pinned() as pinned:
+            assert reloader.reload()["status"] == "swapped"
+            assert service.snapshot is pinned
+            assert service.version == "rule-based"
+            assert service.active_model() is None
+        assert service.snapshot.kind == "original"
+        assert service.active_model() is not None
+
+    def test_watcher_waits_for_stable_version(self, service, reloader, golden_rows, golden_features):
+        _save_model(service.model_path, golden_features, [row["disease"] for row in golden_rows])
+        seen = reloader.poll(None)
+        assert service.snapshot.kind == "rule_based"
+        reloader.poll(seen)
+        assert service.snapshot.kind == "original"
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from app.services.ranking import rank, top_k
+
+
+def _sorted_rank(probs, labels, k):
+    """The per-class dict + full sort that rank() replaced."""
+    pairs = sorted(
+        [{"disease": str(label), "score": float(prob)} for label, prob in zip(labels, probs)],
+        key=lambda x: x["score"],
+        reverse=True,
+    )
+    return pairs[0]["disease"], pairs[0]["score"], [{p["disease"]: round(p["score"], 4)} for p in pairs[:k]]
+
+
+class TestRanking:
+    @pytest.mark.parametrize("classes,k", [(15, 3), (200, 5), (1000, 10), (4, 4), (3, 10)])
+    def test_matches_full_sort(self, classes, k):
+        rng = np.random.default_rng(classes)
+        probs = rng.dirichlet(np.ones(classes), size=20).astype(np.float32)
+        labels = [f"D{i}" for i in range(classes)]
+        assert rank(probs, labels, k) == [_sorted_rank(row, labels, k) for row in probs]
+
+    def test_ties_keep_label_order(self):
+        # The rule-based fallback scores most diseases the same
+        probs = np.array([[0.05, 0.25, 0.05, 0.05, 0.3, 0.05, 0.25]], dtype=np.float32)
+        labels = list("ABCDEFG")
+        for k in range(1, 8):
+            assert rank(probs, labels, k) == [_sorted_rank(probs[0], labels, k)]
+
+    def test_per_row_k(self):
+        probs = np.array([[0.1, 0.6, 0.3], [0.5, 0.2, 0.3]])
+        results = rank(probs, ["a", "b", "c"], [1, 2])
+        assert results[0] == ("b", 0.6, [{"b": 0.6}])
+        assert results[1] == ("a", 0.5, [{"a": 0.5}, {"c": 0.3}])
+
+    def test_top_k_vector_and_bounds(self):
+        indices, scores = top_k(np.array([0.2, 0.5, 0.3]), 2)
+        assert indices.tolist() == [[1, 2]]
+        assert scores.tolist() == [[0.5, 0.3]]
+        with pytest.raises(ValueError):
+            top_k(np.array([0.2, 0.8]), 0)
+        with pytest.raises(ValueError):
+            rank(np.zeros((2, 3)), ["a", "b", "c"], [1])
@@ -56,3 +56,15 @@ class TestRiskAwareLayer:
     def test_score_type_2_diabetes(self, risk_layer):
         result = risk_layer.score("Type 2 Diabetes Alert", 0.7, {"high_blood_sugar": 0.8}, ["high_blood_sugar"])
         assert result["risk_level"] in {"Low", "Moderate", "High", "Critical"}
+
+    def test_score_batch_matches_score(self, risk_layer):
+        cases = [
+            ("Common Cold", 0.2, {"fever": 0.1}, ["congestion"]),
+            ("COVID-19", 0.9, {"fever": 0.9, "cough": 0.9}, ["fever", "cough", "shortness_of_breath"]),
+            ("Unknown", 0.5, {}, []),
+            ("Malaria", 0.6, {}, ["fever", "chills", "sweating", "headache", "fatigue", "pain", "ache", "nausea", "rash"]),
+        ]
+        batch = risk_layer.score_batch(
+            [c[0] for c in cases], [c[1] for c in cases], [c[2] for c in cases], [c[3] for c in cases]
+        )
+        assert batch == [risk_layer.score(*c) for c in cases]
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from app.services.model_service import DiseaseModelService
+from app.services.startup import StartupTimeline
+
+
+class TestStartupTimeline:
+    def test_marks_and_phases_are_recorded_in_order(self):
+        timeline = StartupTimeline()
+        timeline.mark("imports")
+        with timeline.phase("model_load"):
+            pass
+        report = timeline.report()
+        assert [p["name"] for p in report["phases"]] == ["imports", "model_load"]
+        assert report["phases"][1]["start_ms"] >= report["phases"][0]["start_ms"]
+        assert report["ready_ms"] >= report["phases"][1]["start_ms"]
+
+    def test_failed_phase_records_error_and_reraises(self):
+        timeline = StartupTimeline()
+        with pytest.raises(RuntimeError):
+            with timeline.phase("model_load"):
+                raise RuntimeError("boom")
+        assert timeline.report()["phases"][0]["error"] == "RuntimeError: boom"
+
+    def test_event_keeps_first_occurrence(self):
+        timeline = StartupTimeline()
+        timeline.event("first_predict")
+        first = timeline.events["first_predict"]
+        timeline.event("first_predict")
+        assert timeline.events["first_predict"] == first
+
+
+class TestDeferredModelLoad:
+    def test_loads_once_on_first_use(self, monkeypatch):
+        service = DiseaseModelService(autoload=False)
+        assert not service.loaded
+        calls = []
+        original = service.load_snapshot
+        monkeypatch.setattr(service, "load_snapshot", lambda: calls.append(1) or original())
+        service.ensure_loaded()
+        service.predict_proba(np.zeros((1, 18), dtype=np.float32))
+        assert service.loaded
+        assert calls == [1]
@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+import pytest
+
+from app.streaming import CsvParser, JsonLinesParser, StreamFormatError, make_parser, score_stream
+
+
+def _feed_all(parser, data, chunk_size):
+    records = []
+    for start in range(0, len(data), chunk_size):
+        records.extend(parser.feed(data[start : start + chunk_size]))
+    return records + parser.close()
+
+
+async def _score(payloads):
+    return [(None, f"scored {p.text}") for p in payloads]
+
+
+def _collect(agen):
+    async def run():
+        return [line async for line in agen]
+
+    return b"".join(asyncio.run(run())).decode().splitlines()
+
+
+class TestParsers:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+    def test_jsonl_records_survive_any_chunking(self, chunk_size):
+        data = '{"text": "fever"}\r\n\n{"text": "बुखार और खांसी"}\n[1]\nnot json\n{"text": "last"}'.encode()
+        records = _feed_all(JsonLinesParser(), data, chunk_size)
+        assert [index for index, _, _ in records] == [0, 1, 2, 3, 4]
+        assert records[1][1] == {"text": "बुखार और खांसी"}
+        assert records[2][2].startswith("Invalid item")
+        assert records[3][2].startswith("Invalid JSON")
+        assert records[4][1] == {"text": "last"}
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 1024])
+    def test_csv_header_quotes_and_intensity(self, chunk_size):
+        data = (
+            '﻿text,language,symptom_intensity,extra\r\n'
+            '"fever, cough",en,"{""fever"": 0.8}",x\r\n'
+            '"headache\nand nausea",,,\r\n'
+            'too,few\r\n'
+        ).encode()
+        records = _feed_all(CsvParser(), data, chunk_size)
+        expected = {"text": "fever, cough", "language": "en", "symptom_intensity": {"fever": 0.8}, "extra": "x"}
+        assert records[0] == (0, expected, None)
+        assert records[1] == (1, {"text": "headache\nand nausea"}, None)
+        assert records[2][2].startswith("Invalid CSV row")
+
+    def test_csv_requires_text_column(self):
+        with pytest.raises(StreamFormatError):
+            CsvParser().feed(b"note,language\nfever,en\n")
+
+    def test_record_size_is_bounded(self):
+        parser = JsonLinesParser(max_record_bytes=32)
+        parser.feed(b'{"text": "ok"}\n')
+        with pytest.raises(StreamFormatError):
+            for _ in range(10):
+                parser.feed(b"x" * 8)
+
+    @pytest.mark.parametrize(
+        "chunks",
+        [
+            [b'{"text": "ok"}\n' + b"x" * 40 + b"\n"],  # whole over-long line in one chunk
+            [b'{"text": "ok"}\n' + b"x" * 40],  # over-long tail, then end of upload
+            [b'{"text": "ok"}\n' + b"x" * 40, b"\n"],
+        ],
+    )
+    def test_every_record_is_bounded(self, chunks):
+        parser = JsonLinesParser(max_record_bytes=32)
+        records = parser.feed(chunks[0])
+        assert records == [(0, {"text": "ok"}, None)]
+        with pytest.raises(StreamFormatError):
+            for chunk in chunks[1:]:
+                parser.feed(chunk)
+            parser.close()
+
+    def test_media_types(self):
+        assert isinstance(make_parser("application/x-ndjson; charset=utf-8", 1024), JsonLinesParser)
+        assert isinstance(make_parser("text/csv", 1024), CsvParser)
+        assert make_parser("application/json", 1024) is None
+
+
+class TestScoreStream:
+    def test_micro_batches_and_summary(self):
+        async def chunks():
+            for i in range(5):
+                yield json.dumps({"text": f"row {i}"}).encode() + b"\n"
+
+        lines = [json.loads(line) for line in _collect(score_stream(chunks(), JsonLinesParser(), _score, 2))]
+        assert [line["index"] for line in lines[:-1]] == [0, 1, 2, 3, 4]
+        assert lines[2]["error"] == "scored row 2"
+        assert lines[-1] == {"summary": {"succeeded": 0, "failed": 5}}
+
+    def test_upload_is_read_only_as_results_are_consumed(self):
+        consumed = []
+
+        async def chunks():
+            for i in range(100):
+                consumed.append(i)
+                yield json.dumps({"text": f"row {i}"}).encode() + b"\n"
+
+        async def first_batch():
+            agen = score_stream(chunks(), JsonLinesParser(), _score, 4)
+            first = await agen.__anext__()
+            await agen.aclose()
+            return first
+
+        first = asyncio.run(first_batch())
+        assert len(first.splitlines()) == 4
+        assert len(consumed) == 4
+
+    def test_format_error_ends_stream_after_scoring_parsed_rows(self):
+        async def chunks():
+            yield b'{"text": "fever"}\n'
+            yield b"x" * 100
+
+        lines = [json.loads(line) for line in _collect(score_stream(chunks(), JsonLinesParser(64), _score, 8))]
+        assert lines[0]["index"] == 0
+        assert "longer than 64 bytes" in lines[-1]["summary"]["error"]
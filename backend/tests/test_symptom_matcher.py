@@ -0,0 +1,114 @@
+import re
+
+import pandas as pd
+import pytest
+
+from app.services.dataset_loader import DatasetLoader
+from app.services.nlp_service_enhanced import _LegacyBiomedicalNLPService
+from app.services.symptom_catalog import SYMPTOM_SYNONYMS, SYMPTOMS
+from app.services.symptom_matcher import IncrementalSymptomMatcher, SymptomMatcher
+
+
+def regex_reference(synonyms, text):
+    """The per-symptom, per-synonym regex loop the matcher replaces."""
+    hits = []
+    for symptom in SYMPTOMS:
+        for term in synonyms.get(symptom, []):
+            lowered = term.lower()
+            escaped = re.escape(lowered)
+            pattern = rf"\b{escaped}\b" if lowered.isascii() else escaped
+            if re.search(pattern, text):
+                hits.append(symptom)
+                break
+    return hits
+
+
+SAMPLE_TEXTS = [
+    "i have fever and cough",
+    "mujhe bukhar aur khansi hai",
+    "feverish and coughing",
+    "pain_killer did not help, body ache",
+    "सर दर्द और बुखार",
+    "నాకు జ్వరం మరియు దగ్గు",
+    "માથાનો દર્દ અને તાપમાન",
+    "बुखारfever",
+    "pain.ache-headache",
+    "",
+    "the weather is beautiful today",
+]
+
+
+class TestSymptomMatcher:
+    @pytest.fixture
+    def matcher(self):
+        return SymptomMatcher(SYMPTOM_SYNONYMS)
+
+    def test_len_counts_indexed_symptoms(self, matcher):
+        assert len(matcher) == len(SYMPTOM_SYNONYMS)
+        assert matcher.term_count == sum(len(terms) for terms in SYMPTOM_SYNONYMS.values())
+
+    def test_word_boundaries_for_ascii_terms(self, matcher):
+        assert "fever" not in matcher.find("feverish")
+        assert "fever" in matcher.find("fever, cough")
+        assert "cough" not in matcher.find("coughing")
+
+    def test_native_script_substring(self, matcher):
+        assert "fever" in matcher.find("मुझेबुखारहै")
+
+    def test_results_in_catalog_order(self, matcher):
+        hits = matcher.find("vomiting headache fever")
+        assert hits == sorted(hits, key=SYMPTOMS.index)
+
+    def test_unknown_symptoms_ignored(self):
+        matcher = SymptomMatcher({"not_a_symptom": ["zzz"], "fever": ["fever"]})
+        assert len(matcher) == 1
+        assert matcher.find("zzz fever") == ["fever"]
+
+    @pytest.mark.parametrize("text", SAMPLE_TEXTS)
+    def test_matches_regex_loop_static_catalog(self, matcher, text):
+        legacy = _LegacyBiomedicalNLPService()
+        assert matcher.find(text) == legacy.extract_symptoms(text)
+
+    def test_matches_regex_loop_on_dataset(self):
+        synonyms = dict(SYMPTOM_SYNONYMS)
+        for symptom, terms in DatasetLoader("data").get_symptom_synonyms().items():
+            synonyms[symptom] = synonyms.get(symptom, []) + terms
+        matcher = SymptomMatcher(synonyms)
+
+        texts = pd.read_csv("data/merged_symptom_dataset_15000.csv", nrows=500)["text"].str.lower()
+        for text in list(texts) + SAMPLE_TEXTS:
+            assert matcher.find(text) == regex_reference(synonyms, text), text
+
+
+class TestIncrementalSymptomMatcher:
+    def test_with_terms_returns_updated_copy(self):
+        matcher = IncrementalSymptomMatcher(SYMPTOM_SYNONYMS)
+        updated = matcher.with_terms({"fever": ["Tapman"], "cough": ["khasi"]})
+
+        assert "fever" not in matcher.find("tapman hai")
+        assert updated.find("tapman aur khasi") == ["fever", "cough"]
+        assert updated.term_count == matcher.term_count + 2
+        assert updated.delta_term_count == 2
+        assert matcher.with_terms({}) is matcher
+
+    def test_delta_folds_into_base(self):
+        matcher = IncrementalSymptomMatcher(SYMPTOM_SYNONYMS, delta_max_terms=3)
+        for i in range(5):
+            matcher = matcher.with_terms({"rash": [f"chakatte{i}"]})
+        # The 4th term overflowed the delta and was folded in with the first 3
+        assert matcher.delta_term_count == 1
+        assert all(matcher.find(f"chakatte{i}") == ["rash"] for i in range(5))
+
+    @pytest.mark.parametrize("delta_max_terms", [0, 4, 10_000])
+    def test_matches_full_build(self, delta_max_terms):
+        synonyms = DatasetLoader("data").get_symptom_synonyms()
+        symptoms = sorted(synonyms)
+        incremental = IncrementalSymptomMatcher({}, delta_max_terms=delta_max_terms)
+        for symptom in symptoms:
+            incremental = incremental.with_terms({symptom: synonyms[symptom]})
+
+        full = SymptomMatcher(synonyms)
+        assert len(incremental) == len(full)
+        assert incremental.term_count == full.term_count
+        for text in SAMPLE_TEXTS:
+            assert incremental.find(text) == full.find(text), text
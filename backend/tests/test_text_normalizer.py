@@ -0,0 +1,97 @@
+import pytest
+
+from app.services.nlp_service import BiomedicalNLPService
+from app.services.nlp_service_enhanced import EnhancedBiomedicalNLPService
+from app.services.text_normalizer import (
+    fold_romanization,
+    fold_word,
+    matching_form,
+    normalize_synonyms,
+    normalize_text,
+)
+
+
+class TestNormalizeText:
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("  Hello   WORLD  ", "hello world"),
+            ("ＦＥＶＥＲ", "fever"),
+            ("Fièvre, DOLOR de cabeza", "fievre, dolor de cabeza"),
+            ("fièvre", "fievre"),
+            ("\u095bukam", "\u091cukam"),  # precomposed nukta letter
+            ("\u091c\u093cukam", "\u091cukam"),
+            ("\u0938\u0930\u200c \u0926\u0930\u094d\u0926", "\u0938\u0930 \u0926\u0930\u094d\u0926"),
+        ],
+    )
+    def test_normalize(self, text, expected):
+        assert normalize_text(text) == expected
+
+    def test_keeps_indic_vowel_signs(self):
+        for term in ["बुखार", "జ్వరం", "ખાંસી", "తలనొప్పి"]:
+            assert normalize_text(term) == term
+
+
+class TestFoldRomanization:
+    @pytest.mark.parametrize(
+        "variant, canonical",
+        [
+            ("bukhaar", "bukhar"),
+            ("khaansi", "khansi"),
+            ("jwaram", "jvaram"),
+            ("thakaan", "thakan"),
+            ("pheever", "fiver"),
+        ],
+    )
+    def test_variants_fold_together(self, variant, canonical):
+        assert fold_word(variant) == fold_word(canonical)
+
+    def test_common_words_are_not_folded(self):
+        assert fold_romanization("fewer people feel well") == "fewer people feel well"
+
+    def test_only_ascii_words_are_folded(self):
+        assert fold_romanization("mujhe bukhaar aur बुखार hai") == "mujhe bukhar aur बुखार hai"
+
+    def test_fold_is_idempotent(self):
+        text = matching_form("Mujhe BUKHAAR aur sar-dard, sneezing and wheezing")
+        assert fold_romanization(text) == text
+
+    def test_words_are_memoized(self):
+        fold_word.cache_clear()
+        fold_romanization("bukhaar bukhaar bukhaar")
+        info = fold_word.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
+
+class TestNormalizeSynonyms:
+    def test_terms_in_matching_form_and_joined(self):
+        synonyms = normalize_synonyms({"headache": ["Sar Dard", "sar  dard", "सर दर्द"], "fever": ["Bukhaar"]})
+        assert synonyms == {"headache": ["sar dard", "sardard", "सर दर्द"], "fever": ["bukhar"]}
+
+
+@pytest.mark.parametrize("service_class", [BiomedicalNLPService, EnhancedBiomedicalNLPService])
+class TestRomanizedMatching:
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("mujhe bukhaar hai", "fever"),
+            ("sardard ho raha hai", "headache"),
+            ("KHAANSI", "cough"),
+            ("ｆｅｖｅｒ", "fever"),
+        ],
+    )
+    def test_variant_spellings(self, service_class, text, expected):
+        assert expected in service_class().extract_symptoms(text)
+
+    def test_exact_spellings_unchanged(self, service_class):
+        service = service_class()
+        assert service.extract_symptoms("mujhe bukhar aur khansi hai") == ["fever", "cough"]
+        assert service.extract_symptoms("the weather is beautiful today") == []
+
+
+def test_added_variants_are_normalized():
+    service = EnhancedBiomedicalNLPService()
+    service.add_many({"fever": ["Tez Taap"]})
+    assert "fever" in service.extract_symptoms("tez taap hai")
+    assert "fever" in service.extract_symptoms("teztaap")
+    assert "Tez Taap" in service.get_symptom_synonyms("fever")
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from catboost import CatBoostClassifier, Pool
+
+from app.services.model_service import DiseaseModelService
+from app.services.symptom_catalog import SYMPTOMS
+from app.services.tree_evaluator import ObliviousTreeEvaluator
+
+
+@pytest.fixture(scope="module")
+def multiclass_model():
+    rng = np.random.default_rng(0)
+    X = rng.random((400, 12)).astype(np.float32)
+    y = (X[:, 0] * 3 + X[:, 3] * 2 + X[:, 7]).astype(int) % 4
+    model = CatBoostClassifier(iterations=60, depth=5, loss_function="MultiClass", random_seed=0, verbose=False)
+    # Catalog names, so the model service can map NLP output onto it
+    model.fit(Pool(X, y, feature_names=SYMPTOMS[:12]))
+    return model, X
+
+
+class TestObliviousTreeEvaluator:
+    def test_matches_catboost_multiclass(self, multiclass_model):
+        model, X = multiclass_model
+        evaluator = ObliviousTreeEvaluator.from_catboost(model)
+        probe = np.random.default_rng(1).random((300, 12)).astype(np.float32)
+        for data in (X, probe, probe[:1]):
+            np.testing.assert_allclose(evaluator.predict_proba(data), model.predict_proba(data), atol=1e-6)
+
+    def test_matches_catboost_raw_values(self, multiclass_model):
+        model, X = multiclass_model
+        evaluator = ObliviousTreeEvaluator.from_catboost(model)
+        expected = model.predict(X, prediction_type="RawFormulaVal")
+        np.testing.assert_allclose(evaluator.raw_predict(X), expected, atol=1e-6)
+
+    def test_matches_catboost_binary(self):
+        rng = np.random.default_rng(2)
+        X = rng.random((300, 6)).astype(np.float32)
+        y = (X[:, 1] > 0.4).astype(int)
+        model = CatBoostClassifier(iterations=40, depth=4, random_seed=0, verbose=False)
+        model.fit(X, y)
+        evaluator = ObliviousTreeEvaluator.from_catboost(model)
+        np.testing.assert_allclose(evaluator.predict_proba(X), model.predict_proba(X), atol=1e-6)
+
+    def test_single_row_vector(self, multiclass_model):
+        model, X = multiclass_model
+        evaluator = ObliviousTreeEvaluator.from_catboost(model)
+        assert evaluator.predict_proba(X[0]).shape == (1, 4)
+
+    def test_rejects_wrong_feature_count(self, multiclass_model):
+        model, X = multiclass_model
+        evaluator = ObliviousTreeEvaluator.from_catboost(model)
+        with pytest.raises(ValueError):
+            evaluator.predict_proba(X[:, :5])
+
+
+class TestModelServiceEngine:
+    def test_unknown_engine_rejected(self):
+        with pytest.raises(ValueError):
+            DiseaseModelService(engine="onnx")
+
+    def test_numpy_engine_matches_catboost_engine(self, multiclass_model, tmp_path):
+        model, X = multiclass_model
+        model_path = tmp_path / "catboost_disease.cbm"
+        model.save_model(str(model_path))
+
+        services = {}
+        for engine in ("catboost", "numpy"):
+            service = DiseaseModelService(engine=engine)
+            service.artifact_path = tmp_path / "missing.json"
+            service.retrained_model_path = tmp_path / "missing.pkl"
+            service.model_path = model_path
+            service._load_if_exists()
+            services[engine] = service
+
+        assert services["numpy"].snapshot.evaluator is not None
+        assert services["catboost"].snapshot.evaluator is None
+        np_probs, np_labels = services["numpy"].predict_proba(X[:50])
+        cb_probs, cb_labels = services["catboost"].predict_proba(X[:50])
+        assert np_labels == cb_labels
+        np.testing.assert_allclose(np_probs, cb_probs, atol=1e-6)